@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Union
+
+from fastapi.responses import JSONResponse
+
+from .metrics import ADMISSION_IN_FLIGHT, ADMISSION_REJECTIONS, STAGE_LATENCY
+from .resilience import RateLimiter
+
+
+logger = logging.getLogger(__name__)
+
+
+# Proxies in front of the app that append to X-Forwarded-For: 1 for the
+# bundled nginx. Entries left of those are client-supplied and can be forged,
+# so the client is the address the outermost trusted proxy saw. Set to 0
+# when the app is exposed directly.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+# Longest a request may wait for a slot before it is shed with a 503
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+# Per-client buckets kept per endpoint; the least recently seen are dropped
+MAX_TRACKED_CLIENTS = 10000
+# Weight of the newest sample in the smoothed queue wait
+WAIT_SMOOTHING = 0.2
+# Arrivals are shed outright once the smoothed wait reaches this share of the
+# queue timeout (samples are capped at the timeout, so it never reaches 1)
+SHED_AT = 0.8
+
+MATCH_CONCURRENCY = int(os.getenv("MATCH_CONCURRENCY", "8"))
+# Requests per second per client, and how many may arrive at once
+MATCH_RATE = float(os.getenv("MATCH_RATE", "2"))
+MATCH_BURST = int(os.getenv("MATCH_BURST", "10"))
+# Streams hold their slot until the last event is sent, so they get their own,
+# smaller pool and never queue: a long stream must not starve /match-jobs
+STREAM_CONCURRENCY = int(os.getenv("STREAM_CONCURRENCY", "4"))
+STREAM_RATE = float(os.getenv("STREAM_RATE", "0.5"))
+STREAM_BURST = int(os.getenv("STREAM_BURST", "3"))
+ANALYZE_CONCURRENCY = int(os.getenv("ANALYZE_CONCURRENCY", "4"))
+ANALYZE_RATE = float(os.getenv("ANALYZE_RATE", "0.5"))
+ANALYZE_BURST = int(os.getenv("ANALYZE_BURST", "5"))
+# A refresh crawls every source, so one runs at a time and none queue up
+REFRESH_CONCURRENCY = int(os.getenv("REFRESH_CONCURRENCY", "1"))
+REFRESH_RATE = float(os.getenv("REFRESH_RATE", str(1 / 60)))
+REFRESH_BURST = int(os.getenv("REFRESH_BURST", "2"))
+
+
+def client_address(scope) -> str:
+    """Client IP of an ASGI request, honouring TRUSTED_PROXY_HOPS."""
+    if TRUSTED_PROXY_HOPS > 0:
+        for name, value in scope.get("headers") or ():
+            if name == b"x-forwarded-for":
+                hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+                if hops:
+                    return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class Overloaded(Exception):
+    """Raised by EndpointGate.enter when a request is shed."""
+
+
+class EndpointGate:
+    """Admission for one group of endpoints: per-client token buckets in
+    front of a fixed number of concurrent slots. ``prefixes`` are the paths
+    of the group (each also covers its subpaths).
+
+    A request that finds every slot busy waits at most ``queue_timeout``.
+    It is shed right away when the smoothed wait of recent requests is
+    already close to that, so a backlog is turned away early instead of
+    timing out in the queue, and admitted requests keep a bounded latency.
+    """
+
+    def __init__(self, name: str, prefixes: Union[str, Sequence[str]], concurrency: int, rate: Optional[float],
+                 burst: int, queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.name = name
+        self.prefixes = (prefixes,) if isinstance(prefixes, str) else tuple(prefixes)
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.wait_estimate = 0.0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._limiters: "OrderedDict[str, RateLimiter]" = OrderedDict()
+
+    def matches(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.prefixes)
+
+    def check_rate(self, client: str) -> float:
+        """0.0 when ``client`` may proceed, else seconds until it may retry."""
+        limiter = self._limiters.get(client)
+        if limiter is None:
+            limiter = self._limiters[client] = RateLimiter(self.rate, self.burst)
+            while len(self._limiters) > MAX_TRACKED_CLIENTS:
+                self._limiters.popitem(last=False)
+        else:
+            self._limiters.move_to_end(client)
+        return limiter.try_acquire()
+
+    def _observe_wait(self, seconds: float) -> None:
+        self.wait_estimate += WAIT_SMOOTHING * (seconds - self.wait_estimate)
+        STAGE_LATENCY.observe(seconds, stage="admission_wait")
+
+    async def enter(self) -> None:
+        if self._slots.locked():
+            if self.queue_timeout <= 0 or self.wait_estimate >= SHED_AT * self.queue_timeout:
+                raise Overloaded(f"{self.name} is at capacity")
+            start = time.perf_counter()
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._observe_wait(self.queue_timeout)
+                raise Overloaded(f"{self.name} is at capacity")
+            finally:
+                self.waiting -= 1
+            self._observe_wait(time.perf_counter() - start)
+        else:
+            await self._slots.acquire()
+            self._observe_wait(0.0)
+        self.active += 1
+        ADMISSION_IN_FLIGHT.set(self.active, endpoint=self.name)
+
+    def leave(self) -> None:
+        self.active -= 1
+        ADMISSION_IN_FLIGHT.set(self.active, endpoint=self.name)
+        self._slots.release()
+
+    def retry_after(self) -> float:
+        return max(1.0, self.wait_estimate)
+
+
+def default_gates() -> List[EndpointGate]:
+    # The first gate matching a path wins, so the stream paths go before /match-jobs
+    return [
+        EndpointGate(
+            "stream", ("/match-jobs/stream", "/match-jobs/batch"), STREAM_CONCURRENCY, STREAM_RATE, STREAM_BURST,
+            queue_timeout=0,
+        ),
+        EndpointGate("match", ("/match-jobs", "/jobs/search"), MATCH_CONCURRENCY, MATCH_RATE, MATCH_BURST),
+        EndpointGate(
+            "analyze", ("/analyze-resume", "/candidates"), ANALYZE_CONCURRENCY, ANALYZE_RATE, ANALYZE_BURST
+        ),
+        EndpointGate("refresh", "/refresh-jobs", REFRESH_CONCURRENCY, REFRESH_RATE, REFRESH_BURST, queue_timeout=0),
+    ]
+
+
+def _rejection(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail}, status_code=status_code, headers={"Retry-After": str(math.ceil(retry_after))}
+    )
+
+
+class AdmissionMiddleware:
+    """ASGI middleware guarding the expensive POST endpoints.
+
+    Over its rate limit a client gets 429; when the endpoint is saturated
+    the request gets 503. Both carry Retry-After. Other requests, and reads
+    such as task polling, pass straight through.
+    """
+
+    def __init__(self, app, gates: Optional[List[EndpointGate]] = None):
+        self.app = app
+        self.gates = default_gates() if gates is None else gates
+
+    def gate_for(self, path: str) -> Optional[EndpointGate]:
+        for gate in self.gates:
+            if gate.matches(path):
+                return gate
+        return None
+
+    async def __call__(self, scope, receive, send):
+        gate = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            gate = self.gate_for(scope["path"])
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = gate.check_rate(client_address(scope))
+        if retry_after:
+            ADMISSION_REJECTIONS.inc(endpoint=gate.name, reason="rate_limited")
+            await _rejection(429, "Too many requests, slow down", retry_after)(scope, receive, send)
+            return
+        try:
+            await gate.enter()
+        except Overloaded as e:
+            ADMISSION_REJECTIONS.inc(endpoint=gate.name, reason="shed")
+            logger.warning(f"Shedding {scope['path']}: {str(e)}")
+            await _rejection(503, "Server is busy, try again shortly", gate.retry_after())(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.leave()
@@ -1,16 +1,62 @@
 import io
 import logging
 import re
-from typing import List
+from typing import Dict, List, Optional
 
 import PyPDF2
 
 from .models import ResumeAnalysis, ATSScore, ResumeWeakness
+from .nlp import get_extractor, years_from_dates
 
 
 logger = logging.getLogger(__name__)
 
 
+SKILLS_KEYWORDS = [
+    "python",
+    "javascript",
+    "java",
+    "react",
+    "node.js",
+    "sql",
+    "mongodb",
+    "aws",
+    "docker",
+    "kubernetes",
+    "git",
+    "html",
+    "css",
+    "typescript",
+    "angular",
+    "vue.js",
+    "django",
+    "flask",
+    "fastapi",
+    "spring",
+    "machine learning",
+    "ai",
+    "data science",
+    "devops",
+    "agile",
+    "scrum",
+    "jira",
+    "figma",
+    "photoshop",
+    "illustrator",
+    "excel",
+    "powerpoint",
+    "word",
+    "salesforce",
+    "tableau",
+    "power bi",
+]
+
+
+def extract_skills(text_lower: str) -> List[str]:
+    """Known skills mentioned in an already lowercased text, title-cased."""
+    return [skill.title() for skill in SKILLS_KEYWORDS if skill in text_lower]
+
+
 def extract_text_from_pdf(pdf_file: bytes) -> str:
     try:
         pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file))
@@ -168,54 +214,15 @@ def detect_resume_weaknesses(text: str) -> List[ResumeWeakness]:
         return []
 
 
-def analyze_resume(text: str) -> ResumeAnalysis:
+def analyze_resume(text: str, entities: Optional[Dict[str, List[str]]] = None) -> ResumeAnalysis:
     try:
+        # NER needs the original casing; everything below works on lowercase
+        if entities is None:
+            entities = get_extractor().extract([text])[0]
         text = text.lower()
         lines = text.split("\n")
 
-        skills_keywords = [
-            "python",
-            "javascript",
-            "java",
-            "react",
-            "node.js",
-            "sql",
-            "mongodb",
-            "aws",
-            "docker",
-            "kubernetes",
-            "git",
-            "html",
-            "css",
-            "typescript",
-            "angular",
-            "vue.js",
-            "django",
-            "flask",
-            "fastapi",
-            "spring",
-            "machine learning",
-            "ai",
-            "data science",
-            "devops",
-            "agile",
-            "scrum",
-            "jira",
-            "figma",
-            "photoshop",
-            "illustrator",
-            "excel",
-            "powerpoint",
-            "word",
-            "salesforce",
-            "tableau",
-            "power bi",
-        ]
-
-        skills: List[str] = []
-        for skill in skills_keywords:
-            if skill in text:
-                skills.append(skill.title())
+        skills = extract_skills(text)
 
         job_titles: List[str] = []
         job_patterns = [
@@ -254,6 +261,8 @@ def analyze_resume(text: str) -> ResumeAnalysis:
             if match:
                 experience_years = int(match.group(1))
                 break
+        if experience_years is None:
+            experience_years = years_from_dates(entities.get("dates", []))
 
         summary = (
             f"Professional with {experience_years or 'relevant'} years of experience in "
@@ -274,6 +283,8 @@ def analyze_resume(text: str) -> ResumeAnalysis:
             summary=summary,
             ats_score=ats_score,
             weaknesses=weaknesses,
+            organizations=entities.get("organizations", [])[:10],
+            degrees=entities.get("degrees", [])[:5],
         )
     except Exception as e:
         logger.error(f"Error analyzing resume: {str(e)}")
@@ -286,3 +297,7 @@ def analyze_resume(text: str) -> ResumeAnalysis:
         )
 
 
+def analyze_resumes(texts: List[str]) -> List[ResumeAnalysis]:
+    """Analyze many resumes, running entity extraction for all of them in one batch."""
+    entities = get_extractor().extract(texts)
+    return [analyze_resume(text, text_entities) for text, text_entities in zip(texts, entities)]
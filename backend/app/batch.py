@@ -0,0 +1,114 @@
+import io
+import logging
+import os
+import zipfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .analysis import extract_text_from_pdf
+from .embedding import EMBEDDING_POOLING, encode_documents, max_sim_scores
+from .metrics import stage_timer
+from .ranking import rank_matches
+from .store import JobStore
+
+
+logger = logging.getLogger(__name__)
+
+
+# Resumes per encode + GEMM step. Large enough to keep the matrix product
+# efficient, small enough that the first results stream out quickly.
+BATCH_ENCODE_SIZE = 256
+MAX_ARCHIVE_RESUMES = 10000
+# Uncompressed size limits, checked before and while inflating each member so
+# a zip bomb can't exhaust memory
+MAX_RESUME_BYTES = 5 * 1024 * 1024
+MAX_ARCHIVE_BYTES = 200 * 1024 * 1024
+
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, budget: int) -> bytes:
+    if budget < MAX_RESUME_BYTES:
+        limit, error = budget, f"Archive is larger than {MAX_ARCHIVE_BYTES} bytes uncompressed"
+    else:
+        limit, error = MAX_RESUME_BYTES, f"{info.filename} is larger than {MAX_RESUME_BYTES} bytes uncompressed"
+    if info.file_size > limit:
+        raise ValueError(error)
+    # file_size comes from the archive and may lie; never inflate past the limit
+    with archive.open(info) as member:
+        data = member.read(limit + 1)
+    if len(data) > limit:
+        raise ValueError(error)
+    return data
+
+
+def read_resume_archive(content: bytes) -> List[Tuple[str, str]]:
+    """Extract (name, text) pairs for the PDF and text resumes in a zip archive.
+
+    Raises ValueError when a resume is over MAX_RESUME_BYTES or all of them
+    together over MAX_ARCHIVE_BYTES once uncompressed.
+    """
+    resumes = []
+    budget = MAX_ARCHIVE_BYTES
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            name = info.filename
+            lowered = name.lower()
+            if not lowered.endswith((".pdf", ".txt")):
+                continue
+            data = _read_member(archive, info, budget)
+            budget -= len(data)
+            if lowered.endswith(".pdf"):
+                text = extract_text_from_pdf(data)
+            else:
+                text = data.decode("utf-8", errors="ignore")
+            resumes.append((os.path.basename(name), text))
+            if len(resumes) >= MAX_ARCHIVE_RESUMES:
+                logger.warning(f"Resume archive truncated at {MAX_ARCHIVE_RESUMES} files")
+                break
+    return resumes
+
+
+def match_resume_batch(
+    sentence_model,
+    resume_texts: List[str],
+    jobs: JobStore,
+    job_embeddings: Optional[np.ndarray],
+    chunk_embeddings: Optional[np.ndarray] = None,
+    chunk_owners: Optional[np.ndarray] = None,
+    top_k: int = 20,
+    rows: Optional[np.ndarray] = None,
+) -> List[List[Tuple[int, float, float, float]]]:
+    """Top-k ``(row, match, semantic, keyword)`` matches for each resume.
+
+    All resumes are encoded in one batched call and scored against the job
+    matrix with a single matrix-matrix product, or, when job chunk vectors
+    are kept for max-sim, chunk against chunk like ``calculate_semantic_scores``.
+    """
+    if rows is None:
+        rows = np.arange(len(jobs))
+
+    if sentence_model is None or job_embeddings is None:
+        semantic_matrix = np.full((len(resume_texts), len(rows)), 0.5, dtype="float32")
+    elif chunk_embeddings is not None and chunk_owners is not None:
+        with stage_timer("embedding"):
+            _, resume_chunks, resume_owners = encode_documents(
+                sentence_model, resume_texts, pooling=EMBEDDING_POOLING, keep_chunks=True
+            )
+        selected = np.isin(chunk_owners, rows)
+        chunk_embeddings, chunk_owners = chunk_embeddings[selected], chunk_owners[selected]
+        semantic_matrix = [
+            max_sim_scores(resume_chunks[resume_owners == i], chunk_embeddings, chunk_owners)
+            for i in range(len(resume_texts))
+        ]
+    else:
+        with stage_timer("embedding"):
+            resume_vectors, _, _ = encode_documents(sentence_model, resume_texts, pooling=EMBEDDING_POOLING)
+        semantic_matrix = resume_vectors @ job_embeddings[rows].T
+
+    results = []
+    with stage_timer("scoring"):
+        for resume_text, semantic_scores in zip(resume_texts, semantic_matrix):
+            results.append(rank_matches(jobs, semantic_scores, resume_text.split(), rows, limit=top_k))
+    return results
@@ -0,0 +1,217 @@
+import base64
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+
+CANDIDATE_INDEX_DIR = os.getenv("CANDIDATE_INDEX_DIR", os.path.join("data", "candidates"))
+
+
+def _atomic_write(path: str, write) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _encode_entry(record: Dict, embedding: np.ndarray) -> bytes:
+    vector = base64.b64encode(np.asarray(embedding, dtype="<f4").tobytes()).decode("ascii")
+    return json.dumps(dict(record, embedding=vector), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def _decode_entry(line: bytes) -> Tuple[Dict, np.ndarray]:
+    record = json.loads(line)
+    return record, np.frombuffer(base64.b64decode(record.pop("embedding")), dtype="<f4")
+
+
+class CandidateIndex:
+    """Persistent k-NN index of analyzed resumes, mirroring the job index.
+
+    Records hold the ``analyze_resume`` output; embeddings are unit vectors
+    from the same chunked encoder as the jobs, so a job vector can be scored
+    against every candidate with one matrix-vector product. Both are kept in
+    ``candidates.jsonl`` under ``directory``, one line per candidate, and
+    reloaded on startup. ``add`` appends a line; ``remove`` rewrites the
+    file, so it costs O(n).
+
+    Several processes (uvicorn workers) may share ``directory``. Changes
+    are made under an exclusive flock on ``candidates.lock``, after reading
+    whatever another process appended, so no process overwrites another's
+    adds. ``search`` reads those changes too once the file has grown or
+    been replaced.
+    """
+
+    def __init__(self, directory: Optional[str] = CANDIDATE_INDEX_DIR):
+        self.directory = directory
+        self.records: List[Dict] = []
+        self.embeddings: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        # inode of candidates.jsonl and how many of its bytes are loaded
+        self._position: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def _path(self) -> str:
+        return os.path.join(self.directory, "candidates.jsonl")
+
+    @contextmanager
+    def _exclusive(self):
+        """Held while reading or changing the index, across threads and processes."""
+        with self._lock:
+            if not self.directory or fcntl is None:
+                yield
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, "candidates.lock"), "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _on_disk(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def _sync(self) -> None:
+        """Read what other processes wrote since we last did; needs ``_exclusive``."""
+        on_disk = self._on_disk()
+        if on_disk is None or on_disk == self._position:
+            return
+        if self._position is not None and on_disk[0] == self._position[0] and on_disk[1] > self._position[1]:
+            self._read(self._position[1])
+        else:
+            # replaced by a remove
+            self._read(0)
+
+    def _read(self, start: int) -> None:
+        with open(self._path, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            f.seek(start)
+            data = f.read()
+        # a line cut short by a crash mid-append is dropped by the next add
+        data = data[:data.rfind(b"\n") + 1]
+        records, vectors = [], []
+        for line in data.splitlines():
+            try:
+                record, vector = _decode_entry(line)
+            except Exception as e:
+                logger.error(f"Skipping unreadable candidate entry: {str(e)}")
+                continue
+            records.append(record)
+            vectors.append(vector)
+        if start == 0:
+            self.records, self.embeddings = [], None
+        self.records.extend(records)
+        if vectors:
+            new = np.vstack(vectors)
+            self.embeddings = new if self.embeddings is None else np.vstack([self.embeddings, new])
+        self._position = (inode, start + len(data))
+
+    def load(self) -> None:
+        if not self.directory or not os.path.exists(self._path):
+            return
+        try:
+            with self._exclusive():
+                self._read(0)
+            logger.info(f"Loaded {len(self.records)} candidates from {self.directory}")
+        except Exception as e:
+            logger.error(f"Error loading candidate index: {str(e)}")
+
+    def refresh(self) -> None:
+        """Pick up changes saved by other processes sharing the directory."""
+        if self.directory and self._on_disk() != self._position:
+            with self._exclusive():
+                self._sync()
+
+    def _append(self, entry: bytes) -> None:
+        with open(self._path, "ab") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            if self._position is not None and self._position[0] == inode:
+                # after _sync, anything past our position is a partial line
+                f.truncate(self._position[1])
+            f.write(entry)
+            f.flush()
+            self._position = (inode, os.fstat(f.fileno()).st_size)
+
+    def save(self) -> None:
+        """Rewrite the whole file from memory."""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        vectors = self.embeddings if self.embeddings is not None else []
+        entries = b"".join(_encode_entry(record, vector) for record, vector in zip(self.records, vectors))
+        _atomic_write(self._path, lambda f: f.write(entries))
+        self._position = self._on_disk()
+
+    def add(self, name: str, analysis: Dict, embedding: np.ndarray, candidate_id: Optional[str] = None) -> Dict:
+        record = {
+            "candidate_id": candidate_id or uuid.uuid4().hex,
+            "name": name,
+            "added_at": datetime.now().isoformat(),
+            "analysis": analysis,
+        }
+        vector = np.asarray(embedding, dtype="float32").reshape(1, -1)
+        with self._exclusive():
+            if self.directory:
+                self._sync()
+                self._append(_encode_entry(record, vector[0]))
+            if self.embeddings is None or len(self.embeddings) == 0:
+                self.embeddings = vector
+            else:
+                self.embeddings = np.vstack([self.embeddings, vector])
+            self.records.append(record)
+        return record
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._exclusive():
+            if self.directory:
+                self._sync()
+            for position, record in enumerate(self.records):
+                if record["candidate_id"] == candidate_id:
+                    del self.records[position]
+                    self.embeddings = np.delete(self.embeddings, position, axis=0)
+                    self.save()
+                    return True
+        return False
+
+    def search(self, query: np.ndarray, k: int, margin: float = 0.0) -> List[Tuple[Dict, float]]:
+        """The k candidates closest to the query vector, best first.
+
+        With a ``margin``, every candidate scoring within ``margin`` of the
+        k-th best is returned too, for callers that re-rank on extra signals.
+        """
+        self.refresh()
+        with self._lock:
+            records, embeddings = list(self.records), self.embeddings
+        if embeddings is None or len(records) == 0 or k <= 0:
+            return []
+        scores = embeddings @ np.asarray(query, dtype="float32")
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            if margin > 0:
+                top = np.flatnonzero(scores >= scores[top].min() - margin)
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(records[i], float(scores[i])) for i in top]
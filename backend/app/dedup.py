@@ -0,0 +1,130 @@
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .matching import parse_salary_range
+
+
+logger = logging.getLogger(__name__)
+
+
+SIMHASH_BITS = 64
+# Four 16-bit bands: by pigeonhole, fingerprints within 3 bits of each other
+# share at least one band exactly, so band lookups find every candidate.
+SIMHASH_BANDS = 4
+MAX_HAMMING_DISTANCE = 3
+SHINGLE_SIZE = 3
+
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+_BIT_POSITIONS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def _hash64(token: str) -> int:
+    # hashlib rather than hash(): fingerprints must be stable across processes
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash of the text's word shingles, or None for empty text."""
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    hashes = np.fromiter((_hash64(shingle) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    # A bit is set when more than half of the shingle hashes have it set
+    majority = bits.sum(axis=0) * 2 > len(shingles)
+    return sum(1 << int(bit) for bit in np.flatnonzero(majority))
+
+
+def job_fingerprint(job: Dict) -> Optional[int]:
+    """SimHash over normalized title + company + description shingles."""
+    return simhash(" ".join((job.get("title", ""), job.get("company", ""), job.get("description", ""))))
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    return [(band, (fingerprint >> (band * _BAND_BITS)) & _BAND_MASK) for band in range(SIMHASH_BANDS)]
+
+
+class NearDuplicateIndex:
+    """LSH index over SimHash fingerprints for incremental near-duplicate lookups."""
+
+    def __init__(self, max_distance: int = MAX_HAMMING_DISTANCE):
+        self.max_distance = max_distance
+        self.fingerprints: List[int] = []
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """Position of an indexed fingerprint within max_distance, if any."""
+        for key in _bands(fingerprint):
+            for position in self._buckets.get(key, ()):
+                if bin(self.fingerprints[position] ^ fingerprint).count("1") <= self.max_distance:
+                    return position
+        return None
+
+    def add(self, fingerprint: int) -> int:
+        position = len(self.fingerprints)
+        self.fingerprints.append(fingerprint)
+        for key in _bands(fingerprint):
+            self._buckets.setdefault(key, []).append(position)
+        return position
+
+    def add_if_new(self, job: Dict) -> bool:
+        """Index the job and return True unless it near-duplicates an indexed one."""
+        fingerprint = job_fingerprint(job)
+        if fingerprint is None:
+            return True
+        if self.find(fingerprint) is not None:
+            return False
+        self.add(fingerprint)
+        return True
+
+
+def _canonical_rank(job: Dict) -> Tuple[int, int, int]:
+    # Prefer postings with a known salary, then the richest description,
+    # then direct sources (RemoteOK) over aggregator country feeds.
+    has_salary = parse_salary_range(job.get("salary"))[1] is not None
+    return (
+        int(has_salary),
+        len(job.get("description", "")),
+        int(not str(job.get("source", "")).startswith("adzuna")),
+    )
+
+
+def collapse_near_duplicates(jobs: List[Dict]) -> List[Dict]:
+    """Collapse clusters of near-duplicate jobs to one canonical job each.
+
+    Order follows each cluster's first occurrence, so the output is stable
+    for a given input.
+    """
+    index = NearDuplicateIndex()
+    clusters: List[List[Dict]] = []
+    cluster_of_position: List[int] = []
+    for job in jobs:
+        fingerprint = job_fingerprint(job)
+        if fingerprint is None:
+            clusters.append([job])
+            continue
+        position = index.find(fingerprint)
+        if position is None:
+            index.add(fingerprint)
+            cluster_of_position.append(len(clusters))
+            clusters.append([job])
+        else:
+            clusters[cluster_of_position[position]].append(job)
+
+    collapsed = [max(cluster, key=_canonical_rank) for cluster in clusters]
+    if len(collapsed) != len(jobs):
+        logger.info(f"Collapsed {len(jobs) - len(collapsed)} near-duplicate jobs")
+    return collapsed
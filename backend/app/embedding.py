@@ -0,0 +1,109 @@
+import logging
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+# all-MiniLM-L6-v2 truncates its input at 256 word pieces; ~180 whitespace
+# tokens keeps a window under that limit for typical English text.
+DEFAULT_WINDOW = 180
+DEFAULT_OVERLAP = 40
+DEFAULT_BATCH_SIZE = 64
+
+# How chunk vectors are pooled into one vector per document. Jobs and the
+# resumes scored against them must be pooled alike. With max-sim, job chunk
+# vectors are kept and a resume scores as its best chunk-to-chunk similarity.
+EMBEDDING_POOLING = os.getenv("EMBEDDING_POOLING", "mean")
+EMBEDDING_MAX_SIM = os.getenv("EMBEDDING_MAX_SIM", "false").lower() in ("1", "true", "yes")
+
+
+def chunk_text(text: str, window: int = DEFAULT_WINDOW, overlap: int = DEFAULT_OVERLAP) -> List[str]:
+    """Split text into overlapping word windows that fit the encoder."""
+    words = (text or "").split()
+    if len(words) <= window:
+        return [" ".join(words)]
+
+    step = max(1, window - overlap)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + window]))
+        if start + window >= len(words):
+            break
+    return chunks
+
+
+def _chunk_starts(chunk_owners: np.ndarray) -> np.ndarray:
+    """Offsets of the first chunk of every document (owners are contiguous)."""
+    if len(chunk_owners) == 0:
+        return np.zeros(0, dtype=np.int64)
+    boundaries = np.flatnonzero(chunk_owners[1:] != chunk_owners[:-1]) + 1
+    return np.concatenate(([0], boundaries)).astype(np.int64)
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def pool_chunks(chunk_vectors: np.ndarray, chunk_owners: np.ndarray, pooling: str = "mean") -> np.ndarray:
+    """Pool per-chunk vectors into one unit-length vector per document."""
+    starts = _chunk_starts(chunk_owners)
+    if pooling == "max":
+        pooled = np.maximum.reduceat(chunk_vectors, starts, axis=0)
+    elif pooling == "mean":
+        sums = np.add.reduceat(chunk_vectors, starts, axis=0)
+        counts = np.diff(np.append(starts, len(chunk_owners)))
+        pooled = sums / counts[:, None]
+    else:
+        raise ValueError(f"Unknown pooling strategy: {pooling}")
+    return _normalize_rows(pooled.astype("float32"))
+
+
+def encode_documents(
+    sentence_model,
+    texts: List[str],
+    pooling: str = "mean",
+    keep_chunks: bool = False,
+    window: int = DEFAULT_WINDOW,
+    overlap: int = DEFAULT_OVERLAP,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """Encode long documents by chunking them and pooling the chunk vectors.
+
+    Every chunk of every document goes through a single batched ``encode``
+    call. Returns ``(doc_vectors, chunk_vectors, chunk_owners)``; the chunk
+    arrays are ``None`` unless ``keep_chunks`` is set.
+    """
+    all_chunks: List[str] = []
+    owners: List[int] = []
+    for doc_id, text in enumerate(texts):
+        chunks = chunk_text(text, window=window, overlap=overlap)
+        all_chunks.extend(chunks)
+        owners.extend([doc_id] * len(chunks))
+
+    chunk_owners = np.asarray(owners, dtype=np.int64)
+    chunk_vectors = sentence_model.encode(
+        all_chunks,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    ).astype("float32")
+
+    doc_vectors = pool_chunks(chunk_vectors, chunk_owners, pooling=pooling)
+    logger.debug(f"Encoded {len(texts)} documents as {len(all_chunks)} chunks")
+
+    if keep_chunks:
+        return doc_vectors, chunk_vectors, chunk_owners
+    return doc_vectors, None, None
+
+
+def max_sim_scores(query_chunks: np.ndarray, chunk_vectors: np.ndarray, chunk_owners: np.ndarray) -> np.ndarray:
+    """Best chunk-to-chunk cosine similarity between a query and each document."""
+    best_per_chunk = (chunk_vectors @ query_chunks.T).max(axis=1)
+    return np.maximum.reduceat(best_per_chunk, _chunk_starts(chunk_owners))
@@ -0,0 +1,77 @@
+import logging
+import re
+import sys
+from typing import AbstractSet, Dict, List, Optional, Tuple
+
+from .analysis import extract_skills
+from .matching import job_match_text, parse_salary_range, text_terms
+
+
+logger = logging.getLogger(__name__)
+
+
+# Checked in order against the title; the first level that matches wins
+SENIORITY_PATTERNS = [
+    ("intern", re.compile(r"\b(intern|internship|trainee|apprentice)\b")),
+    ("director", re.compile(r"\b(director|head of|vp|vice president|chief|cto|cio)\b")),
+    ("lead", re.compile(r"\b(lead|principal|staff|architect)\b")),
+    ("senior", re.compile(r"\b(senior|sr)\b")),
+    ("junior", re.compile(r"\b(junior|jr|entry[- ]level|graduate)\b")),
+    ("mid", re.compile(r"\b(mid|mid[- ]level|intermediate)\b")),
+]
+SENIORITY_LEVELS = [level for level, _ in SENIORITY_PATTERNS]
+
+class JobFeatures:
+    """Everything the request path needs from a job, computed once at ingest.
+
+    ``search_text`` and ``terms`` only live until the corpus is built: the
+    text feeds the embeddings and the terms the JobStore term index.
+    """
+
+    __slots__ = ("search_text", "terms", "skills", "seniority", "salary_min", "salary_max")
+
+    def __init__(
+        self,
+        search_text: str,
+        terms: AbstractSet[str],
+        skills: Tuple[str, ...],
+        seniority: Optional[str],
+        salary_min: Optional[float],
+        salary_max: Optional[float],
+    ):
+        self.search_text = search_text
+        self.terms = terms
+        self.skills = skills
+        self.seniority = seniority
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+
+
+def detect_seniority(title: str) -> Optional[str]:
+    title = title.lower()
+    for level, pattern in SENIORITY_PATTERNS:
+        if pattern.search(title):
+            return level
+    return None
+
+
+def compute_job_features(job: Dict) -> JobFeatures:
+    try:
+        search_text = job_match_text(job)
+        salary_min, salary_max = parse_salary_range(job.get("salary"))
+        return JobFeatures(
+            search_text=search_text,
+            terms=text_terms(search_text),
+            skills=tuple(sys.intern(skill) for skill in extract_skills(search_text)),
+            seniority=detect_seniority(job.get("title", "")),
+            salary_min=salary_min,
+            salary_max=salary_max,
+        )
+    except Exception as e:
+        logger.error(f"Error computing features for job {job.get('job_id', '')}: {str(e)}")
+        return JobFeatures("", set(), (), None, None, None)
+
+
+def compute_features(jobs: List[Dict]) -> List[JobFeatures]:
+    """Ingest stage run by refresh_jobs_data before the corpus is published."""
+    return [compute_job_features(job) for job in jobs]
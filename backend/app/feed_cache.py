@@ -0,0 +1,173 @@
+import copy
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import urlencode
+
+
+logger = logging.getLogger(__name__)
+
+
+FEED_CACHE_DIR = os.getenv("FEED_CACHE_DIR", os.path.join("data", "feed_cache"))
+# Parsed feeds kept in memory, so a 304 skips parsing as well as the download
+MAX_PARSED_FEEDS = 256
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class FeedCache:
+    """Validators and gzipped raw payloads for upstream feeds, per URL.
+
+    Each entry holds the ETag / Last-Modified validators and a digest of the
+    last good payload, which is stored on disk as ``<key>.gz`` (in memory
+    when ``directory`` is None) so it can be replayed after a restart or
+    while the upstream is down. ``parsed`` memoizes the parser output per
+    payload digest; callers get their own copy of it, so mutating a result
+    never leaks into the next fetch.
+    """
+
+    def __init__(self, directory: Optional[str] = FEED_CACHE_DIR, max_parsed: int = MAX_PARSED_FEEDS):
+        self.directory = directory
+        self.max_parsed = max_parsed
+        self._entries: Dict[str, Dict] = {}
+        self._payloads: Dict[str, bytes] = {}
+        self._parsed: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> str:
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha1(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def entry(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None and self.directory and os.path.exists(self._path(key, ".json")):
+            try:
+                with open(self._path(key, ".json"), "r", encoding="utf-8") as f:
+                    entry = self._entries[key] = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading feed cache entry {key}: {str(e)}")
+        return entry
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        entry = self.entry(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(
+        self,
+        key: str,
+        url: str,
+        payload: bytes,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        charset: Optional[str],
+        parse: Callable[[str], Any],
+        variant: Hashable = None,
+    ) -> Tuple[bool, Any]:
+        """Record a 200 response, returning (changed, parsed payload).
+
+        An unchanged payload is not parsed again. A changed one is parsed
+        before anything is stored, so a payload the parser rejects never
+        replaces the last good one; that one is returned instead, unchanged.
+        """
+        digest = hashlib.sha1(payload).hexdigest()
+        previous = self.entry(key)
+        changed = previous is None or previous.get("digest") != digest
+        charset = charset or "utf-8"
+        if changed:
+            try:
+                result = parse(payload.decode(charset, errors="ignore"))
+            except Exception as e:
+                if previous is None:
+                    raise
+                logger.error(f"Error parsing new payload from {url}, replaying the last good one: {str(e)}")
+                return False, self.parsed(key, parse, variant)
+
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "charset": charset,
+            "digest": digest,
+            "fetched_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._entries[key] = entry
+            if not self.directory:
+                self._payloads[key] = payload
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                if changed:
+                    _atomic_write(self._path(key, ".gz"), gzip.compress(payload))
+                _atomic_write(self._path(key, ".json"), json.dumps(entry).encode("utf-8"))
+            except Exception as e:
+                logger.error(f"Error writing feed cache entry {key}: {str(e)}")
+
+        if not changed:
+            return False, self.parsed(key, parse, variant)
+        self._remember((key, digest, variant), result)
+        return True, copy.deepcopy(result)
+
+    def payload(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return self._payloads.get(key)
+        if not os.path.exists(self._path(key, ".gz")):
+            return None
+        with open(self._path(key, ".gz"), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def parsed(self, key: str, parse: Callable[[str], Any], variant: Hashable = None) -> Any:
+        """``parse(text)`` of the stored payload, computed once per payload digest."""
+        entry = self.entry(key)
+        if entry is None:
+            raise KeyError(key)
+        memo_key = (key, entry["digest"], variant)
+        with self._lock:
+            if memo_key in self._parsed:
+                self._parsed.move_to_end(memo_key)
+                return copy.deepcopy(self._parsed[memo_key])
+        payload = self.payload(key)
+        if payload is None:
+            raise KeyError(key)
+        result = parse(payload.decode(entry.get("charset") or "utf-8", errors="ignore"))
+        self._remember(memo_key, result)
+        return copy.deepcopy(result)
+
+    def _remember(self, memo_key: tuple, result: Any) -> None:
+        with self._lock:
+            self._parsed[memo_key] = result
+            while len(self._parsed) > self.max_parsed:
+                self._parsed.popitem(last=False)
+
+
+_default_cache: Optional[FeedCache] = None
+
+
+def default_feed_cache() -> FeedCache:
+    """Process-wide cache shared by every JobScraper."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FeedCache()
+    return _default_cache
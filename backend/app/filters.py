@@ -0,0 +1,127 @@
+import logging
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .models import JobFilters
+from .store import JobStore
+
+
+logger = logging.getLogger(__name__)
+
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _parse_posted_day(posted_date: Optional[str]) -> Optional[int]:
+    """Days since the epoch for ISO-ish dates like 2024-01-15T10:00:00Z."""
+    if not posted_date:
+        return None
+    try:
+        return (date.fromisoformat(str(posted_date)[:10]) - _EPOCH).days
+    except ValueError:
+        return None
+
+
+def _group_rows(values: Iterable[str]) -> Dict[str, np.ndarray]:
+    groups: Dict[str, List[int]] = {}
+    for row, value in enumerate(values):
+        groups.setdefault(value, []).append(row)
+    return {value: np.asarray(rows, dtype=np.int64) for value, rows in groups.items()}
+
+
+def _group_rows_multi(values_per_row: Iterable[List[str]]) -> Dict[str, np.ndarray]:
+    groups: Dict[str, List[int]] = {}
+    for row, values in enumerate(values_per_row):
+        for value in set(values):
+            groups.setdefault(value, []).append(row)
+    return {value: np.asarray(rows, dtype=np.int64) for value, rows in groups.items()}
+
+
+def _union(groups: Iterable[np.ndarray]) -> np.ndarray:
+    groups = list(groups)
+    if not groups:
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(np.concatenate(groups))
+
+
+class _SortedColumn:
+    """Rows ordered by a numeric value, for range lookups via binary search."""
+
+    def __init__(self, values: List[Optional[float]]):
+        known = [(value, row) for row, value in enumerate(values) if value is not None]
+        known.sort()
+        self.values = np.asarray([value for value, _ in known], dtype=np.float64)
+        self.rows = np.asarray([row for _, row in known], dtype=np.int64)
+
+    def at_least(self, threshold: float) -> np.ndarray:
+        start = np.searchsorted(self.values, threshold, side="left")
+        return np.sort(self.rows[start:])
+
+
+class JobFilterIndex:
+    """ID-set indexes over a JobStore for pre-filtering before scoring.
+
+    Categorical fields (source, location, tags, seniority) map each distinct
+    value to a sorted array of rows; salary and posted date are kept as
+    value-sorted rows for binary-searched range lookups. ``select`` intersects the
+    matching row sets smallest-first, so a selective query costs roughly in
+    proportion to the rows it returns rather than the corpus size.
+    """
+
+    def __init__(self, store: JobStore):
+        self.size = len(store)
+        self.by_source = _group_rows(store.sources)
+        self.by_location = _group_rows(location.lower() for location in store.locations)
+        self.by_tag = _group_rows_multi(
+            [tag.lower() for tag in tags] for tags in store.tags
+        )
+        self.remote_rows = np.asarray(
+            [
+                row for row in range(self.size)
+                if "remote" in store.locations[row].lower()
+                or any(tag.lower() == "remote" for tag in store.tags[row])
+            ],
+            dtype=np.int64,
+        )
+        self.by_seniority = _group_rows(store.seniorities)
+        self.salary = _SortedColumn(
+            [None if np.isnan(salary_max) else float(salary_max) for salary_max in store.salary_ranges[:, 1]]
+        )
+        self.posted = _SortedColumn([_parse_posted_day(posted) for posted in store.posted_dates])
+
+    def select(self, filters: JobFilters) -> Optional[np.ndarray]:
+        """Sorted rows matching every filter, or None when no filter is set."""
+        row_sets: List[np.ndarray] = []
+
+        if filters.source:
+            source = filters.source.lower()
+            row_sets.append(_union(rows for value, rows in self.by_source.items() if value.lower().startswith(source)))
+        if filters.location:
+            location = filters.location.lower()
+            row_sets.append(_union(rows for value, rows in self.by_location.items() if location in value))
+        if filters.job_type:
+            row_sets.append(self.by_tag.get(filters.job_type.lower(), np.zeros(0, dtype=np.int64)))
+        if filters.seniority:
+            row_sets.append(self.by_seniority.get(filters.seniority.lower(), np.zeros(0, dtype=np.int64)))
+        if filters.remote is not None:
+            if filters.remote:
+                row_sets.append(self.remote_rows)
+            else:
+                row_sets.append(np.setdiff1d(np.arange(self.size, dtype=np.int64), self.remote_rows, assume_unique=True))
+        if filters.min_salary is not None:
+            row_sets.append(self.salary.at_least(filters.min_salary))
+        if filters.posted_after is not None:
+            row_sets.append(self.posted.at_least((filters.posted_after - _EPOCH).days))
+
+        if not row_sets:
+            return None
+
+        row_sets.sort(key=len)
+        selected = row_sets[0]
+        for rows in row_sets[1:]:
+            if len(selected) == 0:
+                break
+            selected = np.intersect1d(selected, rows, assume_unique=True)
+        return selected
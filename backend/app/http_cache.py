@@ -0,0 +1,120 @@
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from .metrics import record_cache
+from .serialization import JSONBytesResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+CORPUS_VERSION_HEADER = "X-Corpus-Version"
+# Browsers and nginx may reuse a corpus response this long without asking;
+# after that a conditional request costs a 304
+CORPUS_CACHE_MAX_AGE = int(os.getenv("CORPUS_CACHE_MAX_AGE", "30"))
+# /jobs limits rendered as soon as a new corpus is published
+PRERENDERED_LIMITS = [int(limit) for limit in os.getenv("PRERENDERED_LIMITS", "10,20,50").split(",") if limit.strip()]
+MAX_CACHED_RESPONSES = int(os.getenv("MAX_CACHED_RESPONSES", "1024"))
+
+
+def make_etag(body: bytes) -> str:
+    """Strong validator: a digest of the exact bytes sent."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Rendered response bodies and their ETags for one corpus version.
+
+    Entries are keyed by the corpus version as well, so a refresh makes all
+    of them unreachable at once; ``invalidate`` then drops them. The cache
+    is only touched from the event loop.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self.version: Optional[int] = None
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, str]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, version: int) -> None:
+        self.version = version
+        self._entries.clear()
+
+    def get(self, version: int, key: Hashable, render: Callable[[], bytes]) -> Tuple[bytes, str]:
+        """(body, etag) for ``key``, rendering it on the first request for this version."""
+        if version != self.version:
+            self.invalidate(version)
+        entry = self._entries.get(key)
+        record_cache("response", entry is not None)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        body = render()
+        entry = self._entries[key] = (body, make_etag(body))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def warm(self, version: int, renderers: Dict[Hashable, Callable[[], bytes]]) -> None:
+        self.invalidate(version)
+        for key, render in renderers.items():
+            try:
+                self.get(version, key, render)
+            except Exception as e:
+                logger.error(f"Error pre-rendering {key}: {str(e)}")
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={CORPUS_CACHE_MAX_AGE}"}
+
+
+def cached_response(request: Request, entry: Tuple[bytes, str]) -> Response:
+    """200 with the cached body, or 304 when the client already has it."""
+    body, etag = entry
+    headers = cache_headers(etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONBytesResponse(body, headers=headers)
+
+
+class CorpusVersionMiddleware:
+    """ASGI middleware stamping every HTTP response with the corpus version."""
+
+    def __init__(self, app, version: Callable[[], int]):
+        self.app = app
+        self.version = version
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_version(message):
+            if message["type"] == "http.response.start":
+                headers: List[Tuple[bytes, bytes]] = list(message.get("headers", []))
+                headers.append((CORPUS_VERSION_HEADER.lower().encode("latin-1"), str(self.version()).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_version)
@@ -1,12 +1,15 @@
+import hashlib
 import logging
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Set, Tuple
 
 import faiss
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from .embedding import EMBEDDING_POOLING, encode_documents, max_sim_scores
+from .metrics import stage_timer
 from .models import JobMatch
 
 
@@ -63,35 +66,97 @@ def calculate_semantic_similarity(sentence_model, text1: str, text2: str) -> flo
         return 0.5
 
 
-def calculate_keyword_match(resume_keywords: List[str], job_text: str) -> float:
+def calculate_semantic_scores(
+    sentence_model,
+    resume_text: str,
+    job_embeddings: Optional[np.ndarray],
+    chunk_embeddings: Optional[np.ndarray] = None,
+    chunk_owners: Optional[np.ndarray] = None,
+    rows: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Score a resume against pre-encoded jobs in one matrix product.
+
+    When ``rows`` (sorted job rows) is given only those jobs are scored, and
+    the result is aligned with ``rows``.
+    """
+    if rows is not None:
+        job_count = len(rows)
+    else:
+        job_count = 0 if job_embeddings is None else len(job_embeddings)
     try:
-        if not resume_keywords:
-            return 0.0
-        
-        stop_words = {
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 
-            'the', 'to', 'was', 'will', 'with', 'you', 'your', 'i', 'we', 'this',
-            'role', 'this', 'team', 'our', 'we', 'have', 'all', 'you', 'their'
-        }
-        
-        job_text_lower = job_text.lower()
-        meaningful_keywords = [
-            k for k in resume_keywords 
-            if k.lower() not in stop_words and len(k) > 2
-        ]
-        
-        if not meaningful_keywords:
-            return 0.0
-            
-        matched_keywords = sum(
-            1 for keyword in meaningful_keywords 
-            if keyword.lower() in job_text_lower
-        )
-        return matched_keywords / len(meaningful_keywords)
+        if sentence_model is None or job_embeddings is None:
+            return np.full(job_count, 0.5, dtype="float32")
+        use_max_sim = chunk_embeddings is not None and chunk_owners is not None
+        with stage_timer("embedding"):
+            resume_vectors, resume_chunks, _ = encode_documents(
+                sentence_model, [resume_text], pooling=EMBEDDING_POOLING, keep_chunks=use_max_sim
+            )
+        with stage_timer("similarity"):
+            if use_max_sim:
+                if rows is not None:
+                    selected = np.isin(chunk_owners, rows)
+                    chunk_embeddings, chunk_owners = chunk_embeddings[selected], chunk_owners[selected]
+                return max_sim_scores(resume_chunks, chunk_embeddings, chunk_owners)
+            if rows is not None:
+                job_embeddings = job_embeddings[rows]
+            return job_embeddings @ resume_vectors[0]
     except Exception as e:
-        logger.error(f"Error calculating keyword match: {str(e)}")
-        return 0.0
+        logger.error(f"Error calculating semantic scores: {str(e)}")
+        return np.full(job_count, 0.5, dtype="float32")
+
+
+KEYWORD_STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 
+    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 
+    'the', 'to', 'was', 'will', 'with', 'you', 'your', 'i', 'we', 'this',
+    'role', 'this', 'team', 'our', 'we', 'have', 'all', 'you', 'their'
+}
+
+
+# Words with the punctuation tech names keep: node.js, c++, c#, ci-cd
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:[.\-][a-z0-9+#]+)*")
+
+
+def prepare_keywords(resume_keywords: List[str]) -> Dict[str, int]:
+    """Lowercased meaningful resume keywords and how often each occurs.
+
+    Done once per resume so scoring many jobs only does the term lookups.
+    """
+    counts: Dict[str, int] = {}
+    for keyword in resume_keywords:
+        lowered = keyword.lower()
+        if lowered not in KEYWORD_STOP_WORDS and len(keyword) > 2:
+            counts[lowered] = counts.get(lowered, 0) + 1
+    return counts
+
+
+def tokenize(text_lower: str) -> List[str]:
+    return _TOKEN_RE.findall(text_lower)
+
+
+def text_terms(text_lower: str) -> Set[str]:
+    """Words of a lowercased text plus each pair of adjacent words."""
+    tokens = tokenize(text_lower)
+    terms = set(tokens)
+    terms.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return terms
+
+
+def keyword_terms(keyword_lower: str) -> List[str]:
+    """Terms a job must contain to match a keyword.
+
+    A single word is looked up as is; a phrase such as "machine learning"
+    or "ci/cd" needs every pair of its adjacent words.
+    """
+    tokens = tokenize(keyword_lower)
+    if len(tokens) <= 1:
+        return tokens
+    return [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def term_hash(term: str) -> int:
+    """Stable 64-bit hash of a term, the key of JobStore's term index."""
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
 
 
 def normalize_job_data(job: Dict) -> Dict:
@@ -147,6 +212,34 @@ def normalize_job_data(job: Dict) -> Dict:
         return {}
 
 
+def parse_salary_range(salary: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """Parse salary strings like "80000 - 120000" or "$90k-$140k" into numbers."""
+    if not salary:
+        return None, None
+    amounts = []
+    for number, suffix in re.findall(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?", salary):
+        try:
+            amount = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        if suffix:
+            amount *= 1000
+        amounts.append(amount)
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
+
+
+def job_match_text(job: Dict) -> str:
+    return (
+        job.get("description", "")
+        + " "
+        + job.get("title", "")
+        + " "
+        + " ".join(job.get("tags", []))
+    ).lower()
+
+
 def build_vectorizer_and_index(job_texts: List[str]):
     vectorizer = TfidfVectorizer(max_features=5000, stop_words="english")
     tfidf_matrix = vectorizer.fit_transform(job_texts)
@@ -0,0 +1,301 @@
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Dict, List, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Latency buckets in seconds, from sub-millisecond scoring up to slow refreshes
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+EVENT_LOOP_LAG_INTERVAL = 0.5
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [non-cumulative bucket counts..., +Inf count], sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[position] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the block, in seconds, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key in sorted(self._counts):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), self._counts[key]):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "navicv_request_duration_seconds",
+    "HTTP request latency until the response headers are sent, by route template.",
+    ["method", "endpoint", "status"],
+))
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "navicv_stage_duration_seconds",
+    "Time spent in one processing stage of a request or refresh.",
+    ["stage"],
+))
+SOURCE_FETCH_LATENCY = REGISTRY.register(Histogram(
+    "navicv_source_fetch_duration_seconds",
+    "Time to fetch one batch of jobs from an upstream source.",
+    ["source", "outcome"],
+))
+SOURCE_EVENTS = REGISTRY.register(Counter(
+    "navicv_source_events_total",
+    "Resilience events per upstream source: retry, timeout, short_circuit, rate_limited.",
+    ["source", "event"],
+))
+SOURCE_CIRCUIT_OPEN = REGISTRY.register(Gauge(
+    "navicv_source_circuit_open",
+    "1 while the source's circuit breaker is open or half-open, else 0.",
+    ["source"],
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "navicv_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+))
+CORPUS_JOBS = REGISTRY.register(Gauge(
+    "navicv_corpus_jobs",
+    "Jobs in the currently published corpus.",
+))
+INDEX_BUILD_LATENCY = REGISTRY.register(Histogram(
+    "navicv_index_build_duration_seconds",
+    "Time to build one of the job indexes during a refresh.",
+    ["index"],
+))
+ANALYSIS_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "navicv_analysis_queue_depth",
+    "Resume analysis tasks waiting for a worker.",
+))
+SHARD_REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "navicv_shard_request_duration_seconds",
+    "Time for one shard to answer a coordinator request, by outcome (ok, timeout, error or status).",
+    ["shard", "outcome"],
+))
+ADMISSION_IN_FLIGHT = REGISTRY.register(Gauge(
+    "navicv_admission_in_flight",
+    "Requests holding a concurrency slot, per guarded endpoint group.",
+    ["endpoint"],
+))
+ADMISSION_REJECTIONS = REGISTRY.register(Counter(
+    "navicv_admission_rejections_total",
+    "Requests turned away by admission control, by reason (rate_limited or shed).",
+    ["endpoint", "reason"],
+))
+EVENT_LOOP_LAG = REGISTRY.register(Histogram(
+    "navicv_event_loop_lag_seconds",
+    "How late the event loop woke a periodic probe; high values mean blocking work on the loop.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+))
+
+
+def stage_timer(stage: str):
+    """Context manager timing one request or refresh stage."""
+    return STAGE_LATENCY.time(stage=stage)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+async def monitor_event_loop_lag(interval: float = EVENT_LOOP_LAG_INTERVAL) -> None:
+    """Sleep in a loop and record how far past its deadline each wake-up was."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - expected))
+
+
+async def timed_fetch(source: str, fetch: Awaitable[List[Dict]]) -> List[Dict]:
+    """Await one upstream fetch, recording its latency and outcome (ok, empty or error)."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        jobs = await fetch
+        outcome = "ok" if jobs else "empty"
+        return jobs
+    finally:
+        SOURCE_FETCH_LATENCY.observe(time.perf_counter() - start, source=source, outcome=outcome)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template.
+
+    Latency is measured until the response headers are sent, so streaming
+    endpoints report their time to first byte rather than the full stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        recorded = False
+
+        def record(status) -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start, method=scope["method"], endpoint=endpoint, status=str(status)
+            )
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        except Exception:
+            record(500)
+            raise
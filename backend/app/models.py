@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import date
 from typing import List, Optional, Dict, Any
 
 
@@ -47,6 +48,9 @@ class ResumeAnalysis(BaseModel):
     summary: str
     ats_score: Optional[ATSScore] = None
     weaknesses: List[ResumeWeakness] = []
+    # From spaCy NER; empty when the model isn't installed
+    organizations: List[str] = []
+    degrees: List[str] = []
 
 
 class JobSearchRequest(BaseModel):
@@ -56,6 +60,79 @@ class JobSearchRequest(BaseModel):
     limit: int = 20
 
 
+class JobFilters(BaseModel):
+    """Server-side pre-filters; unknown keys in job_preferences are ignored."""
+
+    source: Optional[str] = None
+    location: Optional[str] = None
+    remote: Optional[bool] = None
+    min_salary: Optional[float] = None
+    posted_after: Optional[date] = None
+    job_type: Optional[str] = None
+    # intern, junior, mid, senior, lead or director, as detected from the title
+    seniority: Optional[str] = None
+
+
 class MatchRequest(BaseModel):
     resume_text: str
     job_preferences: Optional[Dict[str, Any]] = {}
+    limit: int = 20
+    offset: int = 0
+    # X-Next-Cursor of the previous page; takes the place of offset
+    cursor: Optional[str] = None
+
+
+class BatchResume(BaseModel):
+    resume_id: str
+    resume_text: str
+
+
+class BatchMatchRequest(BaseModel):
+    resumes: List[BatchResume]
+    top_k: int = 20
+    job_preferences: Optional[Dict[str, Any]] = {}
+
+
+class CandidateRecord(BaseModel):
+    candidate_id: str
+    name: str
+    added_at: str
+    analysis: ResumeAnalysis
+
+
+class CandidateMatch(BaseModel):
+    candidate_id: str
+    name: str
+    skills: List[str]
+    experience_years: Optional[int]
+    job_titles: List[str]
+    summary: str
+    match_score: float
+    semantic_score: float
+    keyword_score: float
+
+
+class AnalysisTaskStatus(BaseModel):
+    task_id: str
+    status: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[ResumeAnalysis] = None
+    error: Optional[str] = None
+
+
+class JobSourceConfig(BaseModel):
+    """One entry of the job source registry (see app/sources.py).
+
+    ``kind`` is remoteok, adzuna, rss or html. For rss and html a ``{page}``
+    placeholder in ``url`` is expanded to pages 1..``pages``.
+    """
+
+    name: str
+    kind: str
+    url: Optional[str] = None
+    location: str = "us"
+    pages: int = 1
+    limit: int = 50
+    enabled: bool = True
@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+# Entity extraction only needs the tokenizer, tok2vec and ner; the rest of
+# en_core_web_sm is never loaded
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "32"))
+# N > 0 runs the pipeline in N worker processes, each with its own copy of
+# the model, so NER never holds the GIL the event loop needs; 0 runs it in
+# the calling thread. Defaults to one process per two cores, at most two.
+NLP_WORKERS = int(os.getenv("NLP_WORKERS", str(max(1, min(2, (os.cpu_count() or 1) // 2)))))
+NLP_CACHE_SIZE = int(os.getenv("NLP_CACHE_SIZE", "1024"))
+# Resumes are cut here to bound per-document cost (spaCy's own limit is 1M)
+MAX_NLP_CHARS = 100000
+
+ENTITY_LABELS = {"ORG": "organizations", "DATE": "dates", "GPE": "locations", "DEGREE": "degrees"}
+
+_DEGREE_WORDS = ["bachelor", "bachelors", "bachelor's", "master", "masters", "master's"]
+_DEGREE_ABBREVIATIONS = [
+    "phd", "ph.d", "ph.d.", "mba", "bsc", "b.sc", "b.sc.", "msc", "m.sc", "m.sc.", "b.a.", "b.s.",
+    "m.s.", "m.a.", "meng", "beng", "doctorate",
+]
+DEGREE_PATTERNS = [
+    {"label": "DEGREE", "pattern": [{"LOWER": {"IN": _DEGREE_WORDS}}, {"LOWER": "of"}, {"IS_TITLE": True, "OP": "+"}]},
+    {"label": "DEGREE", "pattern": [{"LOWER": {"IN": _DEGREE_WORDS}}, {"LOWER": "degree", "OP": "?"}]},
+    {"label": "DEGREE", "pattern": [{"LOWER": {"IN": _DEGREE_ABBREVIATIONS}}]},
+]
+
+_YEAR = re.compile(r"\b(19[5-9]\d|20\d\d)\b")
+_PRESENT = re.compile(r"\b(present|current|now|today)\b", re.I)
+
+
+def load_pipeline(model: str = SPACY_MODEL):
+    """en_core_web_sm with only the components entity extraction needs,
+    plus an entity ruler for degrees, which the statistical NER lacks."""
+    import spacy  # local import to avoid mandatory dependency at import time
+
+    nlp = spacy.load(model, exclude=SPACY_EXCLUDE)
+    ruler = nlp.add_pipe("entity_ruler", before="ner")
+    ruler.add_patterns(DEGREE_PATTERNS)
+    return nlp
+
+
+def _empty_entities() -> Dict[str, List[str]]:
+    return {field: [] for field in ENTITY_LABELS.values()}
+
+
+def _doc_entities(doc) -> Dict[str, List[str]]:
+    entities = _empty_entities()
+    for ent in doc.ents:
+        field = ENTITY_LABELS.get(ent.label_)
+        if field is None:
+            continue
+        value = " ".join(ent.text.split())
+        if value and value not in entities[field]:
+            entities[field].append(value)
+    return entities
+
+
+def _pipe(nlp, texts: List[str], batch_size: int) -> List[Dict[str, List[str]]]:
+    return [_doc_entities(doc) for doc in nlp.pipe((text[:MAX_NLP_CHARS] for text in texts), batch_size=batch_size)]
+
+
+# Worker-process side: each process loads its own pipeline once
+_worker_nlp = None
+
+
+def _init_worker(model: str) -> None:
+    global _worker_nlp
+    _worker_nlp = load_pipeline(model)
+
+
+def _pipe_in_worker(texts: List[str], batch_size: int) -> List[Dict[str, List[str]]]:
+    return _pipe(_worker_nlp, texts, batch_size)
+
+
+class EntityExtractor:
+    """Batched NER over resumes with results memoized by text hash.
+
+    ``extract`` looks every text up in the memo and runs the misses through
+    one ``nlp.pipe`` call, in-process or split across a process pool. With
+    no pipeline available it returns empty entities, and analysis falls
+    back to its regexes.
+    """
+
+    def __init__(
+        self,
+        nlp=None,
+        workers: int = NLP_WORKERS,
+        batch_size: int = NLP_BATCH_SIZE,
+        cache_size: int = NLP_CACHE_SIZE,
+        model: str = SPACY_MODEL,
+    ):
+        self.nlp = nlp
+        self.workers = workers
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.model = model
+        self._memo: "OrderedDict[str, Dict[str, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # spaCy pipelines aren't documented as thread-safe
+        self._pipe_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def available(self) -> bool:
+        # Worker processes are only used once the model is known to load here
+        return self.nlp is not None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model,),
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _run(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        if self.workers > 0:
+            try:
+                # One chunk per worker, each piped in batches inside the worker
+                size = -(-len(texts) // self.workers)
+                futures = [
+                    self._get_pool().submit(_pipe_in_worker, texts[start:start + size], self.batch_size)
+                    for start in range(0, len(texts), size)
+                ]
+                return [entities for future in futures for entities in future.result()]
+            except BrokenProcessPool as e:
+                logger.error(f"NLP worker pool failed: {str(e)}")
+                self.shutdown()
+                if self.nlp is None:
+                    raise
+        with self._pipe_lock:
+            return _pipe(self.nlp, texts, self.batch_size)
+
+    def extract(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        if not self.available:
+            return [_empty_entities() for _ in texts]
+        keys = [hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest() for text in texts]
+        results: List[Optional[Dict[str, List[str]]]] = [None] * len(texts)
+        missing: Dict[str, int] = {}
+        with self._lock:
+            for position, key in enumerate(keys):
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                    results[position] = self._memo[key]
+                elif key not in missing:
+                    missing[key] = position
+
+        if missing:
+            try:
+                extracted = self._run([texts[position] for position in missing.values()])
+                with self._lock:
+                    for key, entities in zip(missing, extracted):
+                        self._memo[key] = entities
+                    while len(self._memo) > self.cache_size:
+                        self._memo.popitem(last=False)
+            except Exception as e:
+                logger.error(f"Error extracting resume entities: {str(e)}")
+                extracted = [_empty_entities() for _ in missing]
+            by_key = dict(zip(missing, extracted))
+            results = [result if result is not None else by_key[key] for result, key in zip(results, keys)]
+        return results
+
+
+def years_from_dates(dates: List[str], today: Optional[date] = None) -> Optional[int]:
+    """Span in years covered by DATE entities such as "2016 - Present"."""
+    today = today or date.today()
+    years = []
+    for value in dates:
+        years.extend(int(year) for year in _YEAR.findall(value))
+        if _PRESENT.search(value):
+            years.append(today.year)
+    years = [year for year in years if year <= today.year]
+    if len(years) < 2:
+        return None
+    return max(years) - min(years)
+
+
+_extractor = EntityExtractor()
+
+
+def get_extractor() -> EntityExtractor:
+    return _extractor
+
+
+def configure_extractor(nlp) -> EntityExtractor:
+    """Use ``nlp`` (as loaded by initialize_models) for in-process extraction."""
+    global _extractor
+    _extractor.shutdown()
+    _extractor = EntityExtractor(nlp)
+    if nlp is not None and _extractor.workers > 0:
+        # Start the workers and load their models now rather than on the
+        # first resume; nothing waits for it
+        _extractor._get_pool().submit(_pipe_in_worker, [], _extractor.batch_size)
+    return _extractor
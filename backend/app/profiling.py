@@ -0,0 +1,318 @@
+import asyncio
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import sys
+import sysconfig
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Profiling is off unless an admin token is configured; without one the
+# middleware is not installed at all.
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN", "")
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.005"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("data", "profiles"))
+MAX_STORED_PROFILES = 100
+
+PROFILE_HEADER = "x-profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+PROFILE_ID_HEADER = "x-profile-id"
+# Ids are uuid4 hex; anything else never names a file in PROFILE_DIR
+_PROFILE_ID = re.compile(r"[0-9a-f]{32}")
+
+# Innermost frames where an idle thread parks: the loop waiting in its
+# selector, or an executor worker waiting for its next work item.
+_IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("concurrent/futures/thread.py", "_worker"),
+    ("anyio/_backends/_asyncio.py", "run"),
+}
+_WAIT_MODULES = ("threading.py", "queue.py")
+_WORKER_THREAD_PREFIXES = ("ThreadPoolExecutor", "AnyIO worker thread", "asyncio_")
+_STDLIB_DIR = sysconfig.get_paths()["stdlib"].replace("\\", "/") + "/"
+
+
+def profiling_enabled() -> bool:
+    return bool(PROFILING_ADMIN_TOKEN)
+
+
+def is_admin(token: Optional[str]) -> bool:
+    return profiling_enabled() and token is not None and hmac.compare_digest(token, PROFILING_ADMIN_TOKEN)
+
+
+def _short_path(filename: str) -> str:
+    """Paths relative to site-packages, the stdlib or the working directory."""
+    filename = filename.replace("\\", "/")
+    if "site-packages/" in filename:
+        return filename.rsplit("site-packages/", 1)[1]
+    for prefix in (_STDLIB_DIR, os.getcwd().replace("\\", "/") + "/"):
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def _stack(frame) -> List[Tuple[str, str, int]]:
+    """(file, function, first line) per frame, outermost first."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((_short_path(code.co_filename), code.co_name, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _is_idle(stack: List[Tuple[str, str, int]]) -> bool:
+    depth = len(stack)
+    while depth and stack[depth - 1][0].endswith(_WAIT_MODULES):
+        depth -= 1
+    if not depth:
+        return True
+    filename, function, _ = stack[depth - 1]
+    return any(filename.endswith(idle_file) and function == idle_function for idle_file, idle_function in _IDLE_FRAMES)
+
+
+class SamplingProfiler:
+    """Wall-clock stack sampler for the event loop and executor threads.
+
+    A background thread reads ``sys._current_frames()`` every ``interval``
+    seconds and counts the collapsed stacks of the loop thread and of any
+    executor worker that is busy, so work offloaded with run_in_executor is
+    included. Everything running on those threads is sampled, so requests
+    overlapping the profiled one show up as well.
+    """
+
+    def __init__(self, loop_thread_id: int, interval: float = PROFILING_INTERVAL):
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _sampled_threads(self) -> Dict[int, str]:
+        threads = {self.loop_thread_id: "event-loop"}
+        for thread in threading.enumerate():
+            if thread.name.startswith(_WORKER_THREAD_PREFIXES):
+                threads[thread.ident] = "worker"
+        return threads
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            threads = self._sampled_threads()
+            for thread_id, frame in sys._current_frames().items():
+                role = threads.get(thread_id)
+                if role is None:
+                    continue
+                stack = _stack(frame)
+                if _is_idle(stack):
+                    continue
+                frames = [role] + [f"{function} ({filename}:{line})" for filename, function, line in stack]
+                self.samples[";".join(name.replace(";", ":") for name in frames)] += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format, one ``stack count`` per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def collapsed_to_speedscope(collapsed: str, name: str, interval: float) -> Dict:
+    """Convert a collapsed-stack profile into a speedscope sampled profile."""
+    frame_index: Dict[str, int] = {}
+    frames, samples, weights = [], [], []
+    for line in collapsed.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if not stack:
+            continue
+        sample = []
+        for frame_name in stack.split(";"):
+            if frame_name not in frame_index:
+                frame_index[frame_name] = len(frames)
+                frames.append({"name": frame_name})
+            sample.append(frame_index[frame_name])
+        samples.append(sample)
+        weights.append(int(count) * interval)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "navicv",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+class ProfileStore:
+    """Profiles on disk as ``<id>.collapsed`` plus an ``<id>.json`` record,
+    newest ``limit`` kept.
+
+    Nothing is cached in memory, so with several workers sharing the
+    directory any of them can list and serve a profile another one captured.
+    """
+
+    def __init__(self, directory: str = PROFILE_DIR, limit: int = MAX_STORED_PROFILES):
+        self.directory = directory
+        self.limit = limit
+
+    def _path(self, profile_id: str, extension: str = "collapsed") -> str:
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def _records(self) -> List[Dict]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        records = []
+        for name in names:
+            profile_id, extension = os.path.splitext(name)
+            if extension != ".json" or not _PROFILE_ID.fullmatch(profile_id):
+                continue
+            record = self._read_record(profile_id)
+            if record is not None:
+                records.append(record)
+        records.sort(key=lambda record: record["created_at"], reverse=True)
+        return records
+
+    def _read_record(self, profile_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(profile_id, "json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # pruned by another worker, or not a profile record
+            return None
+
+    def save(
+        self, profile_id: str, profiler: SamplingProfiler, method: str, path: str, status: Optional[int]
+    ) -> Dict:
+        """Write a profile; blocking, so call it from an executor."""
+        record = {
+            "profile_id": profile_id,
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round(profiler.duration * 1000, 2),
+            "samples": sum(profiler.samples.values()),
+            "interval_ms": profiler.interval * 1000,
+            "created_at": datetime.now().isoformat(),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(profile_id), "w", encoding="utf-8") as f:
+            f.write(profiler.collapsed())
+        # The record is written last and renamed into place, so a profile is
+        # only listed once both files are complete
+        temporary = self._path(profile_id, "json.tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(temporary, self._path(profile_id, "json"))
+
+        for expired in self._records()[self.limit:]:
+            for extension in ("json", "collapsed"):
+                try:
+                    os.remove(self._path(expired["profile_id"], extension))
+                except OSError:
+                    pass
+        return record
+
+    def list(self) -> List[Dict]:
+        return self._records()
+
+    def load(self, profile_id: str, format: str = "collapsed") -> Optional[Tuple[str, str]]:
+        """(body, media type) of a stored profile, or None if it is unknown."""
+        if not _PROFILE_ID.fullmatch(profile_id):
+            return None
+        record = self._read_record(profile_id)
+        if record is None:
+            return None
+        try:
+            with open(self._path(profile_id), "r", encoding="utf-8") as f:
+                collapsed = f.read()
+        except OSError:
+            return None
+        if format == "speedscope":
+            name = f"{record['method']} {record['path']}"
+            document = collapsed_to_speedscope(collapsed, name, record["interval_ms"] / 1000)
+            return json.dumps(document), "application/json"
+        return collapsed, "text/plain; charset=utf-8"
+
+
+class ProfilingMiddleware:
+    """Profile a request when it carries ``X-Profile: 1`` and a valid
+    ``X-Admin-Token``, or when it is picked by PROFILING_SAMPLE_RATE.
+
+    The profile id is returned in the ``X-Profile-Id`` response header. Only
+    one request is profiled at a time; others pass through untouched.
+    """
+
+    def __init__(self, app, store: ProfileStore, sample_rate: float = PROFILING_SAMPLE_RATE):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self._busy = threading.Lock()
+
+    def _requested(self, scope) -> bool:
+        headers = dict(scope.get("headers") or ())
+        if headers.get(PROFILE_HEADER.encode()) in (b"1", b"true"):
+            token = headers.get(ADMIN_TOKEN_HEADER.encode())
+            return is_admin(token.decode("latin-1") if token else None)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status = {"code": None}
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER.encode(), profile_id.encode())
+                ]
+            await send(message)
+
+        profiler = SamplingProfiler(threading.get_ident())
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            self._busy.release()
+            save = partial(self.store.save, profile_id, profiler, scope["method"], scope["path"], status["code"])
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, save)
+            except Exception as e:
+                logger.error(f"Error saving request profile: {str(e)}")
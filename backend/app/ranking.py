@@ -0,0 +1,131 @@
+import base64
+import json
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .matching import prepare_keywords
+
+
+logger = logging.getLogger(__name__)
+
+
+SEMANTIC_WEIGHT = 0.8
+KEYWORD_WEIGHT = 0.2
+# A match needs semantic > SEMANTIC_THRESHOLD and match > MATCH_THRESHOLD
+SEMANTIC_THRESHOLD = 0.35
+MATCH_THRESHOLD = 0.3
+
+# match = 0.8 * semantic + 0.2 * keyword with keyword in [0, 1], so a job
+# whose semantic score trails the k-th best by more than 0.25 can never
+# overtake it. Only jobs inside that margin need keyword scoring.
+KEYWORD_MARGIN = KEYWORD_WEIGHT / SEMANTIC_WEIGHT
+
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(match_score: float, job_id: str) -> str:
+    """Opaque keyset cursor for the position just after (match_score, job_id)."""
+    payload = json.dumps([float(match_score), str(job_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        match_score, job_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return float(match_score), str(job_id)
+    except Exception:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+
+def top_k_order(scores: np.ndarray, k: int, tiebreak: Optional[np.ndarray] = None) -> np.ndarray:
+    """Positions of the ``k`` largest scores, best first.
+
+    ``np.argpartition`` finds them in O(n); only those k are sorted. Ties
+    are ordered by ``tiebreak`` (ascending), or by position.
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < n:
+        selected = np.argpartition(-scores, k - 1)[:k]
+        # Scores equal to the k-th may straddle the cut; include all of them
+        # so the tiebreak, not argpartition, decides which ones make it
+        kth = scores[selected].min()
+        selected = np.union1d(selected, np.flatnonzero(scores == kth))
+    else:
+        selected = np.arange(n)
+    secondary = selected if tiebreak is None else tiebreak[selected]
+    return selected[np.lexsort((secondary, -scores[selected]))][:k]
+
+
+def rank_matches(
+    jobs,
+    semantic_scores,
+    resume_keywords: List[str],
+    rows: Optional[np.ndarray] = None,
+    limit: int = 20,
+    offset: int = 0,
+    after: Optional[Tuple[float, str]] = None,
+) -> List[Tuple[int, float, float, float]]:
+    """One page of ``(row, match, semantic, keyword)`` matches, best first.
+
+    Works on score arrays: the semantic threshold and the keyword margin
+    rule out most rows before any keyword scoring, and the page is selected
+    with ``top_k_order`` instead of sorting every match. Matches are ordered
+    by match score, then job_id, so ``after`` (a decoded cursor) resumes
+    exactly where the previous page ended.
+    """
+    semantic_scores = np.asarray(semantic_scores, dtype=np.float64)
+    if rows is None:
+        rows = np.arange(len(semantic_scores))
+    k = offset + limit
+    if k <= 0:
+        return []
+
+    candidates = np.flatnonzero(semantic_scores > SEMANTIC_THRESHOLD)
+    # rows that failed validation are never rendered; leave them out so pages fill
+    candidates = candidates[jobs.renderable(np.asarray(rows)[candidates])]
+    certain = candidates
+    if after is not None:
+        # A keyword score only adds to 0.8 * semantic, so rows already above
+        # the cursor on that alone were on earlier pages
+        candidates = candidates[SEMANTIC_WEIGHT * semantic_scores[candidates] <= after[0]]
+        # and rows that stay below it even with a perfect keyword score are
+        # certainly on later pages
+        certain = candidates[SEMANTIC_WEIGHT * semantic_scores[candidates] + KEYWORD_WEIGHT < after[0]]
+    if len(certain) >= k and len(candidates) > k:
+        kth_best = np.partition(semantic_scores[certain], -k)[-k]
+        candidates = candidates[semantic_scores[candidates] >= kth_best - KEYWORD_MARGIN]
+
+    candidate_rows = np.asarray(rows)[candidates]
+    keyword_scores = jobs.keyword_scores(prepare_keywords(resume_keywords), candidate_rows)
+    semantic = semantic_scores[candidates]
+    match_scores = SEMANTIC_WEIGHT * semantic + KEYWORD_WEIGHT * keyword_scores
+    job_ids = np.asarray([jobs.job_ids[row] for row in candidate_rows], dtype=str)
+
+    passing = match_scores > MATCH_THRESHOLD
+    if after is not None:
+        after_score, after_id = after
+        passing &= (match_scores < after_score) | ((match_scores == after_score) & (job_ids > after_id))
+    passing = np.flatnonzero(passing)
+
+    order = passing[top_k_order(match_scores[passing], k, job_ids[passing])][offset:]
+    return [
+        (int(candidate_rows[i]), float(match_scores[i]), float(semantic[i]), float(keyword_scores[i]))
+        for i in order
+    ]
+
+
+def next_cursor(page: Sequence[Tuple[int, float, float, float]], jobs, limit: int) -> Optional[str]:
+    """Cursor for the page after ``page``, or None when it was the last one."""
+    if len(page) < limit or not page:
+        return None
+    row, match_score, _, _ = page[-1]
+    return encode_cursor(match_score, jobs.job_ids[row])
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import aiohttp
+import numpy as np
+
+from .metrics import SOURCE_CIRCUIT_OPEN, SOURCE_EVENTS
+
+
+logger = logging.getLogger(__name__)
+
+
+T = TypeVar("T")
+
+# Defaults per provider; hosts without an entry (HTML pages, RSS feeds) get
+# DEFAULT_SOURCE_POLICY. rate is requests per second, burst the bucket size.
+DEFAULT_SOURCE_POLICY = {"rate": 2.0, "burst": 4}
+SOURCE_POLICIES = {
+    "remoteok": {"rate": 1.0, "burst": 4},
+    "adzuna": {"rate": 4.0, "burst": 8},
+}
+
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 4.0
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 30.0
+
+# Adaptive timeouts: TIMEOUT_MULTIPLIER x observed p95, clamped to
+# [MIN_TIMEOUT, MAX_TIMEOUT]. INITIAL_TIMEOUT applies until enough samples.
+INITIAL_TIMEOUT = 10.0
+MIN_TIMEOUT = 2.0
+MAX_TIMEOUT = 30.0
+TIMEOUT_MULTIPLIER = 2.0
+LATENCY_WINDOW = 100
+MIN_LATENCY_SAMPLES = 5
+
+
+class SourceUnavailable(Exception):
+    """Raised without touching the network while a source's circuit is open."""
+
+
+class UpstreamError(Exception):
+    def __init__(self, source: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"{source} returned {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status == 429 or self.status >= 500
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures, then lets a
+    single probe through once ``reset_timeout`` has passed (half-open)."""
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """Let the next call probe again after one ended without a verdict
+        (cancelled, or a non-retryable error)."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies driving the timeout."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def timeout(self) -> float:
+        if len(self.samples) < MIN_LATENCY_SAMPLES:
+            return INITIAL_TIMEOUT
+        p95 = float(np.percentile(self.samples, 95))
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, p95 * TIMEOUT_MULTIPLIER))
+
+
+class RateLimiter:
+    """Token bucket; ``acquire`` waits until a token is available."""
+
+    def __init__(self, rate: Optional[float], burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, returning how long the caller had to wait."""
+        if not self.rate:
+            return 0.0
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if wait:
+                await asyncio.sleep(wait)
+                self.tokens = 1.0
+                self.updated_at = time.monotonic()
+            self.tokens -= 1
+            return wait
+
+    def try_acquire(self) -> float:
+        """Take one token if one is available now.
+
+        Returns 0.0 on success, otherwise the seconds until a token frees up.
+        """
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        return 0.0
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, honouring a server's Retry-After."""
+    if retry_after is not None:
+        return min(BACKOFF_MAX, retry_after)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, UpstreamError):
+        return error.retryable
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError))
+
+
+class SourceGuard:
+    """Circuit breaker, retries, adaptive timeout and rate limit for one source."""
+
+    def __init__(self, name: str, rate: Optional[float], burst: int):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.limiter = RateLimiter(rate, burst)
+
+    def _update_circuit_metric(self) -> None:
+        SOURCE_CIRCUIT_OPEN.set(0 if self.breaker.state == "closed" else 1, source=self.name)
+
+    async def call(self, request: Callable[[float], Awaitable[T]], attempts: int = MAX_ATTEMPTS) -> T:
+        """Run ``request(timeout)`` with retries; raises the last error on failure."""
+        deadline = time.monotonic() + MAX_TIMEOUT
+        for attempt in range(attempts):
+            if not self.breaker.allow():
+                SOURCE_EVENTS.inc(source=self.name, event="short_circuit")
+                raise SourceUnavailable(f"{self.name} circuit is open")
+            try:
+                if await self.limiter.acquire():
+                    SOURCE_EVENTS.inc(source=self.name, event="rate_limited")
+
+                timeout = min(self.latency.timeout(), max(deadline - time.monotonic(), MIN_TIMEOUT))
+                start = time.monotonic()
+                result = await asyncio.wait_for(request(timeout), timeout)
+            except Exception as e:
+                # Only transport errors and 429/5xx say anything about the
+                # source's health; a 404 neither opens nor closes the circuit
+                counts_as_failure = _is_retryable(e)
+                if counts_as_failure:
+                    self.breaker.record_failure()
+                self._update_circuit_metric()
+                if isinstance(e, asyncio.TimeoutError):
+                    SOURCE_EVENTS.inc(source=self.name, event="timeout")
+
+                delay = backoff_delay(attempt, getattr(e, "retry_after", None))
+                last_attempt = attempt == attempts - 1
+                if not counts_as_failure or last_attempt or time.monotonic() + delay >= deadline:
+                    raise
+                SOURCE_EVENTS.inc(source=self.name, event="retry")
+                logger.warning(f"Retrying {self.name} in {delay:.2f}s after: {str(e) or type(e).__name__}")
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                # CancelledError is not an Exception; without this a cancelled
+                # probe would leave the breaker half-open and refusing calls
+                self.breaker.release_probe()
+
+            self.latency.observe(time.monotonic() - start)
+            self.breaker.record_success()
+            self._update_circuit_metric()
+            return result
+        raise SourceUnavailable(f"{self.name} gave up after {attempts} attempts")
+
+
+# Shared by every JobScraper in the process, so breaker state and latency
+# history survive across refreshes and searches.
+_guards: Dict[str, SourceGuard] = {}
+
+
+def get_guard(source: str) -> SourceGuard:
+    guard = _guards.get(source)
+    if guard is None:
+        policy = SOURCE_POLICIES.get(source, DEFAULT_SOURCE_POLICY)
+        guard = _guards[source] = SourceGuard(source, policy["rate"], policy["burst"])
+    return guard
+
+
+def configure_source(source: str, rate: Optional[float], burst: int = DEFAULT_SOURCE_POLICY["burst"]) -> None:
+    """Override a source's rate limit (``rate=None`` disables it) and reset its state."""
+    SOURCE_POLICIES[source] = {"rate": rate, "burst": burst}
+    _guards.pop(source, None)
+
+
+def reset_guards() -> None:
+    _guards.clear()
@@ -1,27 +1,327 @@
+import asyncio
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
 import re
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, List, Dict, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import aiohttp
 from bs4 import BeautifulSoup
 
+from .feed_cache import FeedCache, default_feed_cache
+from .metrics import record_cache, timed_fetch
+from .resilience import SourceUnavailable, UpstreamError, get_guard
+
 
 logger = logging.getLogger(__name__)
 
+
+ADZUNA_COUNTRIES = ("us", "gb", "au", "ca")
+
+
+def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+async def _read_json(response: aiohttp.ClientResponse):
+    return await response.json()
+
+
+# Patterns for parse_html_listing, compiled once rather than per element
+_JOB_CONTAINER = re.compile(r'job|listing|post|card', re.I)
+_JOB_ID_ATTR = re.compile(r'job', re.I)
+_TITLE_CLASS = re.compile(r'title|heading|name', re.I)
+_TITLE_LINK_CLASS = re.compile(r'title|job', re.I)
+_COMPANY_CLASS = re.compile(r'company|employer|organization', re.I)
+_COMPANY_STRONG_CLASS = re.compile(r'company', re.I)
+_LOCATION_CLASS = re.compile(r'location|place|city', re.I)
+_LOCATION_TEXT = re.compile(r'[A-Z][a-z]+,?\s+[A-Z]{2}|Remote|Remote work', re.I)
+_DESCRIPTION_CLASS = re.compile(r'description|summary|details|content', re.I)
+_TAG_CLASS = re.compile(r'tag|skill|badge|keyword', re.I)
+
+
+def _stable_id(prefix: str, url: str) -> str:
+    """Job id derived from the URL; unlike hash() it is the same in every process."""
+    return f"{prefix}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}"
+
+
+def parse_html_listing(text: str, url: str, limit: int = 50) -> List[Dict]:
+    """Extract jobs from a listing page, trying common job-card markup patterns"""
+    # Fix common encoding issues (double-encoded UTF-8)
+    text = text.replace('Â ', ' ').replace('Â', '')
+    text = text.replace('â€™', "'").replace('â€œ', '"').replace('â€', '"')
+    text = text.replace('â€"', '—').replace('â€"', '–').replace('â€¦', '…')
+    text = text.replace('Ã¡', 'á').replace('Ã©', 'é').replace('Ã­', 'í')
+    text = text.replace('Ã³', 'ó').replace('Ãº', 'ú').replace('Ã±', 'ñ')
+
+    soup = BeautifulSoup(text, 'lxml')
+    jobs = []
+
+    # Try to find job listings (common patterns)
+    # Look for common job listing containers
+    job_elements = soup.find_all(['article', 'div', 'li'], class_=_JOB_CONTAINER)
+
+    if not job_elements:
+        # Try alternative selectors
+        job_elements = soup.find_all(['div', 'article'], attrs={'data-job-id': True}) or \
+                      soup.find_all(['div', 'article'], attrs={'id': _JOB_ID_ATTR})
+
+    for element in job_elements[:limit]:
+        try:
+            job = {}
+
+            # Extract title
+            title_elem = element.find(['h1', 'h2', 'h3', 'h4'], class_=_TITLE_CLASS)
+            if not title_elem:
+                title_elem = element.find('a', class_=_TITLE_LINK_CLASS)
+            job['title'] = title_elem.get_text(strip=True) if title_elem else 'Untitled Position'
+
+            # Extract company
+            company_elem = element.find(['span', 'div', 'a'], class_=_COMPANY_CLASS)
+            if not company_elem:
+                company_elem = element.find('strong', class_=_COMPANY_STRONG_CLASS)
+            job['company'] = company_elem.get_text(strip=True) if company_elem else 'Unknown Company'
+
+            # Extract location
+            location_elem = element.find(['span', 'div'], class_=_LOCATION_CLASS)
+            if not location_elem:
+                location_elem = element.find(string=_LOCATION_TEXT)
+            if location_elem:
+                job['location'] = location_elem.get_text(strip=True) if hasattr(location_elem, 'get_text') else str(location_elem).strip()
+            else:
+                job['location'] = 'Location not specified'
+
+            # Extract description
+            desc_elem = element.find(['div', 'p', 'span'], class_=_DESCRIPTION_CLASS)
+            if not desc_elem:
+                desc_elem = element.find('p')
+            job['description'] = desc_elem.get_text(strip=True, separator=' ') if desc_elem else ''
+
+            # Extract URL
+            link_elem = element.find('a', href=True)
+            if link_elem:
+                href = link_elem.get('href')
+                job['url'] = urljoin(url, href) if href else url
+            else:
+                job['url'] = url
+
+            # Extract tags/skills
+            tags = []
+            tag_elements = element.find_all(['span', 'div'], class_=_TAG_CLASS)
+            for tag_elem in tag_elements:
+                tag_text = tag_elem.get_text(strip=True)
+                if tag_text and len(tag_text) < 30:  # Reasonable tag length
+                    tags.append(tag_text)
+            job['tags'] = tags[:10]  # Limit to 10 tags
+
+            # Generate job ID
+            job['id'] = _stable_id('scraped', job.get('url', ''))
+
+            if job['title'] and job['title'] != 'Untitled Position':
+                jobs.append(job)
+        except Exception as e:
+            logger.debug(f"Error parsing job element: {str(e)}")
+            continue
+    return jobs
+
+
+def parse_rss_feed(content: str, limit: int = 50) -> List[Dict]:
+    """Extract jobs from the <item> elements of an RSS feed"""
+    content = content.replace('Â', '').replace('â€™', "'")
+    soup = BeautifulSoup(content, 'xml')
+
+    jobs = []
+    items = soup.find_all('item')[:limit]
+
+    for item in items:
+        try:
+            link = item.find('link').get_text(strip=True) if item.find('link') else ''
+            job = {
+                'title': item.find('title').get_text(strip=True) if item.find('title') else 'Untitled',
+                'company': item.find('company').get_text(strip=True) if item.find('company') else 'Unknown',
+                'location': item.find('location').get_text(strip=True) if item.find('location') else 'Not specified',
+                'description': item.find('description').get_text(strip=True) if item.find('description') else '',
+                'url': link,
+                'tags': [],
+                'id': _stable_id('rss', link),
+            }
+            if job['title'] and job['title'] != 'Untitled':
+                jobs.append(job)
+        except Exception as e:
+            logger.debug(f"Error parsing RSS item: {str(e)}")
+            continue
+    return jobs
+
+
+# HTML and RSS parsing runs in worker processes so large pages and many
+# feeds don't block the event loop or serialize on the GIL. PARSE_WORKERS=0
+# parses in the calling thread instead.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None and PARSE_WORKERS > 0:
+            # spawn, not fork: the parent process is multi-threaded
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+class PooledParser:
+    """Wrap a picklable ``parse(text)`` so calls run in the parse pool.
+
+    Called from executor threads (see ``JobScraper._get_cached``), which
+    block on the worker's result; falls back to parsing in-thread when the
+    pool is disabled or broken.
+    """
+
+    def __init__(self, parse: Callable[[str], Any]):
+        self.parse = parse
+
+    def __call__(self, text: str) -> Any:
+        pool = _get_parse_pool()
+        if pool is None:
+            return self.parse(text)
+        try:
+            return pool.submit(self.parse, text).result()
+        except BrokenProcessPool as e:
+            logger.error(f"Parse pool failed, parsing in-process: {str(e)}")
+            shutdown_parse_pool()
+            return self.parse(text)
+
+
 class JobScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        remoteok_base_url: Optional[str] = None,
+        adzuna_base_url: Optional[str] = None,
+        feed_cache: Optional[FeedCache] = None,
+    ):
         self.session: Optional[aiohttp.ClientSession] = None
+        self.feed_cache = feed_cache or default_feed_cache()
+        # Cached feed fetches this scraper made, split by whether the payload changed
+        self.changed_feeds = 0
+        self.unchanged_feeds = 0
         self.adzuna_app_id = os.getenv("ADZUNA_ID", "b378129d")
         self.adzuna_api_key = os.getenv("ADZUNA_KEY", "5ef0ccf9f33b02439a214464c4a8b9f3")
-        self.adzuna_base_url = "https://api.adzuna.com/v1/api/jobs"
+        # Base URLs are configurable so the scraper can be pointed at a local
+        # mock (see benchmarks/mock_sources.py) for offline load testing
+        self.remoteok_base_url = (
+            remoteok_base_url or os.getenv("REMOTEOK_BASE_URL", "https://remoteok.io")
+        ).rstrip("/")
+        self.adzuna_base_url = (
+            adzuna_base_url or os.getenv("ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api/jobs")
+        ).rstrip("/")
+
+    def adzuna_search_url(self, location: str, page: int = 1) -> str:
+        country = location if location in ADZUNA_COUNTRIES else "us"
+        return f"{self.adzuna_base_url}/{country}/search/{page}"
 
     async def get_session(self) -> aiohttp.ClientSession:
         if self.session is None:
             self.session = aiohttp.ClientSession()
         return self.session
 
+    async def _get(
+        self,
+        source: str,
+        url: str,
+        read: Callable[[aiohttp.ClientResponse], Awaitable],
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+    ):
+        """GET through the source's guard (circuit breaker, retries, adaptive
+        timeout, rate limit), returning ``read(response)`` for a 200."""
+        session = await self.get_session()
+
+        async def attempt(timeout: float):
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+            async with session.get(url, params=params, headers=headers, timeout=client_timeout) as response:
+                if response.status != 200:
+                    raise UpstreamError(source, response.status, _retry_after(response))
+                return await read(response)
+
+        return await get_guard(source).call(attempt)
+
+    async def _get_cached(
+        self,
+        source: str,
+        url: str,
+        parse: Callable[[str], Any],
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        variant: Hashable = None,
+    ):
+        """Conditional GET through the feed cache, returning ``parse(text)``.
+
+        A 304, or a 200 with the same payload as last time, reuses the parsed
+        result without parsing again. If the source fails, the last good
+        payload is replayed.
+        """
+        cache = self.feed_cache
+        key = cache.key(url, params)
+        session = await self.get_session()
+
+        async def attempt(timeout: float):
+            request_headers = dict(headers or {})
+            request_headers.update(cache.conditional_headers(key))
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+            async with session.get(url, params=params, headers=request_headers, timeout=client_timeout) as response:
+                if response.status == 304:
+                    return None
+                if response.status != 200:
+                    raise UpstreamError(source, response.status, _retry_after(response))
+                return (
+                    await response.read(),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    response.charset,
+                )
+
+        try:
+            fetched = await get_guard(source).call(attempt)
+        except Exception as e:
+            if cache.entry(key) is None:
+                raise
+            logger.warning(f"Replaying cached {source} payload for {url}: {str(e)}")
+            fetched = None
+
+        loop = asyncio.get_running_loop()
+        if fetched is None:
+            changed = False
+            result = await loop.run_in_executor(None, cache.parsed, key, parse, variant)
+        else:
+            changed, result = await loop.run_in_executor(None, cache.update, key, url, *fetched, parse, variant)
+        if changed:
+            self.changed_feeds += 1
+        else:
+            self.unchanged_feeds += 1
+        record_cache("feed", not changed)
+        return result
+
     async def close(self) -> None:
         try:
             if self.session is not None and not self.session.closed:
@@ -31,10 +331,9 @@ class JobScraper:
 
     async def fetch_remoteok_jobs(self, limit: int = 50) -> List[Dict]:
         try:
-            session = await self.get_session()
             endpoints = [
-                "https://remoteok.io/api/jobs",
-                "https://remoteok.io/api",
+                f"{self.remoteok_base_url}/api/jobs",
+                f"{self.remoteok_base_url}/api",
             ]
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -47,14 +346,14 @@ class JobScraper:
 
             for endpoint in endpoints:
                 try:
-                    async with session.get(endpoint, headers=headers, timeout=30) as response:
-                        if response.status == 200:
-                            jobs = await response.json()
-                            valid_jobs = [job for job in jobs if job is not None and isinstance(job, dict)][:limit]
-                            logger.info(f"Fetched {len(valid_jobs)} jobs from RemoteOK")
-                            return valid_jobs
-                        else:
-                            logger.warning(f"RemoteOK endpoint {endpoint} returned {response.status}")
+                    jobs = await self._get_cached("remoteok", endpoint, json.loads, headers=headers)
+                    valid_jobs = [job for job in jobs if job is not None and isinstance(job, dict)][:limit]
+                    logger.info(f"Fetched {len(valid_jobs)} jobs from RemoteOK")
+                    return valid_jobs
+                except SourceUnavailable as e:
+                    # The host is down; don't try the fallback endpoint on it
+                    logger.warning(f"Skipping RemoteOK: {str(e)}")
+                    break
                 except Exception as e:
                     logger.warning(f"Error with RemoteOK endpoint {endpoint}: {str(e)}")
                     continue
@@ -71,50 +370,34 @@ class JobScraper:
             return []
 
         try:
-            session = await self.get_session()
-            country_endpoints = {
-                "us": "https://api.adzuna.com/v1/api/jobs/us/search/1",
-                "gb": "https://api.adzuna.com/v1/api/jobs/gb/search/1",
-                "au": "https://api.adzuna.com/v1/api/jobs/au/search/1",
-                "ca": "https://api.adzuna.com/v1/api/jobs/ca/search/1",
-            }
-            endpoint = country_endpoints.get(location, country_endpoints["us"])
+            endpoint = self.adzuna_search_url(location)
             params = {
                 "app_id": self.adzuna_app_id,
                 "app_key": self.adzuna_api_key,
                 "results_per_page": min(limit, 50),
                 "content-type": "application/json",
             }
-            async with session.get(endpoint, params=params, timeout=30) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    jobs = data.get("results", [])
-                    logger.info(f"Fetched {len(jobs)} jobs from Adzuna")
-                    return jobs
-                else:
-                    logger.error(f"Adzuna API returned {response.status}")
-                    return []
+            data = await self._get_cached("adzuna", endpoint, json.loads, params=params)
+            jobs = data.get("results", [])
+            logger.info(f"Fetched {len(jobs)} jobs from Adzuna")
+            return jobs
         except Exception as e:
             logger.error(f"Error fetching Adzuna jobs: {str(e)}")
             return []
 
     async def search_remoteok_jobs(self, query: str, limit: int = 25) -> List[Dict]:
         try:
-            session = await self.get_session()
             params = {"search": query, "limit": limit}
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
                 "Accept": "application/json, text/plain, */*",
             }
-            async with session.get("https://remoteok.io/api/jobs", params=params, headers=headers, timeout=30) as response:
-                if response.status == 200:
-                    jobs = await response.json()
-                    valid_jobs = [job for job in jobs if job is not None]
-                    logger.info(f"Found {len(valid_jobs)} RemoteOK jobs for query: {query}")
-                    return valid_jobs
-                else:
-                    logger.error(f"Failed to search RemoteOK jobs: {response.status}")
-                    return []
+            jobs = await self._get(
+                "remoteok", f"{self.remoteok_base_url}/api/jobs", _read_json, params=params, headers=headers
+            )
+            valid_jobs = [job for job in jobs if job is not None]
+            logger.info(f"Found {len(valid_jobs)} RemoteOK jobs for query: {query}")
+            return valid_jobs
         except Exception as e:
             logger.error(f"Error searching RemoteOK jobs: {str(e)}")
             return []
@@ -124,14 +407,7 @@ class JobScraper:
             return []
 
         try:
-            session = await self.get_session()
-            country_endpoints = {
-                "us": "https://api.adzuna.com/v1/api/jobs/us/search/1",
-                "gb": "https://api.adzuna.com/v1/api/jobs/gb/search/1",
-                "au": "https://api.adzuna.com/v1/api/jobs/au/search/1",
-                "ca": "https://api.adzuna.com/v1/api/jobs/ca/search/1",
-            }
-            endpoint = country_endpoints.get(location, country_endpoints["us"])
+            endpoint = self.adzuna_search_url(location)
             params = {
                 "app_id": self.adzuna_app_id,
                 "app_key": self.adzuna_api_key,
@@ -139,23 +415,47 @@ class JobScraper:
                 "results_per_page": min(limit, 50),
                 "content-type": "application/json",
             }
-            async with session.get(endpoint, params=params, timeout=30) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    jobs = data.get("results", [])
-                    logger.info(f"Found {len(jobs)} Adzuna jobs for query: {query}")
-                    return jobs
-                else:
-                    logger.error(f"Adzuna search returned {response.status}")
-                    return []
+            data = await self._get("adzuna", endpoint, _read_json, params=params)
+            jobs = data.get("results", [])
+            logger.info(f"Found {len(jobs)} Adzuna jobs for query: {query}")
+            return jobs
         except Exception as e:
             logger.error(f"Error searching Adzuna jobs: {str(e)}")
             return []
 
+    async def iter_search_results(
+        self, query: str, limit: int = 25, location: str = "us"
+    ) -> AsyncIterator[Tuple[str, List[Dict]]]:
+        """Search all sources concurrently, yielding (source, jobs) as each one finishes"""
+        searches = {
+            asyncio.ensure_future(
+                timed_fetch("remoteok", self.search_remoteok_jobs(query, limit=limit))
+            ): "remoteok",
+            asyncio.ensure_future(
+                timed_fetch(f"adzuna_{location}", self.search_adzuna_jobs(query, limit=limit, location=location))
+            ): f"adzuna_{location}",
+        }
+        pending = set(searches)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source = searches[task]
+                    try:
+                        jobs = task.result() or []
+                    except Exception as e:
+                        logger.error(f"Error searching {source}: {str(e)}")
+                        jobs = []
+                    for job in jobs:
+                        job["source"] = source
+                    yield source, jobs
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def scrape_jobs_from_html(self, url: str, limit: int = 50) -> List[Dict]:
         """Scrape jobs from HTML pages using BeautifulSoup"""
         try:
-            session = await self.get_session()
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -163,93 +463,12 @@ class JobScraper:
                 "Accept-Encoding": "gzip, deflate",
             }
             
-            async with session.get(url, headers=headers, timeout=30) as response:
-                if response.status != 200:
-                    logger.warning(f"Failed to fetch {url}: {response.status}")
-                    return []
-                
-                # Get content and handle encoding properly
-                content = await response.read()
-                text = content.decode('utf-8', errors='ignore')
-                
-                # Fix common encoding issues (double-encoded UTF-8)
-                text = text.replace('Â ', ' ').replace('Â', '')
-                text = text.replace('â€™', "'").replace('â€œ', '"').replace('â€', '"')
-                text = text.replace('â€"', '—').replace('â€"', '–').replace('â€¦', '…')
-                text = text.replace('Ã¡', 'á').replace('Ã©', 'é').replace('Ã­', 'í')
-                text = text.replace('Ã³', 'ó').replace('Ãº', 'ú').replace('Ã±', 'ñ')
-                
-                soup = BeautifulSoup(text, 'html.parser')
-                jobs = []
-                
-                # Try to find job listings (common patterns)
-                # Look for common job listing containers
-                job_elements = soup.find_all(['article', 'div', 'li'], class_=re.compile(r'job|listing|post|card', re.I))
-                
-                if not job_elements:
-                    # Try alternative selectors
-                    job_elements = soup.find_all(['div', 'article'], attrs={'data-job-id': True}) or \
-                                  soup.find_all(['div', 'article'], attrs={'id': re.compile(r'job', re.I)})
-                
-                for element in job_elements[:limit]:
-                    try:
-                        job = {}
-                        
-                        # Extract title
-                        title_elem = element.find(['h1', 'h2', 'h3', 'h4'], class_=re.compile(r'title|heading|name', re.I))
-                        if not title_elem:
-                            title_elem = element.find('a', class_=re.compile(r'title|job', re.I))
-                        job['title'] = title_elem.get_text(strip=True) if title_elem else 'Untitled Position'
-                        
-                        # Extract company
-                        company_elem = element.find(['span', 'div', 'a'], class_=re.compile(r'company|employer|organization', re.I))
-                        if not company_elem:
-                            company_elem = element.find('strong', class_=re.compile(r'company', re.I))
-                        job['company'] = company_elem.get_text(strip=True) if company_elem else 'Unknown Company'
-                        
-                        # Extract location
-                        location_elem = element.find(['span', 'div'], class_=re.compile(r'location|place|city', re.I))
-                        if not location_elem:
-                            location_elem = element.find(string=re.compile(r'[A-Z][a-z]+,?\s+[A-Z]{2}|Remote|Remote work', re.I))
-                        if location_elem:
-                            job['location'] = location_elem.get_text(strip=True) if hasattr(location_elem, 'get_text') else str(location_elem).strip()
-                        else:
-                            job['location'] = 'Location not specified'
-                        
-                        # Extract description
-                        desc_elem = element.find(['div', 'p', 'span'], class_=re.compile(r'description|summary|details|content', re.I))
-                        if not desc_elem:
-                            desc_elem = element.find('p')
-                        job['description'] = desc_elem.get_text(strip=True, separator=' ') if desc_elem else ''
-                        
-                        # Extract URL
-                        link_elem = element.find('a', href=True)
-                        if link_elem:
-                            href = link_elem.get('href')
-                            job['url'] = urljoin(url, href) if href else url
-                        else:
-                            job['url'] = url
-                        
-                        # Extract tags/skills
-                        tags = []
-                        tag_elements = element.find_all(['span', 'div'], class_=re.compile(r'tag|skill|badge|keyword', re.I))
-                        for tag_elem in tag_elements:
-                            tag_text = tag_elem.get_text(strip=True)
-                            if tag_text and len(tag_text) < 30:  # Reasonable tag length
-                                tags.append(tag_text)
-                        job['tags'] = tags[:10]  # Limit to 10 tags
-                        
-                        # Generate job ID
-                        job['id'] = f"scraped_{hash(job.get('url', ''))}"
-                        
-                        if job['title'] and job['title'] != 'Untitled Position':
-                            jobs.append(job)
-                    except Exception as e:
-                        logger.debug(f"Error parsing job element: {str(e)}")
-                        continue
-                
-                logger.info(f"Scraped {len(jobs)} jobs from {url}")
-                return jobs
+            jobs = await self._get_cached(
+                urlparse(url).netloc or url, url, PooledParser(partial(parse_html_listing, url=url, limit=limit)),
+                headers=headers, variant=limit,
+            )
+            logger.info(f"Scraped {len(jobs)} jobs from {url}")
+            return jobs
         except Exception as e:
             logger.error(f"Error scraping jobs from {url}: {str(e)}")
             return []
@@ -257,42 +476,17 @@ class JobScraper:
     async def fetch_jobs_from_rss(self, rss_url: str, limit: int = 50) -> List[Dict]:
         """Fetch jobs from RSS feeds"""
         try:
-            session = await self.get_session()
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
                 "Accept": "application/rss+xml, application/xml, text/xml",
             }
             
-            async with session.get(rss_url, headers=headers, timeout=30) as response:
-                if response.status != 200:
-                    return []
-                
-                content = await response.text()
-                content = content.replace('Â', '').replace('â€™', "'")
-                soup = BeautifulSoup(content, 'xml')
-                
-                jobs = []
-                items = soup.find_all('item')[:limit]
-                
-                for item in items:
-                    try:
-                        job = {
-                            'title': item.find('title').get_text(strip=True) if item.find('title') else 'Untitled',
-                            'company': item.find('company').get_text(strip=True) if item.find('company') else 'Unknown',
-                            'location': item.find('location').get_text(strip=True) if item.find('location') else 'Not specified',
-                            'description': item.find('description').get_text(strip=True) if item.find('description') else '',
-                            'url': item.find('link').get_text(strip=True) if item.find('link') else '',
-                            'tags': [],
-                            'id': f"rss_{hash(item.find('link').get_text(strip=True) if item.find('link') else '')}"
-                        }
-                        if job['title'] and job['title'] != 'Untitled':
-                            jobs.append(job)
-                    except Exception as e:
-                        logger.debug(f"Error parsing RSS item: {str(e)}")
-                        continue
-                
-                logger.info(f"Fetched {len(jobs)} jobs from RSS feed")
-                return jobs
+            jobs = await self._get_cached(
+                urlparse(rss_url).netloc or rss_url, rss_url, PooledParser(partial(parse_rss_feed, limit=limit)),
+                headers=headers, variant=limit,
+            )
+            logger.info(f"Fetched {len(jobs)} jobs from RSS feed")
+            return jobs
         except Exception as e:
             logger.error(f"Error fetching RSS feed {rss_url}: {str(e)}")
             return []
@@ -0,0 +1,87 @@
+import json
+import logging
+import math
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi.responses import Response
+
+from .models import JobMatch
+
+try:
+    import orjson  # optional fast path; falls back to the stdlib encoder
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+SCORE_FIELDS = ("match_score", "semantic_score", "keyword_score")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def validate_job(job: Dict) -> Optional[Dict]:
+    """The job as a JobMatch dict without scores, or None when it doesn't validate."""
+    try:
+        return JobMatch(**job).dict(exclude=set(SCORE_FIELDS))
+    except Exception as e:
+        logger.warning(f"Skipping job {job.get('job_id', '')} that failed validation: {str(e)}")
+        return None
+
+
+def _format_score(value: float) -> bytes:
+    # repr() round-trips floats and is valid JSON for finite values; NaN and
+    # inf have no JSON spelling, so they go out as 0.0
+    value = float(value)
+    if not math.isfinite(value):
+        value = 0.0
+    return repr(value).encode("ascii")
+
+
+def render_job(fragment: bytes, match_score: float = 0.0, semantic_score: float = 0.0, keyword_score: float = 0.0) -> bytes:
+    return b"".join((
+        fragment,
+        b',"match_score":', _format_score(match_score),
+        b',"semantic_score":', _format_score(semantic_score),
+        b',"keyword_score":', _format_score(keyword_score),
+        b"}",
+    ))
+
+
+def render_job_list(fragments: Iterable[bytes]) -> bytes:
+    """Render unscored jobs as a JSON array."""
+    return b"[" + b",".join(render_job(fragment) for fragment in fragments) + b"]"
+
+
+def render_match_list(
+    fragment_of: Callable[[int], Optional[bytes]], scored: Iterable[Tuple[int, float, float, float]]
+) -> bytes:
+    """Render ``(row, match, semantic, keyword)`` tuples as a JSON array of matches."""
+    rendered = []
+    for row, match_score, semantic_score, keyword_score in scored:
+        fragment = fragment_of(row)
+        if fragment is not None:
+            rendered.append(render_job(fragment, match_score, semantic_score, keyword_score))
+    return b"[" + b",".join(rendered) + b"]"
+
+
+class JSONBytesResponse(Response):
+    """Response for bodies that are already JSON-encoded bytes."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import heapq
+import logging
+import os
+import time
+from itertools import chain, zip_longest
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .metrics import SHARD_REQUEST_LATENCY
+
+
+logger = logging.getLogger(__name__)
+
+
+# A shard node keeps only the jobs whose job_id hashes to SHARD_ID
+SHARD_ID = int(os.getenv("SHARD_ID", "0"))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "1"))
+# Comma-separated shard base URLs, in SHARD_ID order; set on the coordinator only
+SHARD_URLS = [url.strip().rstrip("/") for url in os.getenv("SHARD_URLS", "").split(",") if url.strip()]
+# Shards that have not answered by then are left out of the merged result
+SHARD_DEADLINE = float(os.getenv("SHARD_DEADLINE", "2.0"))
+
+PARTIAL_HEADER = "X-Shards-Answered"
+
+
+def shard_of(job_id: str, shard_count: int) -> int:
+    """Shard owning ``job_id``; stable across processes, unlike hash()."""
+    digest = hashlib.blake2b(str(job_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def partition_jobs(jobs: List[Dict], shard_id: int = SHARD_ID, shard_count: int = SHARD_COUNT) -> List[Dict]:
+    if shard_count <= 1:
+        return jobs
+    return [job for job in jobs if shard_of(job.get("job_id", ""), shard_count) == shard_id]
+
+
+def merge_top_k(results: List[List[Dict]], k: int, key: str = "match_score") -> List[Dict]:
+    """Global top ``k`` from per-shard top-k lists.
+
+    The global top-k is always contained in the union of the shards' own
+    top-k, so merging them is exact. Ties go to the lower job_id.
+    """
+    return heapq.nsmallest(k, chain.from_iterable(results), key=lambda job: (-job.get(key, 0.0), job.get("job_id", "")))
+
+
+def interleave(results: List[List[Dict]], limit: int) -> List[Dict]:
+    """Round-robin over shards, so an unranked listing mixes every shard."""
+    merged = [job for row in zip_longest(*results) for job in row if job is not None]
+    return merged[:limit]
+
+
+class ShardClient:
+    """Scatters one request to every shard and gathers what arrives before the deadline."""
+
+    def __init__(self, urls: List[str], deadline: float = SHARD_DEADLINE):
+        self.urls = urls
+        self.deadline = deadline
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.deadline))
+        return self.session
+
+    async def close(self) -> None:
+        if self.session and not self.session.closed:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, shard: int, method: str, path: str, **kwargs) -> Tuple[int, Any]:
+        """(status, decoded JSON body) from one shard."""
+        session = await self.get_session()
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            async with session.request(method, f"{self.urls[shard]}{path}", **kwargs) as response:
+                body = await response.json(content_type=None)
+                outcome = "ok" if response.status < 400 else str(response.status)
+                return response.status, body
+        except asyncio.CancelledError:
+            outcome = "timeout"
+            raise
+        finally:
+            SHARD_REQUEST_LATENCY.observe(time.perf_counter() - start, shard=str(shard), outcome=outcome)
+
+    async def scatter(self, method: str, path: str, **kwargs) -> List[Optional[Any]]:
+        """Send the request to all shards; a shard that fails or misses the deadline yields None."""
+        tasks = [asyncio.ensure_future(self.request(shard, method, path, **kwargs)) for shard in range(len(self.urls))]
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+
+        results: List[Optional[Any]] = []
+        for shard, task in enumerate(tasks):
+            if task in pending:
+                logger.warning(f"Shard {shard} missed the {self.deadline}s deadline")
+                results.append(None)
+                continue
+            try:
+                status, body = task.result()
+            except Exception as e:
+                logger.error(f"Error querying shard {shard}: {str(e) or type(e).__name__}")
+                results.append(None)
+                continue
+            if status >= 400:
+                logger.error(f"Shard {shard} returned {status}")
+                results.append(None)
+                continue
+            results.append(body)
+        return results
+
+
+def coordinating() -> bool:
+    return bool(SHARD_URLS)
+
+
+_client: Optional[ShardClient] = None
+
+
+def get_shard_client() -> ShardClient:
+    global _client
+    if _client is None:
+        _client = ShardClient(SHARD_URLS)
+    return _client
+
+
+async def close_shard_client() -> None:
+    if _client is not None:
+        await _client.close()
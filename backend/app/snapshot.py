@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import pickle
+import shutil
+from datetime import datetime
+from typing import Dict, Optional
+
+import faiss
+import numpy as np
+
+from .store import JobStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, multi-worker mode falls back to leader-only
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# Directory shared by all workers of one deployment; unset disables
+# multi-worker mode. Put it on tmpfs (e.g. /dev/shm/navicv) so the mapped
+# snapshot files live in shared memory rather than on disk.
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "")
+# auto: the first worker to take the leader lock ingests, the rest follow
+WORKER_ROLE = os.getenv("WORKER_ROLE", "auto")
+SNAPSHOT_POLL_INTERVAL = float(os.getenv("SNAPSHOT_POLL_INTERVAL", "2"))
+# Older versions stay around briefly for followers that are still switching
+SNAPSHOT_KEEP = 3
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "leader.lock"
+REFRESH_REQUEST_FILE = "refresh.request"
+
+
+class CorpusSnapshot:
+    """One published corpus version, as attached by a follower."""
+
+    def __init__(
+        self,
+        version: int,
+        store: JobStore,
+        embeddings: Optional[np.ndarray] = None,
+        chunk_embeddings: Optional[np.ndarray] = None,
+        chunk_owners: Optional[np.ndarray] = None,
+        index: Optional[faiss.Index] = None,
+        vectorizer=None,
+    ):
+        self.version = version
+        self.store = store
+        self.embeddings = embeddings
+        self.chunk_embeddings = chunk_embeddings
+        self.chunk_owners = chunk_owners
+        self.index = index
+        self.vectorizer = vectorizer
+
+
+def _version_name(version: int) -> str:
+    return f"v{version:08d}"
+
+
+def current_version(directory: str) -> Optional[int]:
+    """Version named by the CURRENT pointer, or None before the first publish."""
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return int(f.read().strip().lstrip("v"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(directory: str, snapshot: CorpusSnapshot) -> str:
+    """Write a snapshot into its own version directory, then repoint CURRENT.
+
+    Followers only ever see a fully written version: CURRENT is replaced
+    atomically after every file is in place.
+    """
+    name = _version_name(snapshot.version)
+    path = os.path.join(directory, name)
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    snapshot.store.save(tmp_path)
+    files = {}
+    for array_name in ("embeddings", "chunk_embeddings", "chunk_owners"):
+        array = getattr(snapshot, array_name)
+        if array is not None:
+            np.save(os.path.join(tmp_path, f"{array_name}.npy"), np.ascontiguousarray(array))
+            files[array_name] = f"{array_name}.npy"
+    if snapshot.index is not None:
+        faiss.write_index(snapshot.index, os.path.join(tmp_path, "tfidf.faiss"))
+        files["index"] = "tfidf.faiss"
+    if snapshot.vectorizer is not None:
+        with open(os.path.join(tmp_path, "vectorizer.pkl"), "wb") as f:
+            pickle.dump(snapshot.vectorizer, f)
+        files["vectorizer"] = "vectorizer.pkl"
+    manifest = {
+        "version": snapshot.version,
+        "jobs": len(snapshot.store),
+        "files": files,
+        "created_at": datetime.now().isoformat(),
+    }
+    with open(os.path.join(tmp_path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    pointer = os.path.join(directory, f"{CURRENT_FILE}.tmp")
+    with open(pointer, "w", encoding="utf-8") as f:
+        f.write(name)
+    os.replace(pointer, os.path.join(directory, CURRENT_FILE))
+    prune_snapshots(directory, snapshot.version)
+    return path
+
+
+def read_snapshot(directory: str, version: int) -> CorpusSnapshot:
+    """Attach read-only to a published version; arrays and the index are memory-mapped."""
+    path = os.path.join(directory, _version_name(version))
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+        files: Dict[str, str] = json.load(f)["files"]
+
+    arrays = {
+        array_name: np.load(os.path.join(path, files[array_name]), mmap_mode="r") if array_name in files else None
+        for array_name in ("embeddings", "chunk_embeddings", "chunk_owners")
+    }
+    index = None
+    if "index" in files:
+        index = faiss.read_index(os.path.join(path, files["index"]), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    vectorizer = None
+    if "vectorizer" in files:
+        with open(os.path.join(path, files["vectorizer"]), "rb") as f:
+            vectorizer = pickle.load(f)
+    return CorpusSnapshot(version, JobStore.load(path), index=index, vectorizer=vectorizer, **arrays)
+
+
+def prune_snapshots(directory: str, latest: int, keep: int = SNAPSHOT_KEEP) -> None:
+    # Followers still mapping a removed version keep working: unlinked files
+    # stay readable until they are unmapped
+    for entry in os.listdir(directory):
+        if not entry.startswith("v") or entry.endswith(".tmp"):
+            continue
+        try:
+            version = int(entry[1:])
+        except ValueError:
+            continue
+        if version <= latest - keep:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+def request_refresh(directory: str) -> None:
+    """Ask the leader for a refresh; followers never crawl themselves."""
+    with open(os.path.join(directory, REFRESH_REQUEST_FILE), "w", encoding="utf-8") as f:
+        f.write(datetime.now().isoformat())
+
+
+def refresh_requested_at(directory: str) -> float:
+    try:
+        return os.path.getmtime(os.path.join(directory, REFRESH_REQUEST_FILE))
+    except OSError:
+        return 0.0
+
+
+class LeaderLock:
+    """Exclusive flock on ``leader.lock``; held for the life of the leader process.
+
+    The kernel drops the lock when the process exits, so a follower can take
+    over if the leader dies.
+    """
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, LOCK_FILE)
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            logger.warning("flock is unavailable on this platform; every worker acts as leader")
+            self._file = open(self.path, "a")
+            return True
+        lock_file = open(self.path, "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.truncate(0)
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
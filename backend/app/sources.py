@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from pydantic import ValidationError
+
+from .metrics import timed_fetch
+from .models import JobSourceConfig
+from .scraping import ADZUNA_COUNTRIES, JobScraper
+
+
+logger = logging.getLogger(__name__)
+
+
+# JSON list of JobSourceConfig objects; unset means BUILTIN_SOURCES only
+JOB_SOURCES_FILE = os.getenv("JOB_SOURCES_FILE", "")
+# Sources fetched at once during a refresh; per-host rate limits still apply
+SOURCE_CONCURRENCY = int(os.getenv("SOURCE_CONCURRENCY", "8"))
+
+SOURCE_KINDS = ("remoteok", "adzuna", "rss", "html")
+
+BUILTIN_SOURCES = [JobSourceConfig(name="remoteok", kind="remoteok", limit=100)] + [
+    JobSourceConfig(name=f"adzuna_{country}", kind="adzuna", location=country, limit=50)
+    for country in ADZUNA_COUNTRIES
+]
+
+
+def _check_source(source: JobSourceConfig) -> Optional[str]:
+    """Why ``source`` can't be used, or None if it is fine."""
+    if source.kind not in SOURCE_KINDS:
+        return f"unknown kind {source.kind!r}"
+    if source.kind in ("rss", "html") and not source.url:
+        return f"{source.kind} sources need a url"
+    # normalize_job_data picks the Adzuna field mapping by name prefix
+    if (source.kind == "adzuna") != source.name.startswith("adzuna"):
+        return "only adzuna sources may have names starting with 'adzuna'"
+    return None
+
+
+def load_sources(path: Optional[str] = None) -> List[JobSourceConfig]:
+    """Builtin sources plus the entries of ``path`` (default JOB_SOURCES_FILE).
+
+    An entry with a builtin name replaces that builtin, so ``{"name":
+    "remoteok", "kind": "remoteok", "enabled": false}`` turns it off.
+    Invalid entries are logged and skipped.
+    """
+    sources: Dict[str, JobSourceConfig] = {source.name: source for source in BUILTIN_SOURCES}
+    path = JOB_SOURCES_FILE if path is None else path
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            for entry in entries:
+                try:
+                    source = JobSourceConfig(**entry)
+                except (ValidationError, TypeError) as e:
+                    logger.error(f"Invalid job source {entry!r}: {str(e)}")
+                    continue
+                problem = _check_source(source)
+                if problem:
+                    logger.error(f"Skipping job source {source.name}: {problem}")
+                    continue
+                sources[source.name] = source
+        except Exception as e:
+            logger.error(f"Error loading job sources from {path}: {str(e)}")
+    return [source for source in sources.values() if source.enabled]
+
+
+def _page_urls(source: JobSourceConfig) -> List[str]:
+    if "{page}" not in source.url:
+        return [source.url]
+    return [source.url.replace("{page}", str(page)) for page in range(1, source.pages + 1)]
+
+
+async def fetch_source(scraper: JobScraper, source: JobSourceConfig) -> List[Dict]:
+    """Fetch every page of one source, tagging each job with the source name."""
+    if source.kind == "remoteok":
+        jobs = await scraper.fetch_remoteok_jobs(limit=source.limit)
+    elif source.kind == "adzuna":
+        jobs = await scraper.fetch_adzuna_jobs(limit=source.limit, location=source.location)
+    else:
+        fetch_page = scraper.fetch_jobs_from_rss if source.kind == "rss" else scraper.scrape_jobs_from_html
+        pages = await asyncio.gather(*(fetch_page(url, limit=source.limit) for url in _page_urls(source)))
+        jobs = [job for page in pages for job in page]
+
+    for job in jobs:
+        job["source"] = source.name
+    return jobs
+
+
+async def fetch_all_sources(
+    scraper: JobScraper, sources: List[JobSourceConfig], concurrency: int = SOURCE_CONCURRENCY
+) -> List[Dict]:
+    """Fetch all sources concurrently, returning their jobs in registry order.
+
+    A failing source is logged and contributes no jobs.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(source: JobSourceConfig) -> List[Dict]:
+        async with semaphore:
+            try:
+                jobs = await timed_fetch(source.name, fetch_source(scraper, source))
+            except Exception as e:
+                logger.error(f"Error fetching from {source.name}: {str(e)}")
+                return []
+        if jobs:
+            logger.info(f"Fetched {len(jobs)} jobs from {source.name}")
+        return jobs
+
+    results = await asyncio.gather(*(fetch(source) for source in sources))
+    return [job for jobs in results for job in jobs]
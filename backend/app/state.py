@@ -1,12 +1,40 @@
+import asyncio
 import logging
-from typing import List, Optional
+import os
+from functools import partial
+from typing import List, Optional, Set, Tuple
 
 import faiss
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from sklearn.feature_extraction.text import TfidfVectorizer
 
-from .matching import build_vectorizer_and_index, normalize_job_data
+from .candidates import CandidateIndex
+from .dedup import collapse_near_duplicates
+from .embedding import EMBEDDING_MAX_SIM, EMBEDDING_POOLING, encode_documents
+from .filters import JobFilterIndex
+from .http_cache import PRERENDERED_LIMITS, ResponseCache, make_etag
+from .features import compute_features
+from .matching import build_vectorizer_and_index, job_match_text, normalize_job_data
+from .metrics import CORPUS_JOBS, INDEX_BUILD_LATENCY
+from .nlp import configure_extractor, load_pipeline
 from .scraping import JobScraper
+from .serialization import render_job_list
+from .sharding import SHARD_COUNT, SHARD_ID, coordinating, partition_jobs
+from .snapshot import (
+    SNAPSHOT_DIR,
+    SNAPSHOT_POLL_INTERVAL,
+    WORKER_ROLE,
+    CorpusSnapshot,
+    LeaderLock,
+    current_version,
+    read_snapshot,
+    refresh_requested_at,
+    request_refresh,
+    write_snapshot,
+)
+from .sources import fetch_all_sources, load_sources
+from .store import JobStore
 
 
 logger = logging.getLogger(__name__)
@@ -16,65 +44,174 @@ sentence_model: Optional[SentenceTransformer] = None
 nlp = None
 job_vectorizer: Optional[TfidfVectorizer] = None
 job_index: Optional[faiss.Index] = None
-jobs_data: List[dict] = []
+jobs_data: JobStore = JobStore()
+job_filter_index: JobFilterIndex = JobFilterIndex(jobs_data)
+
+# Dense job vectors, row-aligned with jobs_data. Chunk vectors are only kept
+# when max-sim scoring is enabled.
+job_embeddings: Optional[np.ndarray] = None
+job_chunk_embeddings: Optional[np.ndarray] = None
+job_chunk_owners: Optional[np.ndarray] = None
+
+# Bumped on every publish; in multi-worker mode it is the snapshot version
+corpus_version: int = 0
+# standalone, or leader/follower when SNAPSHOT_DIR is set (see app/snapshot.py)
+worker_role: str = "standalone"
+_leader_lock: Optional[LeaderLock] = None
+# Rendered /jobs and /job/{id} bodies for the current corpus_version
+response_cache: ResponseCache = ResponseCache()
+
+# Analyzed resumes for job -> candidate matching, persisted across restarts
+candidate_index: CandidateIndex = CandidateIndex()
 
 
 async def initialize_models(load_spacy=True):
-    global sentence_model, nlp, job_vectorizer, job_index  # noqa: F824
+    global sentence_model, nlp, job_vectorizer, job_index, jobs_data, job_filter_index
     logger.info("Loading AI models...")
 
     sentence_model = SentenceTransformer("all-MiniLM-L6-v2")
 
     if load_spacy:
         try:
-            import spacy  # local import to avoid mandatory dependency at import time
-
-            nlp = spacy.load("en_core_web_sm")
+            nlp = load_pipeline()
         except Exception:
             logger.warning("spaCy model not found, using basic processing")
             nlp = None
+        configure_extractor(nlp)
 
     job_vectorizer = TfidfVectorizer(max_features=5000, stop_words="english")
     job_index = None
-    jobs_data.clear()
+    jobs_data = JobStore()
+    job_filter_index = JobFilterIndex(jobs_data)
+    _set_job_embeddings(None, None, None)
+    candidate_index.load()
 
-    await refresh_jobs_data()
+    if coordinating():
+        # Jobs live on the shards; endpoints that would need a local corpus
+        # are refused instead of crawling it here
+        logger.info("Models loaded successfully! Coordinating shards, skipping the local crawl")
+        return
+    if SNAPSHOT_DIR:
+        _claim_role()
+    if worker_role == "follower":
+        await attach_latest_snapshot()
+    else:
+        await refresh_jobs_data()
     logger.info("Models loaded successfully!")
 
 
+def _claim_role() -> None:
+    """Decide whether this worker ingests (leader) or attaches to snapshots (follower)."""
+    global worker_role, _leader_lock
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    _leader_lock = _leader_lock or LeaderLock(SNAPSHOT_DIR)
+    if WORKER_ROLE == "follower" or (WORKER_ROLE == "auto" and not _leader_lock.try_acquire()):
+        worker_role = "follower"
+    else:
+        worker_role = "leader"
+    logger.info(f"Worker {os.getpid()} running as {worker_role} for snapshots in {SNAPSHOT_DIR}")
+
+
+def render_jobs_page(store: JobStore, limit: int) -> bytes:
+    """Body of ``GET /jobs?limit=...`` without a search: the first rows of the corpus."""
+    return render_job_list(store.fragments(limit))
+
+
+def _cached_limits(store: JobStore) -> Set[int]:
+    # a limit past the corpus size is the whole corpus
+    return {min(limit, len(store)) for limit in PRERENDERED_LIMITS}
+
+
+def jobs_page(store: JobStore, limit: int) -> Tuple[bytes, str]:
+    """(body, etag) of ``GET /jobs?limit=...`` for the current corpus.
+
+    Only the pre-rendered limits are cached, so arbitrary limits can't fill
+    the cache; others are rendered per request.
+    """
+    limit = max(0, min(limit, len(store)))
+    render = partial(render_jobs_page, store, limit)
+    if limit not in _cached_limits(store):
+        body = render()
+        return body, make_etag(body)
+    return response_cache.get(corpus_version, ("jobs", limit), render)
+
+
+def _prerender_responses() -> None:
+    store = jobs_data
+    response_cache.warm(
+        corpus_version, {("jobs", limit): partial(render_jobs_page, store, limit) for limit in _cached_limits(store)}
+    )
+
+
+async def attach_latest_snapshot() -> bool:
+    """Swap in the newest published snapshot if it is newer than ours."""
+    global jobs_data, job_filter_index, job_index, job_vectorizer, corpus_version
+    version = current_version(SNAPSHOT_DIR)
+    if version is None or version == corpus_version:
+        return False
+    loop = asyncio.get_running_loop()
+    try:
+        with INDEX_BUILD_LATENCY.time(index="snapshot"):
+            snapshot = await loop.run_in_executor(None, read_snapshot, SNAPSHOT_DIR, version)
+            filter_index = await loop.run_in_executor(None, JobFilterIndex, snapshot.store)
+    except Exception as e:
+        logger.error(f"Error attaching corpus snapshot {version}: {str(e)}")
+        return False
+
+    jobs_data = snapshot.store
+    job_filter_index = filter_index
+    job_index, job_vectorizer = snapshot.index, snapshot.vectorizer
+    _set_job_embeddings(snapshot.embeddings, snapshot.chunk_embeddings, snapshot.chunk_owners)
+    corpus_version = version
+    CORPUS_JOBS.set(len(jobs_data))
+    _prerender_responses()
+    logger.info(f"Attached corpus snapshot {version} with {len(jobs_data)} jobs")
+    return True
+
+
+async def sync_snapshots(interval: float = SNAPSHOT_POLL_INTERVAL) -> None:
+    """Background loop for multi-worker mode.
+
+    Followers attach each new version and take over as leader if the
+    leader's lock is released; the leader serves refresh requests that
+    followers left in the snapshot directory.
+    """
+    global worker_role
+    refresh_handled_at = refresh_requested_at(SNAPSHOT_DIR)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if worker_role == "follower":
+                if WORKER_ROLE == "auto" and _leader_lock.try_acquire():
+                    worker_role = "leader"
+                    logger.info(f"Worker {os.getpid()} took over as snapshot leader")
+                    await refresh_jobs_data()
+                else:
+                    await attach_latest_snapshot()
+            else:
+                requested_at = refresh_requested_at(SNAPSHOT_DIR)
+                if requested_at > refresh_handled_at:
+                    refresh_handled_at = requested_at
+                    await refresh_jobs_data()
+        except Exception as e:
+            logger.error(f"Error syncing corpus snapshots: {str(e)}")
+
+
 async def refresh_jobs_data():
-    global job_index, job_vectorizer
+    if worker_role == "follower":
+        # Only the leader crawls; ask it to refresh and pick up what is published
+        request_refresh(SNAPSHOT_DIR)
+        await attach_latest_snapshot()
+        return
     try:
         logger.info("Refreshing job data from multiple sources...")
         scraper = JobScraper()
-        all_jobs = []
+        all_jobs = await fetch_all_sources(scraper, load_sources())
 
-        try:
-            remoteok_jobs = await scraper.fetch_remoteok_jobs(limit=100)
-            if remoteok_jobs:
-                for job in remoteok_jobs:
-                    job["source"] = "remoteok"
-                all_jobs.extend(remoteok_jobs)
-                logger.info(f"Fetched {len(remoteok_jobs)} jobs from RemoteOK")
-        except Exception as e:
-            logger.error(f"Error fetching from RemoteOK: {str(e)}")
-
-        countries = ["us", "gb", "au", "ca"]
-        for country in countries:
-            try:
-                adzuna_jobs = await scraper.fetch_adzuna_jobs(
-                    limit=50, location=country
-                )
-                if adzuna_jobs:
-                    for job in adzuna_jobs:
-                        job["source"] = f"adzuna_{country}"
-                    all_jobs.extend(adzuna_jobs)
-                    logger.info(
-                        f"Fetched {len(adzuna_jobs)} jobs from Adzuna {country}"
-                    )
-            except Exception as e:
-                logger.error(f"Error fetching from Adzuna {country}: {str(e)}")
-        
+        if scraper.unchanged_feeds and not scraper.changed_feeds and jobs_data:
+            # Every feed answered 304 or resent the same payload
+            logger.info("Job feeds unchanged since the last refresh, keeping the current corpus")
+            return
 
         if all_jobs:
             normalized_jobs = []
@@ -86,36 +223,105 @@ async def refresh_jobs_data():
                     seen_ids.add(job_id)
                     normalized_jobs.append(normalized_job)
 
-            # Mutate the shared list in place so imported references stay valid
-            jobs_data.clear()
-            jobs_data.extend(normalized_jobs)
-
-            job_descriptions = [
-                job.get("description", "") + " " + " ".join(job.get("tags", []))
-                for job in jobs_data
-            ]
-            if job_descriptions:
-                vectorizer, index = build_vectorizer_and_index(job_descriptions)
-                job_vectorizer = vectorizer
-                job_index = index
-                logger.info(
-                    f"Updated job data: {len(jobs_data)} jobs from multiple sources, FAISS index created"
-                )
-            else:
-                logger.warning("No job descriptions available for indexing")
+            # The same posting often appears on RemoteOK and several Adzuna
+            # countries under different ids; index only one copy of it
+            normalized_jobs = collapse_near_duplicates(normalized_jobs)
+
+            await _publish_jobs(normalized_jobs)
+            logger.info(f"Updated job data: {len(jobs_data)} jobs from multiple sources")
         else:
             logger.warning("No jobs fetched from any source, using sample data")
             sample_jobs = JobScraper().get_sample_jobs(20)
-            jobs_data.clear()
-            jobs_data.extend([normalize_job_data(job) for job in sample_jobs])
+            await _publish_jobs([normalize_job_data(job) for job in sample_jobs])
     except Exception as e:
         logger.error(f"Error refreshing job data: {str(e)}")
         sample_jobs = JobScraper().get_sample_jobs(20)
-        jobs_data.clear()
-        jobs_data.extend([normalize_job_data(job) for job in sample_jobs])
+        await _publish_jobs([normalize_job_data(job) for job in sample_jobs])
     finally:
         # Ensure HTTP session is closed to avoid unclosed session warnings
         try:
             await scraper.close()
         except Exception:
             pass
+
+
+def _set_job_embeddings(embeddings, chunk_embeddings, chunk_owners) -> None:
+    global job_embeddings, job_chunk_embeddings, job_chunk_owners
+    job_embeddings = embeddings
+    job_chunk_embeddings = chunk_embeddings
+    job_chunk_owners = chunk_owners
+
+
+def build_job_embeddings(jobs: List[dict], features=None):
+    if sentence_model is None or not jobs:
+        return None, None, None
+    if features is None:
+        texts = [job_match_text(job) for job in jobs]
+    else:
+        texts = [job_features.search_text for job_features in features]
+    return encode_documents(
+        sentence_model,
+        texts,
+        pooling=EMBEDDING_POOLING,
+        keep_chunks=EMBEDDING_MAX_SIM,
+    )
+
+
+async def _publish_jobs(normalized_jobs: List[dict]) -> None:
+    global jobs_data, job_filter_index, job_index, job_vectorizer, corpus_version
+    if SHARD_COUNT > 1:
+        # Deduplicated across the whole crawl first, so a posting lands on one shard
+        normalized_jobs = partition_jobs(normalized_jobs, SHARD_ID, SHARD_COUNT)
+        logger.info(f"Keeping {len(normalized_jobs)} jobs for shard {SHARD_ID}/{SHARD_COUNT}")
+    # Encode and build the store off the event loop before swapping anything
+    # in, so requests keep seeing a consistent (jobs, embeddings) pair.
+    loop = asyncio.get_running_loop()
+    # Ingest: per-job search text, tokens, skills, seniority and salary range,
+    # computed once here so the request path never processes job strings
+    with INDEX_BUILD_LATENCY.time(index="features"):
+        features = await loop.run_in_executor(None, compute_features, normalized_jobs)
+    try:
+        with INDEX_BUILD_LATENCY.time(index="embeddings"):
+            embeddings = await loop.run_in_executor(None, build_job_embeddings, normalized_jobs, features)
+    except Exception as e:
+        logger.error(f"Error encoding job embeddings: {str(e)}")
+        embeddings = (None, None, None)
+    with INDEX_BUILD_LATENCY.time(index="store"):
+        store = await loop.run_in_executor(None, JobStore, normalized_jobs, features)
+    with INDEX_BUILD_LATENCY.time(index="filters"):
+        filter_index = await loop.run_in_executor(None, JobFilterIndex, store)
+    vectorizer, index = None, None
+    job_descriptions = [
+        job.get("description", "") + " " + " ".join(job.get("tags", []))
+        for job in normalized_jobs
+    ]
+    if any(text.strip() for text in job_descriptions):
+        try:
+            with INDEX_BUILD_LATENCY.time(index="tfidf"):
+                vectorizer, index = await loop.run_in_executor(None, build_vectorizer_and_index, job_descriptions)
+        except Exception as e:
+            logger.error(f"Error building TF-IDF index: {str(e)}")
+    else:
+        logger.warning("No job descriptions available for indexing")
+
+    if worker_role == "leader":
+        # Continue numbering across leader restarts and failovers
+        corpus_version = max(corpus_version, current_version(SNAPSHOT_DIR) or 0) + 1
+    else:
+        corpus_version += 1
+    # Swap in a new immutable store together with its version; readers go
+    # through state.jobs_data
+    jobs_data = store
+    job_filter_index = filter_index
+    job_vectorizer, job_index = vectorizer, index
+    _set_job_embeddings(*embeddings)
+    CORPUS_JOBS.set(len(store))
+    _prerender_responses()
+
+    if worker_role == "leader":
+        snapshot = CorpusSnapshot(corpus_version, store, *embeddings, index=index, vectorizer=vectorizer)
+        try:
+            with INDEX_BUILD_LATENCY.time(index="snapshot"):
+                await loop.run_in_executor(None, write_snapshot, SNAPSHOT_DIR, snapshot)
+        except Exception as e:
+            logger.error(f"Error publishing corpus snapshot {corpus_version}: {str(e)}")
@@ -0,0 +1,336 @@
+import logging
+import mmap
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .features import JobFeatures, compute_job_features
+from .matching import keyword_terms, term_hash
+from .serialization import dumps, loads, validate_job
+
+
+logger = logging.getLogger(__name__)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _map_readonly(path: str):
+    """Read-only mmap of a file; slicing it yields bytes like the in-memory buffer."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        # The mapping stays valid after the file is closed (and unlinked)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def add_postings(postings: Dict[str, List[int]], row: int, terms: Iterable[str]) -> None:
+    for term in terms:
+        rows = postings.get(term)
+        if rows is None:
+            postings[term] = [row]
+        else:
+            rows.append(row)
+
+
+def build_term_index(postings: Dict[str, List[int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pack ``{term: ascending rows}`` into an inverted index of arrays.
+
+    Returns ``(hashes, offsets, rows)``: the sorted 64-bit hashes of every
+    distinct term, and for the i-th of them the rows
+    ``rows[offsets[i]:offsets[i + 1]]`` containing it. Hashing keeps the
+    index free of Python strings; at 64 bits a collision between terms of
+    one corpus is not a practical concern.
+    """
+    hashes = np.fromiter((term_hash(term) for term in postings), dtype=np.uint64, count=len(postings))
+    order = np.argsort(hashes, kind="stable")
+    lists = list(postings.values())
+    lengths = np.fromiter((len(lists[i]) for i in order), dtype=np.int64, count=len(lists))
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    rows = np.fromiter((row for i in order for row in lists[i]), dtype=np.int32, count=int(offsets[-1]))
+    return hashes[order], offsets, rows
+
+
+class JobStore:
+    """Immutable, columnar store for the normalized job corpus.
+
+    Rows are stored column by column instead of as one dict per job.
+    Low-cardinality strings (source, company, location, salary, dates, tags)
+    are interned, and all descriptions share one buffer of JSON-encoded
+    strings addressed by offsets. Each row is validated once at ingest and
+    the JSON of its remaining fields pre-serialized into a second buffer, so
+    rendering a row is a byte join with its description. Dict records are
+    only materialized on demand for the few rows that get returned.
+
+    The ingest-time features of each job (see app.features) are kept as
+    columns too: skills, seniority and numeric salary ranges, plus an
+    inverted index from hashed words and word pairs to rows that answers
+    keyword matching. Scoring and filtering never process job strings per
+    request.
+    """
+
+    __slots__ = (
+        "job_ids",
+        "titles",
+        "companies",
+        "locations",
+        "sources",
+        "salaries",
+        "urls",
+        "posted_dates",
+        "tags",
+        "description_buffer",
+        "description_offsets",
+        "head_buffer",
+        "head_offsets",
+        "term_hashes",
+        "term_offsets",
+        "term_rows",
+        "skills",
+        "seniorities",
+        "salary_ranges",
+        "_rows_by_id",
+    )
+
+    def __init__(self, jobs: Iterable[Dict] = (), features: Optional[Iterable[JobFeatures]] = None):
+        """``features`` must line up with ``jobs``; computed here when omitted."""
+        self.job_ids: List[str] = []
+        self.titles: List[str] = []
+        self.companies: List[str] = []
+        self.locations: List[str] = []
+        self.sources: List[str] = []
+        self.salaries: List[Optional[str]] = []
+        self.urls: List[str] = []
+        self.posted_dates: List[Optional[str]] = []
+        self.tags: List[Tuple[str, ...]] = []
+        self.skills: List[Tuple[str, ...]] = []
+        self.seniorities: List[Optional[str]] = []
+        self._rows_by_id: Dict[str, int] = {}
+
+        descriptions: List[bytes] = []
+        offsets = [0]
+        heads: List[bytes] = []
+        head_offsets = [0]
+        postings: Dict[str, List[int]] = {}
+        salary_ranges: List[Tuple[float, float]] = []
+        features = iter(features) if features is not None else None
+        for job in jobs:
+            job_id = str(job.get("job_id", ""))
+            self._rows_by_id.setdefault(job_id, len(self.job_ids))
+            self.job_ids.append(job_id)
+            self.titles.append(job.get("title", ""))
+            self.companies.append(_intern(job.get("company", "")))
+            self.locations.append(_intern(job.get("location", "")))
+            self.sources.append(_intern(job.get("source", "unknown")))
+            self.salaries.append(_intern(job.get("salary", "")))
+            self.urls.append(job.get("url", ""))
+            self.posted_dates.append(_intern(job.get("posted_date", "")))
+            self.tags.append(tuple(_intern(tag) for tag in job.get("tags", [])))
+
+            # Rows render the JobMatch-validated values; rows that fail
+            # validation get an empty head and are never rendered
+            record = validate_job(job)
+            if record is None:
+                head, description = b"", dumps(job.get("description") or "")
+            else:
+                description = dumps(record.pop("description"))
+                head = dumps(record)[:-1]
+            heads.append(head)
+            head_offsets.append(head_offsets[-1] + len(head))
+            descriptions.append(description)
+            offsets.append(offsets[-1] + len(description))
+
+            job_features = next(features) if features is not None else compute_job_features(job)
+            add_postings(postings, len(self.job_ids) - 1, job_features.terms)
+            self.skills.append(job_features.skills)
+            self.seniorities.append(job_features.seniority)
+            salary_ranges.append((
+                np.nan if job_features.salary_min is None else job_features.salary_min,
+                np.nan if job_features.salary_max is None else job_features.salary_max,
+            ))
+
+        invalid = sum(1 for head in heads if not head)
+        if invalid:
+            logger.warning(f"{invalid} of {len(heads)} jobs failed validation and will not be served")
+        self.head_buffer = b"".join(heads)
+        self.head_offsets = np.asarray(head_offsets, dtype=np.int64)
+        self.description_buffer = b"".join(descriptions)
+        self.description_offsets = np.asarray(offsets, dtype=np.int64)
+        self.term_hashes, self.term_offsets, self.term_rows = build_term_index(postings)
+        # (min, max) per row; NaN where the salary couldn't be parsed
+        self.salary_ranges = np.asarray(salary_ranges, dtype=np.float64).reshape(-1, 2)
+
+    # List columns written to columns.json by save()
+    _LIST_COLUMNS = (
+        "job_ids", "titles", "companies", "locations", "sources", "salaries", "urls", "posted_dates", "tags",
+        "skills", "seniorities",
+    )
+
+    def save(self, directory: str) -> None:
+        """Write the store under ``directory`` in the layout ``load`` maps back in."""
+        columns = {name: getattr(self, name) for name in self._LIST_COLUMNS}
+        with open(os.path.join(directory, "columns.json"), "wb") as f:
+            f.write(dumps(columns))
+        with open(os.path.join(directory, "descriptions.bin"), "wb") as f:
+            f.write(self.description_buffer)
+        with open(os.path.join(directory, "heads.bin"), "wb") as f:
+            f.write(self.head_buffer)
+        np.save(os.path.join(directory, "head_offsets.npy"), self.head_offsets)
+        np.save(os.path.join(directory, "description_offsets.npy"), self.description_offsets)
+        np.save(os.path.join(directory, "term_hashes.npy"), self.term_hashes)
+        np.save(os.path.join(directory, "term_offsets.npy"), self.term_offsets)
+        np.save(os.path.join(directory, "term_rows.npy"), self.term_rows)
+        np.save(os.path.join(directory, "salary_ranges.npy"), self.salary_ranges)
+
+    @classmethod
+    def load(cls, directory: str) -> "JobStore":
+        """Attach to a store written by ``save``.
+
+        The head and description buffers, the term index and the numeric columns are
+        memory-mapped read-only, so every process attached to the same files
+        shares one copy of them.
+        """
+        store = cls.__new__(cls)
+        with open(os.path.join(directory, "columns.json"), "rb") as f:
+            columns = loads(f.read())
+        for name in cls._LIST_COLUMNS:
+            values = columns[name]
+            if name in ("tags", "skills"):
+                values = [tuple(_intern(value) for value in row_values) for row_values in values]
+            elif name not in ("job_ids", "titles", "urls"):
+                values = [_intern(value) for value in values]
+            setattr(store, name, values)
+
+        store.head_buffer = _map_readonly(os.path.join(directory, "heads.bin"))
+        store.head_offsets = np.load(os.path.join(directory, "head_offsets.npy"), mmap_mode="r")
+        store.description_buffer = _map_readonly(os.path.join(directory, "descriptions.bin"))
+        store.description_offsets = np.load(os.path.join(directory, "description_offsets.npy"), mmap_mode="r")
+        for name in ("term_hashes", "term_offsets", "term_rows"):
+            setattr(store, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r"))
+        store.salary_ranges = np.load(os.path.join(directory, "salary_ranges.npy"), mmap_mode="r")
+        store._rows_by_id = {}
+        for row, job_id in enumerate(store.job_ids):
+            store._rows_by_id.setdefault(job_id, row)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def __bool__(self) -> bool:
+        return bool(self.job_ids)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for row in range(len(self)):
+            yield self.record(row)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.record(row) for row in range(*key.indices(len(self)))]
+        return self.record(key)
+
+    def _description_json(self, row: int) -> bytes:
+        start, end = self.description_offsets[row], self.description_offsets[row + 1]
+        return self.description_buffer[start:end]
+
+    def description(self, row: int) -> str:
+        return loads(self._description_json(row))
+
+    def fragment(self, row: int) -> Optional[bytes]:
+        """Unterminated JSON object for a row, without score fields."""
+        start, end = self.head_offsets[row], self.head_offsets[row + 1]
+        if start == end:
+            return None
+        return b"".join((self.head_buffer[start:end], b',"description":', self._description_json(row)))
+
+    def renderable(self, rows: Sequence[int]) -> np.ndarray:
+        """Mask of the ``rows`` that passed validation and can be rendered."""
+        rows = np.asarray(rows, dtype=np.int64)
+        return self.head_offsets[rows + 1] > self.head_offsets[rows]
+
+    def fragments(self, limit: Optional[int] = None) -> Iterator[bytes]:
+        """Fragments of the first ``limit`` rows that render, skipping past
+        rows that failed validation so a page is still filled."""
+        if limit is not None and limit <= 0:
+            return
+        sent = 0
+        for row in range(len(self)):
+            fragment = self.fragment(row)
+            if fragment is None:
+                continue
+            yield fragment
+            sent += 1
+            if sent == limit:
+                return
+
+    def record(self, row: int) -> Dict:
+        """Materialize one row as the dict shape produced by normalize_job_data."""
+        if row < 0:
+            row += len(self)
+        return {
+            "job_id": self.job_ids[row],
+            "title": self.titles[row],
+            "company": self.companies[row],
+            "location": self.locations[row],
+            "description": self.description(row),
+            "tags": list(self.tags[row]),
+            "salary": self.salaries[row],
+            "url": self.urls[row],
+            "posted_date": self.posted_dates[row],
+            "source": self.sources[row],
+            "match_score": 0.0,
+            "semantic_score": 0.0,
+            "keyword_score": 0.0,
+        }
+
+    def row_of(self, job_id: str) -> Optional[int]:
+        return self._rows_by_id.get(str(job_id))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self.row_of(job_id)
+        return None if row is None else self.record(row)
+
+    def rows_with_term(self, term: str) -> np.ndarray:
+        """Ascending rows whose description, title or tags contain ``term``."""
+        key = np.uint64(term_hash(term))
+        i = int(np.searchsorted(self.term_hashes, key))
+        if i == len(self.term_hashes) or self.term_hashes[i] != key:
+            return self.term_rows[:0]
+        return self.term_rows[self.term_offsets[i]:self.term_offsets[i + 1]]
+
+    def keyword_scores(self, keyword_counts: Dict[str, int], rows: Sequence[int]) -> np.ndarray:
+        """Share of the prepared keywords each of ``rows`` contains.
+
+        A keyword matches whole words only: a single word must be one of the
+        row's words and a phrase must appear with its words adjacent (see
+        keyword_terms), so "java" does not match "javascript".
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        total = sum(keyword_counts.values())
+        matched = np.zeros(len(rows), dtype=np.float64)
+        if not total or not len(rows):
+            return matched
+        for keyword, count in keyword_counts.items():
+            required = keyword_terms(keyword)
+            if not required:
+                continue
+            hit = np.ones(len(rows), dtype=bool)
+            for term in required:
+                postings = self.rows_with_term(term)
+                if not len(postings):
+                    hit[:] = False
+                    break
+                positions = np.minimum(np.searchsorted(postings, rows), len(postings) - 1)
+                hit &= postings[positions] == rows
+            matched += count * hit
+        return matched / total
+
+    def scored_record(self, row: int, match_score: float, semantic_score: float, keyword_score: float) -> Dict:
+        job = self.record(row)
+        job["match_score"] = match_score
+        job["semantic_score"] = semantic_score
+        job["keyword_score"] = keyword_score
+        return job
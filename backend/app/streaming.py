@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from .models import JobMatch
+from .serialization import dumps
+
+
+logger = logging.getLogger(__name__)
+
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+# Sent with every stream: nginx would otherwise buffer the whole response
+# before passing it on, and the first results would arrive with the last
+STREAM_HEADERS = {"X-Accel-Buffering": "no", "Cache-Control": "no-cache"}
+
+# Jobs are scored and flushed in shards of this size so the first results
+# reach the client long before the whole corpus has been scored.
+STREAM_SHARD_SIZE = 256
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a ``fields=a,b,c`` projection, rejecting unknown field names."""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in JobMatch.__fields__ and field != "source"]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def project_job(job: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return job
+    return {field: job.get(field) for field in fields}
+
+
+def encode_event(payload: Dict[str, Any], fmt: str, event: str = "job") -> bytes:
+    if fmt == "sse":
+        return b"event: " + event.encode("utf-8") + b"\ndata: " + dumps(payload) + b"\n\n"
+    if event != "job":
+        payload = {"event": event, **payload}
+    return dumps(payload) + b"\n"
+
+
+async def stream_job_batches(
+    batches: AsyncIterator[Iterable[Dict[str, Any]]],
+    fmt: str,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Encode batches of jobs as NDJSON/SSE events, ending with a ``done`` event."""
+    sent = 0
+    try:
+        async for batch in batches:
+            for job in batch:
+                if limit is not None and sent >= limit:
+                    break
+                yield encode_event(project_job(job, fields), fmt)
+                sent += 1
+            if limit is not None and sent >= limit:
+                break
+            # Let the server flush this batch before producing the next one
+            await asyncio.sleep(0)
+    except Exception as e:
+        logger.error(f"Error streaming jobs: {str(e)}")
+        yield encode_event({"detail": str(e)}, fmt, event="error")
+    yield encode_event({"count": sent}, fmt, event="done")
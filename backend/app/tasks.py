@@ -0,0 +1,337 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .metrics import ANALYSIS_QUEUE_DEPTH, STAGE_LATENCY
+from .snapshot import SNAPSHOT_DIR
+
+
+logger = logging.getLogger(__name__)
+
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+ANALYSIS_QUEUE_SIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", "200"))
+# Queued or running tasks one client may have at once
+ANALYSIS_MAX_PER_CLIENT = int(os.getenv("ANALYSIS_MAX_PER_CLIENT", "10"))
+ANALYSIS_RESULT_TTL = float(os.getenv("ANALYSIS_RESULT_TTL", "900"))
+ANALYSIS_MAX_RESULTS = int(os.getenv("ANALYSIS_MAX_RESULTS", "1000"))
+# Queued uploads are held in memory until a worker gets to them
+ANALYSIS_MAX_UPLOAD_BYTES = int(os.getenv("ANALYSIS_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+# Task status shared by the workers of one deployment, so a task can be read
+# from any of them and the per-client limit holds across all of them.
+# Defaults to a directory next to the snapshots in multi-worker mode.
+TASK_DIR = os.getenv("TASK_DIR", os.path.join(SNAPSHOT_DIR, "tasks") if SNAPSHOT_DIR else "")
+# How often a worker re-reads the status of a task another worker runs
+TASK_POLL_INTERVAL = 0.25
+# Shared files of tasks that never finished (their worker died) are dropped
+# after STALE_TASK_AGE, checked every TASK_SWEEP_INTERVAL
+STALE_TASK_AGE = 3600.0
+TASK_SWEEP_INTERVAL = 60.0
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = (DONE, FAILED)
+
+
+class QueueFull(Exception):
+    """Raised by submit when the queue or the client's share of it is full."""
+
+
+class Task:
+    __slots__ = (
+        "task_id", "client", "priority", "status", "result", "error",
+        "created_at", "started_at", "finished_at", "expires_at", "work", "done",
+    )
+
+    def __init__(self, client: str, priority: int, work: Callable[[], Any]):
+        self.task_id = uuid.uuid4().hex
+        self.client = client
+        self.priority = priority
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.expires_at: Optional[float] = None
+        self.work: Optional[Callable[[], Any]] = work
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict:
+        def iso(timestamp):
+            return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+        return {
+            "task_id": self.task_id,
+            "status": self.status,
+            "created_at": iso(self.created_at),
+            "started_at": iso(self.started_at),
+            "finished_at": iso(self.finished_at),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+def _write_json(path: str, data: Dict) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class TaskQueue:
+    """Priority queue of blocking jobs with round-robin fairness between clients.
+
+    Each priority level keeps one FIFO per client and serves the clients in
+    turn, so one client submitting a burst can't starve the others. Workers
+    run the jobs in the default executor. Finished tasks stay readable until
+    ``result_ttl`` passes or ``max_results`` newer ones have finished.
+
+    With a ``directory`` shared between processes, each task's status is
+    also written there as ``<task_id>.json`` and each pending task leaves a
+    marker under ``active/<client>/``. Any process can then answer
+    ``status`` and ``wait`` for it, and ``max_per_client`` counts the
+    client's tasks in every process. Tasks still run where they were
+    submitted.
+    """
+
+    def __init__(
+        self,
+        workers: int = ANALYSIS_WORKERS,
+        max_queued: int = ANALYSIS_QUEUE_SIZE,
+        max_per_client: int = ANALYSIS_MAX_PER_CLIENT,
+        result_ttl: float = ANALYSIS_RESULT_TTL,
+        max_results: int = ANALYSIS_MAX_RESULTS,
+        directory: Optional[str] = TASK_DIR or None,
+    ):
+        self.workers = workers
+        self.directory = directory
+        self.max_queued = max_queued
+        self.max_per_client = max_per_client
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        self._levels: List["OrderedDict[str, Deque[Task]]"] = [OrderedDict() for _ in PRIORITIES]
+        self._tasks: Dict[str, Task] = {}
+        self._finished: "OrderedDict[str, Task]" = OrderedDict()
+        self._active_per_client: Dict[str, int] = {}
+        self._queued = 0
+        self._ready: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        self._swept_at = 0.0
+
+    def __len__(self) -> int:
+        return self._queued
+
+    def start(self) -> None:
+        self._ready = asyncio.Condition()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, client: str, work: Callable[[], Any], priority: int = PRIORITIES["normal"]) -> Task:
+        self._expire()
+        if self._queued >= self.max_queued:
+            raise QueueFull("The analysis queue is full")
+        if self._pending_for(client) >= self.max_per_client:
+            raise QueueFull(f"Too many pending analyses for this client (max {self.max_per_client})")
+
+        task = Task(client, priority, work)
+        self._tasks[task.task_id] = task
+        self._active_per_client[client] = self._active_per_client.get(client, 0) + 1
+        self._mark_active(task, True)
+        self._publish(task)
+        self._levels[priority].setdefault(client, deque()).append(task)
+        self._queued += 1
+        ANALYSIS_QUEUE_DEPTH.set(self._queued)
+        async with self._ready:
+            self._ready.notify()
+        return task
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """A task submitted to this queue (not one from another process)."""
+        self._expire()
+        return self._tasks.get(task_id)
+
+    def status(self, task_id: str) -> Optional[Dict]:
+        """``Task.to_dict()`` of a task submitted here or, with a shared directory, anywhere."""
+        task = self.get(task_id)
+        if task is not None:
+            return task.to_dict()
+        return self._read(task_id)
+
+    async def wait(self, task_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Status once the task has finished or ``timeout`` seconds passed."""
+        task = self.get(task_id)
+        if task is not None:
+            try:
+                await asyncio.wait_for(task.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            return task.to_dict()
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        status = self._read(task_id)
+        while status is not None and status["status"] not in FINISHED:
+            if deadline is not None and loop.time() >= deadline:
+                break
+            await asyncio.sleep(TASK_POLL_INTERVAL)
+            status = self._read(task_id)
+        return status
+
+    def _pending_for(self, client: str) -> int:
+        if not self.directory:
+            return self._active_per_client.get(client, 0)
+        try:
+            markers = os.listdir(self._client_dir(client))
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logger.error(f"Error counting tasks for client: {str(e)}")
+            return self._active_per_client.get(client, 0)
+        return len(markers)
+
+    def _path(self, task_id: str) -> str:
+        return os.path.join(self.directory, f"{task_id}.json")
+
+    def _client_dir(self, client: str) -> str:
+        return os.path.join(self.directory, "active", hashlib.sha1(client.encode("utf-8")).hexdigest()[:16])
+
+    def _mark_active(self, task: Task, active: bool) -> None:
+        if not self.directory:
+            return
+        marker = os.path.join(self._client_dir(task.client), task.task_id)
+        try:
+            if active:
+                os.makedirs(os.path.dirname(marker), exist_ok=True)
+                open(marker, "wb").close()
+            else:
+                os.remove(marker)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error updating active marker of task {task.task_id}: {str(e)}")
+
+    def _publish(self, task: Task) -> None:
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_json(self._path(task.task_id), {**task.to_dict(), "expires_at": task.expires_at})
+        except Exception as e:
+            logger.error(f"Error publishing task {task.task_id}: {str(e)}")
+
+    def _read(self, task_id: str) -> Optional[Dict]:
+        # task ids are uuid4 hex; anything else can't name a task file
+        if not self.directory or len(task_id) != 32 or not task_id.isalnum():
+            return None
+        try:
+            with open(self._path(task_id), "r", encoding="utf-8") as f:
+                status = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading task {task_id}: {str(e)}")
+            return None
+        expires_at = status.pop("expires_at", None)
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return status
+
+    def _next_task(self) -> Optional[Task]:
+        for level in self._levels:
+            if not level:
+                continue
+            # Serve the client at the front, then send it to the back
+            client, tasks = next(iter(level.items()))
+            task = tasks.popleft()
+            if tasks:
+                level.move_to_end(client)
+            else:
+                del level[client]
+            self._queued -= 1
+            ANALYSIS_QUEUE_DEPTH.set(self._queued)
+            return task
+        return None
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self._ready:
+                task = self._next_task()
+                while task is None:
+                    await self._ready.wait()
+                    task = self._next_task()
+
+            task.status = RUNNING
+            task.started_at = time.time()
+            self._publish(task)
+            STAGE_LATENCY.observe(task.started_at - task.created_at, stage="analysis_queue_wait")
+            try:
+                task.result = await loop.run_in_executor(None, task.work)
+                task.status = DONE
+            except Exception as e:
+                logger.error(f"Error running task {task.task_id}: {str(e)}")
+                task.error = str(e)
+                task.status = FAILED
+            finally:
+                self._finish(task)
+
+    def _finish(self, task: Task) -> None:
+        task.work = None
+        task.finished_at = time.time()
+        task.expires_at = task.finished_at + self.result_ttl
+        remaining = self._active_per_client.get(task.client, 1) - 1
+        if remaining:
+            self._active_per_client[task.client] = remaining
+        else:
+            self._active_per_client.pop(task.client, None)
+        self._finished[task.task_id] = task
+        self._publish(task)
+        self._mark_active(task, False)
+        task.done.set()
+        self._expire()
+
+    def _expire(self) -> None:
+        now = time.time()
+        while self._finished:
+            task_id, task = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_results and task.expires_at > now:
+                break
+            del self._finished[task_id]
+            self._tasks.pop(task_id, None)
+            if self.directory:
+                try:
+                    os.remove(self._path(task_id))
+                except OSError:
+                    pass
+        if self.directory and now - self._swept_at > TASK_SWEEP_INTERVAL:
+            self._swept_at = now
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        """Drop shared files left by processes that exited or died."""
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and now - entry.stat().st_mtime > max(self.result_ttl, STALE_TASK_AGE):
+                    os.remove(entry.path)
+            active = os.path.join(self.directory, "active")
+            for client_dir in os.scandir(active) if os.path.isdir(active) else ():
+                for marker in os.scandir(client_dir.path):
+                    if now - marker.stat().st_mtime > STALE_TASK_AGE:
+                        os.remove(marker.path)
+        except Exception as e:
+            logger.error(f"Error sweeping task directory: {str(e)}")
@@ -0,0 +1 @@
+"""Offline benchmarks for the matching, analysis and ingestion hot paths."""
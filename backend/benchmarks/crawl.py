@@ -0,0 +1,146 @@
+"""End-to-end crawl benchmark against the local mock job sources.
+
+Starts benchmarks.mock_sources in-process (or uses --base-url), points the
+scraper at it, and measures:
+
+  * refresh_jobs_data wall time
+  * /jobs?search-style searches at a given concurrency
+  * RSS and HTML page crawls at a given concurrency
+
+    python -m benchmarks.crawl --jobs 5000 --latency-ms 50 --error-rate 0.02 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from urllib.parse import urlparse
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from app import state
+from app.resilience import configure_source, reset_guards
+from app.scraping import JobScraper
+
+from .mock_sources import MockSourceConfig, create_app
+from .synthetic import HashingEncoder
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _timed_concurrently(make_call: Callable[[int], Awaitable], total: int, concurrency: int) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    durations: List[float] = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await make_call(i)
+            durations.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": float(np.percentile(durations, 50)),
+        "p95_ms": float(np.percentile(durations, 95)),
+    }
+
+
+async def run_crawl(
+    base_url: str, searches: int, pages: int, concurrency: int, rate_limit: Optional[float] = None
+) -> Dict[str, Dict]:
+    os.environ["REMOTEOK_BASE_URL"] = base_url
+    os.environ["ADZUNA_BASE_URL"] = f"{base_url}/v1/api/jobs"
+    # Measure the mock, not the production per-provider rate limits
+    reset_guards()
+    for source in ("remoteok", "adzuna", urlparse(base_url).netloc):
+        configure_source(source, rate_limit, burst=concurrency)
+    state.sentence_model = state.sentence_model or HashingEncoder()
+    results: Dict[str, Dict] = {}
+
+    start = time.perf_counter()
+    await state.refresh_jobs_data()
+    results["refresh_jobs_data"] = {"seconds": time.perf_counter() - start, "jobs": len(state.jobs_data)}
+
+    scraper = JobScraper()
+    queries = ["python", "engineer", "data", "designer", "cloud", "manager"]
+    try:
+        async def search(i: int):
+            async for _ in scraper.iter_search_results(queries[i % len(queries)], limit=10):
+                pass
+
+        results["search"] = await _timed_concurrently(search, searches, concurrency)
+        results["rss_pages"] = await _timed_concurrently(
+            lambda i: scraper.fetch_jobs_from_rss(f"{base_url}/rss?page={i + 1}"), pages, concurrency
+        )
+        results["html_pages"] = await _timed_concurrently(
+            lambda i: scraper.scrape_jobs_from_html(f"{base_url}/html?page={i + 1}"), pages, concurrency
+        )
+    finally:
+        await scraper.close()
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}/stats") as response:
+            results["upstream_requests"] = await response.json()
+    return results
+
+
+async def _main(args) -> None:
+    runner: Optional[web.AppRunner] = None
+    base_url = args.base_url
+    if not base_url:
+        config = MockSourceConfig(
+            jobs=args.jobs,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        runner = web.AppRunner(create_app(config))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", args.port)
+        await site.start()
+        base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        results = await run_crawl(base_url, args.searches, args.pages, args.concurrency, args.rate_limit)
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+    for name, result in results.items():
+        print(f"{name:<20} " + "  ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                                         for key, value in result.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="use an already running mock instead of starting one")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--searches", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate-limit", type=float, help="per-source requests/second (default: unlimited)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Local stand-in for the upstream job sources.
+
+Serves RemoteOK- and Adzuna-shaped JSON plus paginated RSS and HTML listing
+pages from a synthetic corpus, with tunable latency, error rate and size:
+
+    python -m benchmarks.mock_sources --port 8900 --jobs 5000 --latency-ms 80 --error-rate 0.05
+
+Point the backend at it with:
+
+    REMOTEOK_BASE_URL=http://localhost:8900 \\
+    ADZUNA_BASE_URL=http://localhost:8900/v1/api/jobs uvicorn main:app
+
+Responses carry content-hash ETags and honour If-None-Match with 304s
+(disable with --no-etags). RSS and HTML pages live at /rss?page=N and
+/html?page=N. /stats reports
+request counts per route, and /stats/reset clears them.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import random
+from collections import Counter
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from aiohttp import web
+
+from .synthetic import generate_raw_jobs
+
+
+class MockSourceConfig:
+    def __init__(
+        self,
+        jobs: int = 1000,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        page_size: int = 50,
+        seed: int = 0,
+        etags: bool = True,
+    ):
+        self.jobs = jobs
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.page_size = page_size
+        self.seed = seed
+        self.etags = etags
+
+
+def _matches(job: Dict, query: Optional[str]) -> bool:
+    if not query:
+        return True
+    title = job.get("position") or job.get("title") or ""
+    return query.lower() in f"{title} {job.get('description', '')}".lower()
+
+
+def _page(items: List, page: int, page_size: int) -> List:
+    start = max(page - 1, 0) * page_size
+    return items[start:start + page_size]
+
+
+def _listing(job: Dict) -> Dict:
+    """Flatten either raw shape into title/company/location/description/url."""
+    company = job.get("company")
+    location = job.get("location")
+    return {
+        "title": job.get("position") or job.get("title", ""),
+        "company": company.get("display_name", "") if isinstance(company, dict) else company,
+        "location": location.get("display_name", "") if isinstance(location, dict) else location,
+        "description": job.get("description", ""),
+        "url": job.get("url") or job.get("redirect_url", ""),
+        "tags": job.get("tags") or job.get("category", {}).get("label", "").split(", "),
+    }
+
+
+def _respond(request: web.Request, config: MockSourceConfig, body: str, content_type: str) -> web.Response:
+    """Response with a content-hash ETag, answering 304 to a matching If-None-Match."""
+    if not config.etags:
+        return web.Response(text=body, content_type=content_type)
+    etag = f'"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers={"ETag": etag})
+    return web.Response(text=body, content_type=content_type, headers={"ETag": etag})
+
+
+def create_app(config: MockSourceConfig) -> web.Application:
+    corpus = generate_raw_jobs(config.jobs, seed=config.seed)
+    remoteok_jobs = [job for job in corpus if job["source"] == "remoteok"]
+    adzuna_jobs: Dict[str, List[Dict]] = {}
+    for job in corpus:
+        if job["source"].startswith("adzuna_"):
+            adzuna_jobs.setdefault(job["source"].split("_", 1)[1], []).append(job)
+    rng = random.Random(config.seed)
+    stats: Counter = Counter()
+
+    @web.middleware
+    async def upstream_behaviour(request: web.Request, handler):
+        if request.path.startswith("/stats"):
+            return await handler(request)
+        stats[request.path.split("/")[1] or "root"] += 1
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if rng.random() < config.error_rate:
+            stats["errors"] += 1
+            raise web.HTTPServiceUnavailable(text="mock upstream error")
+        return await handler(request)
+
+    async def remoteok(request: web.Request) -> web.Response:
+        query = request.query.get("search")
+        limit = int(request.query.get("limit", len(remoteok_jobs)))
+        jobs = [job for job in remoteok_jobs if _matches(job, query)][:limit]
+        # RemoteOK prepends a legal notice object to every response
+        return _respond(request, config, json.dumps([{"legal": "mock remoteok feed"}] + jobs), "application/json")
+
+    async def adzuna(request: web.Request) -> web.Response:
+        country = request.match_info["country"]
+        page = int(request.match_info["page"])
+        page_size = min(int(request.query.get("results_per_page", config.page_size)), 50)
+        jobs = [job for job in adzuna_jobs.get(country, []) if _matches(job, request.query.get("what"))]
+        body = json.dumps({"count": len(jobs), "results": _page(jobs, page, page_size)})
+        return _respond(request, config, body, "application/json")
+
+    async def rss(request: web.Request) -> web.Response:
+        page = int(request.query.get("page", 1))
+        items = []
+        for job in map(_listing, _page(corpus, page, config.page_size)):
+            items.append(
+                "<item>"
+                f"<title>{escape(job['title'])}</title>"
+                f"<company>{escape(job['company'])}</company>"
+                f"<location>{escape(job['location'])}</location>"
+                f"<description>{escape(job['description'])}</description>"
+                f"<link>{escape(job['url'])}</link>"
+                "</item>"
+            )
+        body = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Mock jobs</title>{"".join(items)}</channel></rss>'
+        return _respond(request, config, body, "application/rss+xml")
+
+    async def html_listing(request: web.Request) -> web.Response:
+        page = int(request.query.get("page", 1))
+        cards = []
+        for job in map(_listing, _page(corpus, page, config.page_size)):
+            tags = "".join(f'<span class="tag">{html.escape(tag)}</span>' for tag in job["tags"] if tag)
+            cards.append(
+                '<article class="job-card">'
+                f'<h2 class="job-title"><a href="{html.escape(job["url"])}">{html.escape(job["title"])}</a></h2>'
+                f'<span class="company">{html.escape(job["company"])}</span>'
+                f'<span class="location">{html.escape(job["location"])}</span>'
+                f'<div class="description">{html.escape(job["description"])}</div>'
+                f"{tags}</article>"
+            )
+        next_link = f'<a rel="next" href="/html?page={page + 1}">Next</a>' if len(cards) == config.page_size else ""
+        return _respond(request, config, f"<html><body>{''.join(cards)}{next_link}</body></html>", "text/html")
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(dict(stats))
+
+    async def reset_stats(request: web.Request) -> web.Response:
+        stats.clear()
+        return web.json_response({})
+
+    app = web.Application(middlewares=[upstream_behaviour])
+    app.router.add_get("/api", remoteok)
+    app.router.add_get("/api/jobs", remoteok)
+    app.router.add_get("/v1/api/jobs/{country}/search/{page}", adzuna)
+    app.router.add_get("/rss", rss)
+    app.router.add_get("/html", html_listing)
+    app.router.add_get("/stats", get_stats)
+    app.router.add_post("/stats/reset", reset_stats)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--jobs", type=int, default=1000, help="synthetic corpus size")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-etags", action="store_true", help="never send ETags or 304 responses")
+    args = parser.parse_args()
+
+    config = MockSourceConfig(
+        jobs=args.jobs,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        page_size=args.page_size,
+        seed=args.seed,
+        etags=not args.no_etags,
+    )
+    web.run_app(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Benchmark the matching, analysis and ingestion hot paths.
+
+Usage (from backend/):
+
+    python -m benchmarks.run                          # 1k, 10k, 100k jobs
+    python -m benchmarks.run --sizes 1000 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+Timings are reported as p50/p95 in milliseconds per call, and memory as the
+tracemalloc peak of one extra, separately traced call. The job_store stage
+also reports the memory the built store keeps per job. With ``--baseline`` the
+run exits non-zero when any stage's p95 regresses past the tolerance.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app import state
+from app.analysis import analyze_resume, extract_text_from_pdf
+from app.filters import JobFilterIndex
+from app.matching import build_vectorizer_and_index, clean_text_encoding, normalize_job_data
+from app.models import MatchRequest
+from app.store import JobStore
+
+from .synthetic import HashingEncoder, generate_raw_jobs, generate_resumes, make_pdf
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+# build_vectorizer_and_index densifies a (jobs x 5000) float32 matrix
+TFIDF_FEATURES = 5000
+DEFAULT_MAX_INDEX_BYTES = 1 << 30
+
+
+def measure(fn: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """Time ``repeats`` calls of fn, then trace one more call for peak memory."""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": float(np.percentile(durations, 50)),
+        "p95_ms": float(np.percentile(durations, 95)),
+        "peak_kb": peak / 1024,
+        "repeats": repeats,
+    }
+
+
+def retained_kb(build: Callable[[], object]) -> float:
+    """KB still allocated by the object ``build`` returns, once it is built."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del built
+    return current / 1024
+
+
+def _cycle(items: List) -> Callable[[], object]:
+    position = {"i": 0}
+
+    def next_item():
+        item = items[position["i"] % len(items)]
+        position["i"] += 1
+        return item
+
+    return next_item
+
+
+# app.state globals _install_corpus replaces, restored when it exits
+_CORPUS_STATE = (
+    "sentence_model", "jobs_data", "job_filter_index", "job_embeddings", "job_chunk_embeddings", "job_chunk_owners",
+)
+
+
+@contextmanager
+def _install_corpus(normalized_jobs: List[Dict], encoder):
+    """Load a corpus into app.state the way refresh_jobs_data would, for the
+    duration of the block, leaving app.state as it was found afterwards."""
+    saved = {name: getattr(state, name) for name in _CORPUS_STATE}
+    try:
+        state.sentence_model = encoder
+        embeddings = state.build_job_embeddings(normalized_jobs)
+        state.jobs_data = JobStore(normalized_jobs)
+        state.job_filter_index = JobFilterIndex(state.jobs_data)
+        state._set_job_embeddings(*embeddings)
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(state, name, value)
+
+
+def run_size(size: int, repeats: int, seed: int, encoder, max_index_bytes: int) -> Dict[str, Dict]:
+    import main  # imported lazily: pulls in FastAPI and the full app
+
+    raw_jobs = generate_raw_jobs(size, seed=seed)
+    resumes = generate_resumes(max(repeats, 8), seed=seed)
+    pdfs = [make_pdf(resume) for resume in resumes]
+    results: Dict[str, Dict] = {}
+
+    descriptions = [job["description"] for job in raw_jobs]
+    results["clean_text_encoding"] = measure(lambda: [clean_text_encoding(d) for d in descriptions], repeats)
+    results["normalize_job_data"] = measure(lambda: [normalize_job_data(job) for job in raw_jobs], repeats)
+
+    normalized_jobs = [normalize_job_data(job) for job in raw_jobs]
+    results["job_store"] = measure(lambda: JobStore(normalized_jobs), max(1, repeats // 5))
+    results["job_store"]["retained_kb_per_job"] = retained_kb(lambda: JobStore(normalized_jobs)) / size
+    if size * TFIDF_FEATURES * 4 <= max_index_bytes:
+        texts = [job["description"] + " " + " ".join(job["tags"]) for job in normalized_jobs]
+        results["build_vectorizer_and_index"] = measure(lambda: build_vectorizer_and_index(texts), max(1, repeats // 5))
+    else:
+        logger.warning(f"Skipping build_vectorizer_and_index at {size} jobs (exceeds --max-index-bytes)")
+
+    next_resume = _cycle(resumes)
+    loop = asyncio.new_event_loop()
+    try:
+        with _install_corpus(normalized_jobs, encoder):
+            results["match_jobs_endpoint"] = measure(
+                lambda: loop.run_until_complete(main.match_jobs_endpoint(MatchRequest(resume_text=next_resume()))),
+                repeats,
+            )
+    finally:
+        loop.close()
+
+    next_text = _cycle(resumes)
+    results["analyze_resume"] = measure(lambda: analyze_resume(next_text()), repeats)
+    next_pdf = _cycle(pdfs)
+    results["extract_text_from_pdf"] = measure(lambda: extract_text_from_pdf(next_pdf()), repeats)
+    return results
+
+
+def run_suite(sizes: List[int], repeats: int = 20, seed: int = 0, encoder=None,
+              max_index_bytes: int = DEFAULT_MAX_INDEX_BYTES) -> Dict:
+    encoder = encoder or HashingEncoder()
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "encoder": type(encoder).__name__,
+            "seed": seed,
+            "repeats": repeats,
+        },
+        "results": {},
+    }
+    for size in sizes:
+        logger.info(f"Benchmarking {size} jobs...")
+        report["results"][str(size)] = run_size(size, repeats, seed, encoder, max_index_bytes)
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Stages whose p95 regressed by more than tolerance and min_delta_ms."""
+    regressions = []
+    for size, stages in report["results"].items():
+        for stage, current in stages.items():
+            previous = baseline.get("results", {}).get(size, {}).get(stage)
+            if previous is None:
+                continue
+            limit = previous["p95_ms"] * (1 + tolerance)
+            if current["p95_ms"] > limit and current["p95_ms"] - previous["p95_ms"] > min_delta_ms:
+                regressions.append(
+                    f"{stage} @ {size} jobs: p95 {current['p95_ms']:.2f} ms vs baseline {previous['p95_ms']:.2f} ms"
+                )
+    return regressions
+
+
+def _print_report(report: Dict) -> None:
+    print(f"{'jobs':>8}  {'stage':<28}{'p50 ms':>10}{'p95 ms':>10}{'peak KB':>12}{'KB/job':>10}")
+    for size, stages in report["results"].items():
+        for stage, result in stages.items():
+            per_job = f"{result['retained_kb_per_job']:>10.2f}" if "retained_kb_per_job" in result else ""
+            print(
+                f"{size:>8}  {stage:<28}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['peak_kb']:>12.0f}"
+                f"{per_job}"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--encoder", choices=["hashing", "minilm"], default="hashing",
+                        help="hashing runs fully offline; minilm loads all-MiniLM-L6-v2")
+    parser.add_argument("--max-index-bytes", type=int, default=DEFAULT_MAX_INDEX_BYTES)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="compare against this saved report")
+    parser.add_argument("--save-baseline", help="write the report here as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95 increase")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore regressions smaller than this")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    encoder = None
+    if args.encoder == "minilm":
+        from sentence_transformers import SentenceTransformer
+
+        encoder = SentenceTransformer("all-MiniLM-L6-v2")
+
+    report = run_suite(args.sizes, repeats=args.repeats, seed=args.seed, encoder=encoder,
+                       max_index_bytes=args.max_index_bytes)
+    _print_report(report)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
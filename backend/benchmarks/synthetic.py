@@ -0,0 +1,136 @@
+import random
+from typing import Dict, List
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from app.scraping import JobScraper
+
+
+COMPANIES = ["TechCorp", "DataTech", "WebSolutions", "CloudTech", "InnovateCorp", "API Solutions", "AI Labs", "Design Studio"]
+LOCATIONS = ["Remote", "San Francisco, CA", "Austin, TX", "New York, NY", "Seattle, WA", "Boston, MA", "London, UK", "Toronto, ON"]
+COUNTRIES = ["us", "gb", "au", "ca"]
+FILLER = [
+    "You will collaborate with product and design to ship features quickly.",
+    "We value ownership, clear communication and thoughtful code review.",
+    "Experience with distributed systems and observability is a plus.",
+    "Our stack includes Python, TypeScript, PostgreSQL and Kubernetes on AWS.",
+    "The team practices agile delivery with short iterations and demos.",
+    "You will mentor junior engineers and contribute to hiring.",
+    "Benefits include equity, flexible hours and a learning budget.",
+    "Weâ€™re growing fast and our customersâ€™ needs evolve daily.",
+    "Strong SQL skills and familiarity with data pipelines are required.",
+    "CafÃ© culture, remote-first, with quarterly on-sites.",
+]
+RESUME_SECTIONS = [
+    "Summary: Senior software engineer with {years} years of experience building web platforms.",
+    "Experience: Led a team of 5 engineers; improved latency by 40% and cut costs by $200k.",
+    "Developed and deployed microservices in Python and Node.js on AWS with Docker and Kubernetes.",
+    "Implemented CI/CD pipelines, automated testing and monitoring for 50 projects.",
+    "Designed React and TypeScript front ends used by 10k users.",
+    "Education: Bachelor of Science in Computer Science, State University.",
+    "Skills: python, javascript, react, sql, mongodb, aws, docker, git, agile, scrum, jira",
+    "Collaborated with data science on machine learning models and Tableau dashboards.",
+]
+
+
+def _description(rng: random.Random, base: str) -> str:
+    sentences = [base] + rng.choices(FILLER, k=rng.randint(4, 30))
+    return " ".join(sentences)
+
+
+def generate_raw_jobs(count: int, seed: int = 0) -> List[Dict]:
+    """RemoteOK- and Adzuna-shaped raw jobs built from the sample job templates."""
+    rng = random.Random(seed)
+    templates = JobScraper().get_sample_jobs(8)
+    jobs = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        company = f"{rng.choice(COMPANIES)} {i % 97}"
+        location = rng.choice(LOCATIONS)
+        description = _description(rng, template["description"])
+        if i % 2 == 0:
+            jobs.append({
+                "id": f"r{i}",
+                "position": template["position"],
+                "company": company,
+                "location": location,
+                "description": description,
+                "tags": list(template["tags"]),
+                "url": f"https://example.com/jobs/r{i}",
+                "date": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00+00:00",
+                "source": "remoteok",
+            })
+        else:
+            country = COUNTRIES[i % len(COUNTRIES)]
+            jobs.append({
+                "id": f"a{i}",
+                "title": template["position"],
+                "company": {"display_name": company},
+                "location": {"display_name": location},
+                "description": description,
+                "category": {"label": ", ".join(template["tags"])},
+                "salary_min": template["salary_min"],
+                "salary_max": template["salary_max"],
+                "redirect_url": f"https://example.com/jobs/a{i}",
+                "created": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00Z",
+                "source": f"adzuna_{country}",
+            })
+    return jobs
+
+
+def generate_resumes(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed + 1)
+    resumes = []
+    for _ in range(count):
+        sections = rng.sample(RESUME_SECTIONS, k=rng.randint(4, len(RESUME_SECTIONS)))
+        text = "\n".join(sections).format(years=rng.randint(1, 15))
+        resumes.append("Jane Doe\njane.doe@example.com\n" + text * rng.randint(1, 4))
+    return resumes
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str) -> bytes:
+    """A minimal single-page PDF with one text line per input line."""
+    lines = [_pdf_escape(line.encode("latin-1", "ignore").decode("latin-1")) for line in text.splitlines()]
+    content = "BT /F1 10 Tf 50 760 Td 12 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+class HashingEncoder:
+    """Deterministic offline stand-in for SentenceTransformer.encode.
+
+    Lets the suite run without downloading a model while keeping the
+    matrix shapes (384 dimensions, unit vectors) of all-MiniLM-L6-v2.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.vectorizer = HashingVectorizer(n_features=dimension, alternate_sign=False, norm=None)
+
+    def encode(self, texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False):
+        vectors = self.vectorizer.transform(texts).toarray().astype("float32")
+        if normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors /= norms
+        return vectors
@@ -1,10 +1,19 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import asyncio
+from urllib.parse import quote
+
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Request, WebSocket
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from functools import partial
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
+
+from pydantic import ValidationError
 from datetime import datetime
 from contextlib import asynccontextmanager
 import logging
 
+import numpy as np
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 
@@ -13,19 +22,88 @@ logging.getLogger("asyncio").setLevel(logging.CRITICAL)
 
 logger = logging.getLogger(__name__)
 
-from app.models import JobMatch, ResumeAnalysis, MatchRequest
-from app.analysis import extract_text_from_pdf, analyze_resume
-from app.matching import calculate_semantic_similarity, calculate_keyword_match
-from app.state import initialize_models, refresh_jobs_data, jobs_data, sentence_model
+from app.models import (
+    JobMatch,
+    ResumeAnalysis,
+    MatchRequest,
+    JobFilters,
+    JobSearchRequest,
+    BatchMatchRequest,
+    CandidateMatch,
+    CandidateRecord,
+    AnalysisTaskStatus,
+)
+from app.analysis import extract_text_from_pdf, analyze_resume, analyze_resumes
+from app.nlp import get_extractor
+from app.batch import BATCH_ENCODE_SIZE, match_resume_batch, read_resume_archive
+from app.embedding import EMBEDDING_POOLING, encode_documents
+from app.matching import calculate_semantic_scores, prepare_keywords
+from app.dedup import NearDuplicateIndex, collapse_near_duplicates
+from app.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    MetricsMiddleware,
+    monitor_event_loop_lag,
+    record_cache,
+    render_metrics,
+    stage_timer,
+    timed_fetch,
+)
+from app.scraping import shutdown_parse_pool
+from app.sharding import (
+    PARTIAL_HEADER,
+    close_shard_client,
+    coordinating,
+    get_shard_client,
+    interleave,
+    merge_top_k,
+    shard_of,
+)
+from app.snapshot import SNAPSHOT_DIR
+from app.ranking import (
+    KEYWORD_MARGIN,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+    rank_matches,
+    top_k_order,
+)
+from app.tasks import ANALYSIS_MAX_UPLOAD_BYTES, FINISHED, PRIORITIES, QueueFull, TaskQueue
+from app.admission import AdmissionMiddleware, client_address
+from app.http_cache import CORPUS_VERSION_HEADER, CorpusVersionMiddleware, cached_response
+from app.profiling import ProfileStore, ProfilingMiddleware, is_admin, profiling_enabled
+from app.serialization import JSONBytesResponse, dumps, render_match_list
+from app.streaming import (
+    STREAM_HEADERS,
+    STREAM_MEDIA_TYPES,
+    STREAM_SHARD_SIZE,
+    encode_event,
+    parse_fields,
+    project_job,
+    stream_job_batches,
+)
+from app import state
+from app.state import initialize_models, refresh_jobs_data
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
     await initialize_models(load_spacy=True)
+    analysis_queue.start()
+    # Multi-worker mode: follow (or serve refreshes for) the shared snapshots
+    snapshot_sync = asyncio.create_task(state.sync_snapshots()) if SNAPSHOT_DIR else None
     yield
-    # Shutdown (if needed in the future)
-    pass
+    # Shutdown
+    lag_monitor.cancel()
+    if snapshot_sync is not None:
+        snapshot_sync.cancel()
+    await close_shard_client()
+    await analysis_queue.stop()
+    shutdown_parse_pool()
+    get_extractor().shutdown()
 
 
 # Initialize FastAPI app with lifespan
@@ -33,6 +111,10 @@ app = FastAPI(
     title="JobsDreamer API", description="AI Career Assistant", lifespan=lifespan
 )
 
+# Rate limits and concurrency slots for /match-jobs, /analyze-resume and
+# /refresh-jobs. Added before CORS so that rejections still carry CORS headers.
+app.add_middleware(AdmissionMiddleware)
+
 # Add CORS middleware
 # Allow all origins for production deployment
 app.add_middleware(
@@ -41,8 +123,20 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["ETag", CORPUS_VERSION_HEADER],
 )
 
+# Request latency histograms per route, exposed on /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Every response says which corpus version served it
+app.add_middleware(CorpusVersionMiddleware, version=lambda: state.corpus_version)
+
+# Opt-in request profiling; only installed when PROFILING_ADMIN_TOKEN is set
+profile_store = ProfileStore()
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware, store=profile_store)
+
 """
 main.py is intentionally slim; models and business logic live under app/* modules.
 """
@@ -65,7 +159,7 @@ async def root():
 
 @app.get("/jobs", response_model=List[JobMatch])
 async def get_jobs(
-    limit: int = 20, search: Optional[str] = None, location: Optional[str] = "us"
+    request: Request, limit: int = 20, search: Optional[str] = None, location: Optional[str] = "us"
 ):
     """Get jobs with optional search from multiple sources"""
     try:
@@ -76,8 +170,8 @@ async def get_jobs(
 
             # Search RemoteOK
             try:
-                remoteok_jobs = await scraper.search_remoteok_jobs(
-                    search, limit=limit // 2
+                remoteok_jobs = await timed_fetch(
+                    "remoteok", scraper.search_remoteok_jobs(search, limit=limit // 2)
                 )
                 if remoteok_jobs:
                     for job in remoteok_jobs:
@@ -88,8 +182,9 @@ async def get_jobs(
 
             # Search Adzuna
             try:
-                adzuna_jobs = await scraper.search_adzuna_jobs(
-                    search, limit=limit // 2, location=location
+                adzuna_jobs = await timed_fetch(
+                    f"adzuna_{location}",
+                    scraper.search_adzuna_jobs(search, limit=limit // 2, location=location),
                 )
                 if adzuna_jobs:
                     for job in adzuna_jobs:
@@ -110,10 +205,15 @@ async def get_jobs(
                     seen_ids.add(job_id)
                     normalized_jobs.append(normalized_job)
 
-            return normalized_jobs[:limit]
+            return collapse_near_duplicates(normalized_jobs)[:limit]
+        elif coordinating():
+            results = await get_shard_client().scatter("GET", "/jobs", params={"limit": limit})
+            return _gathered_response(results, interleave([jobs for jobs in results if jobs], limit))
         else:
-            # Return cached jobs
-            return jobs_data[:limit]
+            # Pre-rendered for common limits once per corpus version
+            with stage_timer("serialization"):
+                entry = state.jobs_page(state.jobs_data, limit)
+            return cached_response(request, entry)
     except Exception as e:
         logger.error(f"Error getting jobs: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -126,14 +226,9 @@ async def analyze_resume_endpoint(file: UploadFile = File(...)):
         # Read file content
         content = await file.read()
 
-        # Extract text based on file type
-        if file.filename.lower().endswith(".pdf"):
-            text = extract_text_from_pdf(content)
-        else:
-            text = content.decode("utf-8", errors="ignore")
-
-        # Analyze resume
-        analysis = analyze_resume(text)
+        # PDF parsing and NER are CPU-bound; keep them off the event loop
+        loop = asyncio.get_running_loop()
+        analysis = await loop.run_in_executor(None, _analyze_upload, file.filename, content)
 
         logger.info(f"Resume analyzed: {file.filename}")
         return analysis
@@ -143,87 +238,622 @@ async def analyze_resume_endpoint(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Background resume analysis, so uploads don't hold a connection (and a
+# proxy slot) open while the PDF is parsed and analyzed
+analysis_queue = TaskQueue()
+MAX_TASK_WAIT = 30.0
+# A task WebSocket is closed after this long even if the task hasn't finished
+MAX_SOCKET_WAIT = 300.0
+
+
+def _client_id(request: Request) -> str:
+    """The client address as seen by our nginx (see TRUSTED_PROXY_HOPS)."""
+    return client_address(request.scope)
+
+
+def _upload_text(filename: str, content: bytes) -> str:
+    if filename.lower().endswith(".pdf"):
+        with stage_timer("pdf_extraction"):
+            return extract_text_from_pdf(content)
+    return content.decode("utf-8", errors="ignore")
+
+
+def _analyze_upload(filename: str, content: bytes) -> dict:
+    text = _upload_text(filename, content)
+    with stage_timer("analysis"):
+        return analyze_resume(text).dict()
+
+
+@app.post("/analyze-resume/tasks", response_model=AnalysisTaskStatus, status_code=202)
+async def submit_analysis_task(
+    request: Request, file: UploadFile = File(...), x_admin_token: Optional[str] = Header(None)
+):
+    """Queue a resume for analysis and return its task id right away"""
+    # Priority is ours to decide: operators holding the admin token jump the
+    # queue, everyone else is served round-robin at normal priority
+    priority = "high" if is_admin(x_admin_token) else "normal"
+    content = await file.read(ANALYSIS_MAX_UPLOAD_BYTES + 1)
+    if len(content) > ANALYSIS_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Uploads are limited to {ANALYSIS_MAX_UPLOAD_BYTES} bytes")
+    try:
+        task = await analysis_queue.submit(
+            _client_id(request), partial(_analyze_upload, file.filename, content), PRIORITIES[priority]
+        )
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    return JSONResponse(
+        task.to_dict(), status_code=202, headers={"Location": f"/analyze-resume/tasks/{task.task_id}"}
+    )
+
+
+@app.get("/analyze-resume/tasks/{task_id}", response_model=AnalysisTaskStatus)
+async def get_analysis_task(task_id: str, wait: float = 0):
+    """Task status and, once done, the analysis; ``wait`` long-polls up to 30s for it to finish"""
+    if wait > 0:
+        status = await analysis_queue.wait(task_id, min(wait, MAX_TASK_WAIT))
+    else:
+        status = analysis_queue.status(task_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Task not found or expired")
+    return status
+
+
+@app.websocket("/analyze-resume/tasks/{task_id}/ws")
+async def analysis_task_updates(websocket: WebSocket, task_id: str):
+    """Push the task status now and again when it finishes (or after MAX_SOCKET_WAIT)"""
+    await websocket.accept()
+    status = analysis_queue.status(task_id)
+    if status is None:
+        await websocket.close(code=4404)
+        return
+    await websocket.send_json(status)
+    if status["status"] not in FINISHED:
+        waiting = asyncio.ensure_future(analysis_queue.wait(task_id, MAX_SOCKET_WAIT))
+        try:
+            # Keep reading so a client that goes away stops the wait
+            while not waiting.done():
+                receiving = asyncio.ensure_future(websocket.receive())
+                await asyncio.wait({waiting, receiving}, return_when=asyncio.FIRST_COMPLETED)
+                if not receiving.done():
+                    receiving.cancel()
+                elif receiving.result()["type"] == "websocket.disconnect":
+                    return
+            status = waiting.result()
+        finally:
+            waiting.cancel()
+        if status is not None:
+            await websocket.send_json(status)
+    await websocket.close()
+
+
+def _ingest_candidate(filename: str, content: bytes):
+    text = _upload_text(filename, content)
+    with stage_timer("analysis"):
+        analysis = analyze_resumes([text])[0]
+    vectors, _, _ = encode_documents(state.sentence_model, [text], pooling=EMBEDDING_POOLING)
+    return state.candidate_index.add(filename, analysis.dict(), vectors[0])
+
+
+@app.post("/candidates", response_model=CandidateRecord)
+async def add_candidate_endpoint(file: UploadFile = File(...)):
+    """Analyze a resume and store it in the candidate index"""
+    if state.sentence_model is None:
+        raise HTTPException(status_code=503, detail="Embedding model not loaded")
+    try:
+        content = await file.read()
+        loop = asyncio.get_running_loop()
+        record = await loop.run_in_executor(None, _ingest_candidate, file.filename, content)
+
+        logger.info(f"Candidate added: {file.filename}")
+        return record
+    except Exception as e:
+        logger.error(f"Error adding candidate: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.delete("/candidates/{candidate_id}")
+async def remove_candidate_endpoint(candidate_id: str):
+    """Remove a candidate from the candidate index"""
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(None, state.candidate_index.remove, candidate_id):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"message": "Candidate removed"}
+
+
+@app.get("/job/{job_id}/candidates", response_model=List[CandidateMatch])
+async def job_candidates_endpoint(job_id: str, limit: int = 10):
+    """Rank stored candidates for a job by k-NN search over the candidate index"""
+    _require_local_corpus("/job/{job_id}/candidates")
+    jobs = state.jobs_data
+    embeddings = state.job_embeddings
+    row = jobs.row_of(job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if embeddings is None:
+        raise HTTPException(status_code=503, detail="Job embeddings not available")
+    try:
+        # search may take the index's file lock and reload it from disk
+        loop = asyncio.get_running_loop()
+        candidates = await loop.run_in_executor(
+            None, partial(state.candidate_index.search, embeddings[row], limit, margin=KEYWORD_MARGIN)
+        )
+        matches = []
+        for record, semantic_score in candidates:
+            analysis = record["analysis"]
+            keyword_counts = prepare_keywords(analysis.get("keywords", []) + analysis.get("skills", []))
+            keyword_score = float(jobs.keyword_scores(keyword_counts, [row])[0])
+            matches.append(
+                CandidateMatch(
+                    candidate_id=record["candidate_id"],
+                    name=record["name"],
+                    skills=analysis.get("skills", []),
+                    experience_years=analysis.get("experience_years"),
+                    job_titles=analysis.get("job_titles", []),
+                    summary=analysis.get("summary", ""),
+                    match_score=(semantic_score * 0.8) + (keyword_score * 0.2),
+                    semantic_score=semantic_score,
+                    keyword_score=keyword_score,
+                )
+            )
+        matches.sort(key=lambda x: x.match_score, reverse=True)
+        return matches[:limit]
+    except Exception as e:
+        logger.error(f"Error ranking candidates: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _require_local_corpus(endpoint: str) -> None:
+    """Refuse endpoints that need the whole corpus in this process on a coordinator,
+    which holds no jobs and must not crawl them all."""
+    if coordinating():
+        raise HTTPException(
+            status_code=501, detail=f"{endpoint} is not available on a shard coordinator; send it to a shard node"
+        )
+
+
+async def _ensure_jobs_loaded() -> None:
+    """Load the corpus on first use, counting hits and misses on the corpus cache"""
+    _require_local_corpus("This endpoint")
+    record_cache("corpus", bool(state.jobs_data))
+    if not state.jobs_data:
+        await refresh_jobs_data()
+
+
+def _parse_filters(preferences) -> JobFilters:
+    try:
+        return JobFilters.parse_obj(preferences or {})
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _semantic_scores_for(text: str, jobs, rows):
+    """Semantic scores for the given rows (all rows when None), aligned with them."""
+    semantic_scores = calculate_semantic_scores(
+        state.sentence_model,
+        text,
+        state.job_embeddings,
+        state.job_chunk_embeddings,
+        state.job_chunk_owners,
+        rows=rows,
+    )
+    expected = len(jobs) if rows is None else len(rows)
+    if len(semantic_scores) != expected:
+        # Embeddings from another corpus version would rank jobs by noise
+        logger.error(f"Semantic scores cover {len(semantic_scores)} jobs, expected {expected}")
+        raise HTTPException(status_code=503, detail="Job embeddings are being rebuilt, try again shortly")
+    return semantic_scores
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _shards_answered(results) -> str:
+    """``X-Shards-Answered`` value for scattered results; 503 when none made it."""
+    answered = sum(result is not None for result in results)
+    if not answered:
+        raise HTTPException(status_code=503, detail="No shard answered in time")
+    return f"{answered}/{len(results)}"
+
+
+def _gathered_response(results, jobs) -> JSONBytesResponse:
+    """Merged shard results, with how many shards made it before the deadline."""
+    response = JSONBytesResponse(dumps(jobs))
+    response.headers[PARTIAL_HEADER] = _shards_answered(results)
+    return response
+
+
+def _page_params(request: MatchRequest):
+    """Validated (limit, offset, decoded cursor) of a match request."""
+    if not 1 <= request.limit <= MAX_PAGE_SIZE or request.offset < 0:
+        raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_PAGE_SIZE} and offset non-negative")
+    try:
+        after = decode_cursor(request.cursor) if request.cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return request.limit, (0 if after else request.offset), after
+
+
+async def _gather_matches(request: MatchRequest, limit: int, offset: int) -> JSONBytesResponse:
+    # Each shard returns its own top offset + limit matches after the
+    # cursor; their union holds the global top
+    if offset + limit > MAX_PAGE_SIZE:
+        # shards would refuse the page; deeper pages go through the cursor
+        raise HTTPException(
+            status_code=400,
+            detail=f"offset + limit must be at most {MAX_PAGE_SIZE}; follow {NEXT_CURSOR_HEADER} for later pages",
+        )
+    shard_request = request.dict()
+    shard_request.update(limit=offset + limit, offset=0)
+    results = await get_shard_client().scatter("POST", "/match-jobs", json=shard_request)
+    page = merge_top_k([jobs for jobs in results if jobs], offset + limit)[offset:]
+    response = _gathered_response(results, page)
+    if len(page) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page[-1]["match_score"], page[-1]["job_id"])
+    return response
+
+
 @app.post("/match-jobs", response_model=List[JobMatch])
 async def match_jobs_endpoint(request: MatchRequest):
-    """Match resume with jobs"""
+    """Match resume with jobs, one page at a time; follow X-Next-Cursor for the next page"""
+    filters = _parse_filters(request.job_preferences)
+    limit, offset, after = _page_params(request)
+    if coordinating():
+        return await _gather_matches(request, limit, offset)
     try:
-        if not jobs_data:
-            await refresh_jobs_data()
+        await _ensure_jobs_loaded()
 
-        if not jobs_data:
+        jobs = state.jobs_data
+        if not jobs:
             raise HTTPException(status_code=500, detail="No job data available")
 
+        # Narrow the corpus with the filter indexes before any scoring
+        with stage_timer("filtering"):
+            rows = state.job_filter_index.select(filters)
+
         # Calculate matches
-        matches = []
-        resume_text = request.resume_text.lower()
-
-        for job in jobs_data:
-            job_text = (
-                job.get("description", "")
-                + " "
-                + job.get("title", "")
-                + " "
-                + " ".join(job.get("tags", []))
-            ).lower()
-            job_title = job.get("title", "").lower()
-
-            # Calculate semantic similarity
-            semantic_score = calculate_semantic_similarity(
-                sentence_model, request.resume_text, job_text
+        resume_keywords = request.resume_text.split()
+
+        # Semantic similarity against the pre-encoded job matrix
+        semantic_scores = _semantic_scores_for(request.resume_text, jobs, rows)
+
+        with stage_timer("scoring"):
+            page = rank_matches(
+                jobs, semantic_scores, resume_keywords, rows, limit=limit, offset=offset, after=after
             )
 
-            # Calculate keyword match
-            resume_keywords = request.resume_text.split()
-            keyword_score = calculate_keyword_match(resume_keywords, job_text)
+        # Render only the requested page
+        with stage_timer("serialization"):
+            body = render_match_list(jobs.fragment, page)
+        response = JSONBytesResponse(body)
+        cursor = next_cursor(page, jobs, limit)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error matching jobs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 
-            # Overall match score - heavily weighted towards semantic similarity
-            match_score = (semantic_score * 0.8) + (keyword_score * 0.2)
+def _stream_params(format: str, fields: Optional[str]):
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format: {format}")
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/jobs/stream")
+async def stream_jobs(
+    limit: int = 20,
+    search: Optional[str] = None,
+    location: Optional[str] = "us",
+    format: str = "ndjson",
+    fields: Optional[str] = None,
+):
+    """Stream jobs as NDJSON or SSE, emitting each source as soon as it answers"""
+    projection = _stream_params(format, fields)
+    if not search:
+        _require_local_corpus("/jobs/stream without search")
+
+    async def batches():
+        if not search:
+            jobs = state.jobs_data
+            for start in range(0, min(limit, len(jobs)), STREAM_SHARD_SIZE):
+                yield jobs[start:min(start + STREAM_SHARD_SIZE, limit)]
+            return
+
+        scraper = JobScraper()
+        seen_ids = set()
+        near_duplicates = NearDuplicateIndex()
+        try:
+            async for source, source_jobs in scraper.iter_search_results(
+                search, limit=limit // 2, location=location
+            ):
+                normalized_jobs = []
+                for job in source_jobs:
+                    normalized_job = normalize_job_data(job)
+                    job_id = normalized_job.get("job_id", "")
+                    if job_id and job_id not in seen_ids and near_duplicates.add_if_new(normalized_job):
+                        seen_ids.add(job_id)
+                        normalized_jobs.append(normalized_job)
+                yield normalized_jobs
+        finally:
+            await scraper.close()
+
+    return StreamingResponse(
+        stream_job_batches(batches(), format, projection, limit=limit),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers=STREAM_HEADERS,
+    )
+
+
+@app.post("/match-jobs/stream")
+async def match_jobs_stream_endpoint(
+    request: MatchRequest, format: str = "ndjson", fields: Optional[str] = None
+):
+    """Stream the top ``limit`` job matches, best first, as NDJSON or SSE"""
+    projection = _stream_params(format, fields)
+    filters = _parse_filters(request.job_preferences)
+    limit = max(1, min(request.limit, MAX_PAGE_SIZE))
+    if coordinating():
+        shard_request = request.dict()
+        shard_request.update(limit=limit, offset=0, cursor=None)
+        results = await get_shard_client().scatter("POST", "/match-jobs", json=shard_request)
+        answered = _shards_answered(results)
 
-            # Only include jobs with strong semantic similarity
-            if semantic_score > 0.35 and match_score > 0.3:
-                # Update the scores in the job data
-                job_copy = job.copy()
-                job_copy["match_score"] = match_score
-                job_copy["semantic_score"] = semantic_score
-                job_copy["keyword_score"] = keyword_score
+        async def merged_batches():
+            yield merge_top_k([jobs for jobs in results if jobs], limit)
 
-                job_match = JobMatch(**job_copy)
-                matches.append(job_match)
+        return StreamingResponse(
+            stream_job_batches(merged_batches(), format, projection),
+            media_type=STREAM_MEDIA_TYPES[format],
+            headers={**STREAM_HEADERS, PARTIAL_HEADER: answered},
+        )
 
-        # Sort by match score and return top matches
-        matches.sort(key=lambda x: x.match_score, reverse=True)
-        return matches[:20]
+    await _ensure_jobs_loaded()
+
+    # Hold on to this store so a concurrent refresh can't shift rows mid-stream
+    jobs = state.jobs_data
+    if not jobs:
+        raise HTTPException(status_code=500, detail="No job data available")
+
+    with stage_timer("filtering"):
+        rows = state.job_filter_index.select(filters)
+    semantic_scores = _semantic_scores_for(request.resume_text, jobs, rows)
+
+    # Rank the whole selection first so the stream holds the same matches,
+    # in the same order, as the first page of /match-jobs
+    with stage_timer("scoring"):
+        page = rank_matches(jobs, semantic_scores, request.resume_text.split(), rows, limit=limit)
+
+    async def batches():
+        for start in range(0, len(page), STREAM_SHARD_SIZE):
+            yield [jobs.scored_record(*scores) for scores in page[start:start + STREAM_SHARD_SIZE]]
+
+    return StreamingResponse(
+        stream_job_batches(batches(), format, projection),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers=STREAM_HEADERS,
+    )
+
+
+BATCH_DEFAULT_FIELDS = "job_id,title,company,location,url,match_score,semantic_score,keyword_score"
+
+
+def _analyze_batch(texts: List[str]) -> List[dict]:
+    with stage_timer("analysis"):
+        return [analysis.dict() for analysis in analyze_resumes(texts)]
+
+
+async def _stream_batch_matches(
+    resumes, top_k: int, filters: JobFilters, format: str, projection, analyze: bool = False
+):
+    """Encode and score resumes batch by batch, emitting one event per resume.
 
+    With ``analyze`` each event also carries the resume's analysis, run for
+    the whole batch at once alongside the matching.
+    """
+
+    top_k = max(1, min(top_k, MAX_PAGE_SIZE))
+
+    # Resolved before the response starts, so every batch scores the same corpus
+    await _ensure_jobs_loaded()
+    jobs = state.jobs_data
+    embeddings = (state.job_embeddings, state.job_chunk_embeddings, state.job_chunk_owners)
+    rows = state.job_filter_index.select(filters)
+
+    async def events():
+        loop = asyncio.get_running_loop()
+
+        sent = 0
+        for start in range(0, len(resumes), BATCH_ENCODE_SIZE):
+            batch = resumes[start:start + BATCH_ENCODE_SIZE]
+            texts = [text for _, text in batch]
+            try:
+                matching = loop.run_in_executor(
+                    None, partial(match_resume_batch, state.sentence_model, texts, jobs, *embeddings, top_k=top_k, rows=rows)
+                )
+                if analyze:
+                    results, analyses = await asyncio.gather(
+                        matching, loop.run_in_executor(None, _analyze_batch, texts)
+                    )
+                else:
+                    results, analyses = await matching, [None] * len(batch)
+            except Exception as e:
+                logger.error(f"Error matching resume batch: {str(e)}")
+                yield encode_event({"detail": str(e)}, format, event="error")
+                break
+            for (resume_id, _), scored, analysis in zip(batch, results, analyses):
+                event = {"resume_id": resume_id}
+                if analysis is not None:
+                    event["analysis"] = analysis
+                event["matches"] = [project_job(jobs.scored_record(*scores), projection) for scores in scored]
+                yield encode_event(event, format, event="resume")
+                sent += 1
+        yield encode_event({"count": sent}, format, event="done")
+
+    return StreamingResponse(events(), media_type=STREAM_MEDIA_TYPES[format], headers=STREAM_HEADERS)
+
+
+@app.post("/match-jobs/batch")
+async def batch_match_jobs_endpoint(
+    request: BatchMatchRequest, format: str = "ndjson", fields: Optional[str] = BATCH_DEFAULT_FIELDS
+):
+    """Match many resumes at once, streaming the top-k jobs per resume"""
+    _require_local_corpus("/match-jobs/batch")
+    projection = _stream_params(format, fields)
+    filters = _parse_filters(request.job_preferences)
+    resumes = [(resume.resume_id, resume.resume_text) for resume in request.resumes]
+    return await _stream_batch_matches(resumes, request.top_k, filters, format, projection)
+
+
+@app.post("/match-jobs/batch/upload")
+async def batch_match_upload_endpoint(
+    file: UploadFile = File(...),
+    top_k: int = Form(20),
+    format: str = "ndjson",
+    fields: Optional[str] = BATCH_DEFAULT_FIELDS,
+):
+    """Match a zip archive of PDF/text resumes, streaming each one's analysis and top-k jobs"""
+    _require_local_corpus("/match-jobs/batch/upload")
+    projection = _stream_params(format, fields)
+    content = await file.read()
+    try:
+        loop = asyncio.get_running_loop()
+        resumes = await loop.run_in_executor(None, read_resume_archive, content)
     except Exception as e:
-        logger.error(f"Error matching jobs: {str(e)}")
+        logger.error(f"Error reading resume archive: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid resume archive: {str(e)}")
+    return await _stream_batch_matches(resumes, top_k, JobFilters(), format, projection, analyze=True)
+
+
+@app.post("/jobs/search", response_model=List[JobMatch])
+async def search_indexed_jobs(request: JobSearchRequest):
+    """Search the indexed corpus with server-side filters, ranked by semantic similarity"""
+    filters = JobFilters(location=request.location, job_type=request.job_type)
+    if coordinating():
+        results = await get_shard_client().scatter("POST", "/jobs/search", json=request.dict())
+        return _gathered_response(results, merge_top_k([jobs for jobs in results if jobs], request.limit))
+    try:
+        await _ensure_jobs_loaded()
+
+        jobs = state.jobs_data
+        rows = state.job_filter_index.select(filters)
+        if rows is None:
+            rows = np.arange(len(jobs))
+        rows = rows[jobs.renderable(rows)]
+
+        semantic_scores = np.asarray(_semantic_scores_for(request.query, jobs, rows), dtype="float32")
+        order = top_k_order(semantic_scores, request.limit)
+        scored = [
+            (int(rows[i]), float(semantic_scores[i]), float(semantic_scores[i]), 0.0) for i in order
+        ]
+        with stage_timer("serialization"):
+            body = render_match_list(jobs.fragment, scored)
+        return JSONBytesResponse(body)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching indexed jobs: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/refresh-jobs")
 async def refresh_jobs_endpoint():
     """Manually refresh job data"""
+    _require_local_corpus("/refresh-jobs")
     try:
         await refresh_jobs_data()
+        if state.worker_role == "follower":
+            # Only the leader crawls; this worker attaches the new corpus once it is published
+            return JSONResponse(
+                {"message": "Job refresh requested from the leader worker"}, status_code=202
+            )
         return {"message": "Job data refreshed successfully"}
     except Exception as e:
         logger.error(f"Error refreshing jobs: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus text exposition of request, stage, cache and event-loop metrics"""
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _require_admin(token: Optional[str]) -> None:
+    if not profiling_enabled():
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    if not is_admin(token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.get("/admin/profiles", include_in_schema=False)
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """Recently captured request profiles, newest first"""
+    _require_admin(x_admin_token)
+    return profile_store.list()
+
+
+@app.get("/admin/profiles/{profile_id}", include_in_schema=False)
+async def download_profile(
+    profile_id: str, format: str = "collapsed", x_admin_token: Optional[str] = Header(None)
+):
+    """Download a profile as collapsed stacks (flamegraph.pl, speedscope) or speedscope JSON"""
+    _require_admin(x_admin_token)
+    if format not in ("collapsed", "speedscope"):
+        raise HTTPException(status_code=400, detail=f"Unsupported profile format: {format}")
+    profile = profile_store.load(profile_id, format)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    body, media_type = profile
+    extension = "speedscope.json" if format == "speedscope" else "collapsed"
+    return Response(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.{extension}"'},
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for deployment platforms"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "worker_role": state.worker_role,
+        "corpus_version": state.corpus_version,
+    }
 
 
 @app.get("/job/{job_id}")
-async def get_job_details(job_id: str):
+async def get_job_details(job_id: str, request: Request):
     """Get specific job details"""
+    if coordinating():
+        client = get_shard_client()
+        shard = shard_of(job_id, len(client.urls))
+        try:
+            status, job = await asyncio.wait_for(
+                client.request(shard, "GET", f"/job/{quote(job_id, safe='')}"), client.deadline
+            )
+        except Exception as e:
+            logger.error(f"Error getting job {job_id} from shard {shard}: {str(e) or type(e).__name__}")
+            raise HTTPException(status_code=503, detail=f"Shard {shard} is unavailable")
+        if status >= 400:
+            raise HTTPException(status_code=status, detail=job.get("detail", "Job not found"))
+        return job
     try:
-        for job in jobs_data:
-            if str(job.get("job_id")) == job_id:
-                return job
-        raise HTTPException(status_code=404, detail="Job not found")
+        jobs = state.jobs_data
+        if jobs.row_of(job_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        entry = state.response_cache.get(state.corpus_version, ("job", job_id), lambda: dumps(jobs.get(job_id)))
+        return cached_response(request, entry)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting job details: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.admission import AdmissionMiddleware, EndpointGate, Overloaded, client_address, default_gates
+
+
+def test_client_address_uses_the_hop_nginx_added():
+    scope = {"headers": [(b"x-forwarded-for", b"6.6.6.6, 203.0.113.7")], "client": ("10.0.0.2", 5000)}
+    assert client_address(scope) == "203.0.113.7"
+    assert client_address({"headers": [], "client": ("10.0.0.2", 5000)}) == "10.0.0.2"
+
+
+def test_streams_have_their_own_gate():
+    middleware = AdmissionMiddleware(None)
+    assert middleware.gate_for("/match-jobs/stream").name == "stream"
+    assert middleware.gate_for("/match-jobs/batch/upload").name == "stream"
+    assert middleware.gate_for("/match-jobs").name == "match"
+    assert middleware.gate_for("/jobs/search").name == "match"
+    assert middleware.gate_for("/candidates").name == "analyze"
+    assert middleware.gate_for("/jobs") is None
+    assert all(gate.queue_timeout == 0 for gate in default_gates() if gate.name == "stream")
+
+
+def test_gate_sheds_when_the_queue_wait_runs_long():
+    async def run():
+        gate = EndpointGate("match", "/match-jobs", concurrency=1, rate=None, burst=1, queue_timeout=0.05)
+        await gate.enter()
+        # every slot busy: waits up to queue_timeout, then is shed
+        with pytest.raises(Overloaded):
+            await gate.enter()
+        assert 0 < gate.wait_estimate < gate.queue_timeout
+
+        # once the smoothed wait says the queue is backed up, arrivals are
+        # shed without waiting
+        for _ in range(10):
+            gate._observe_wait(gate.queue_timeout)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(Overloaded):
+            await gate.enter()
+        assert loop.time() - start < gate.queue_timeout
+
+        gate.leave()
+        await gate.enter()
+        gate.leave()
+        assert gate.active == 0
+
+    asyncio.run(run())
+
+
+def test_middleware_rate_limits_per_client():
+    app = FastAPI()
+    gate = EndpointGate("refresh", "/refresh-jobs", concurrency=1, rate=0.001, burst=2, queue_timeout=0)
+    app.add_middleware(AdmissionMiddleware, gates=[gate])
+
+    @app.post("/refresh-jobs")
+    async def refresh():
+        return {"message": "ok"}
+
+    @app.get("/jobs")
+    async def jobs():
+        return []
+
+    client = TestClient(app)
+    first = {"X-Forwarded-For": "198.51.100.1"}
+    assert [client.post("/refresh-jobs", headers=first).status_code for _ in range(3)] == [200, 200, 429]
+    limited = client.post("/refresh-jobs", headers=first)
+    assert limited.status_code == 429 and int(limited.headers["retry-after"]) > 0
+    # other clients and unguarded endpoints are unaffected
+    assert client.post("/refresh-jobs", headers={"X-Forwarded-For": "198.51.100.2"}).status_code == 200
+    assert all(client.get("/jobs", headers=first).status_code == 200 for _ in range(5))
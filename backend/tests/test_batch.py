@@ -0,0 +1,76 @@
+import io
+import zipfile
+
+import pytest
+
+from app import batch
+from app.batch import match_resume_batch, read_resume_archive
+from app.embedding import encode_documents
+from app.matching import calculate_semantic_scores, job_match_text, normalize_job_data
+from app.ranking import rank_matches
+from app.scraping import JobScraper
+from app.store import JobStore
+from tests.test_embedding import FakeModel
+from tests.test_features import score_jobs
+
+RESUMES = [
+    "python react aws docker senior engineer",
+    "figma sketch prototyping designer",
+    "kubernetes jenkins ci/cd cloud infrastructure",
+]
+
+
+def test_batch_top_k_matches_exhaustive_scoring():
+    model = FakeModel()
+    jobs = [normalize_job_data(job) for job in JobScraper().get_sample_jobs(8)]
+    store = JobStore(jobs)
+    embeddings, _, _ = encode_documents(model, [job_match_text(job) for job in jobs])
+
+    results = match_resume_batch(model, RESUMES, store, embeddings, top_k=3)
+
+    for resume, top in zip(RESUMES, results):
+        resume_vector, _, _ = encode_documents(model, [resume])
+        expected = score_jobs(store, embeddings @ resume_vector[0], resume.split())
+        expected.sort(key=lambda x: x[1], reverse=True)
+        assert [row for row, *_ in top] == [row for row, *_ in expected[:3]]
+
+
+def test_read_resume_archive_skips_other_files():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("batch/alice.txt", "python developer")
+        archive.writestr("notes.md", "ignored")
+    assert read_resume_archive(buffer.getvalue()) == [("alice.txt", "python developer")]
+
+
+def test_batch_uses_max_sim_when_job_chunks_are_kept():
+    model = FakeModel()
+    jobs = [normalize_job_data(job) for job in JobScraper().get_sample_jobs(8)]
+    store = JobStore(jobs)
+    embeddings, chunks, owners = encode_documents(
+        model, [job_match_text(job) for job in jobs], keep_chunks=True
+    )
+
+    results = match_resume_batch(model, RESUMES, store, embeddings, chunks, owners, top_k=3)
+
+    for resume, top in zip(RESUMES, results):
+        semantic_scores = calculate_semantic_scores(model, resume, embeddings, chunks, owners)
+        expected = rank_matches(store, semantic_scores, resume.split(), limit=3)
+        assert top == expected
+
+
+def test_read_resume_archive_rejects_oversized_members(monkeypatch):
+    monkeypatch.setattr(batch, "MAX_RESUME_BYTES", 1000)
+    monkeypatch.setattr(batch, "MAX_ARCHIVE_BYTES", 1500)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("big.txt", "a" * 2000)
+    with pytest.raises(ValueError, match="big.txt"):
+        read_resume_archive(buffer.getvalue())
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("a.txt", "a" * 800)
+        archive.writestr("b.txt", "b" * 800)
+    with pytest.raises(ValueError, match="Archive"):
+        read_resume_archive(buffer.getvalue())
@@ -0,0 +1,31 @@
+from app import state
+from benchmarks.run import compare, run_suite
+
+STAGES = {
+    "clean_text_encoding",
+    "normalize_job_data",
+    "job_store",
+    "build_vectorizer_and_index",
+    "match_jobs_endpoint",
+    "analyze_resume",
+    "extract_text_from_pdf",
+}
+
+
+def test_suite_runs_every_stage_on_a_tiny_corpus():
+    names = ("sentence_model", "jobs_data", "job_filter_index", "job_embeddings")
+    before = [getattr(state, name) for name in names]
+    report = run_suite([40], repeats=2)
+    # the benchmark corpus and encoder don't leak into later tests
+    assert all(getattr(state, name) is value for name, value in zip(names, before))
+    assert set(report["results"]["40"]) == STAGES
+    for result in report["results"]["40"].values():
+        assert result["p95_ms"] >= result["p50_ms"] >= 0
+    assert report["results"]["40"]["job_store"]["retained_kb_per_job"] > 0
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"results": {"40": {"analyze_resume": {"p95_ms": 10.0}, "normalize_job_data": {"p95_ms": 0.1}}}}
+    report = {"results": {"40": {"analyze_resume": {"p95_ms": 20.0}, "normalize_job_data": {"p95_ms": 0.5}}}}
+    regressions = compare(report, baseline, tolerance=0.25, min_delta_ms=1.0)
+    assert len(regressions) == 1 and regressions[0].startswith("analyze_resume")
@@ -0,0 +1,69 @@
+import numpy as np
+
+from app.candidates import CandidateIndex
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype="float32")
+    return vector / np.linalg.norm(vector)
+
+
+def test_search_ranks_and_persists(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    index.add("alice.pdf", {"skills": ["Python"]}, _unit(1, 0), candidate_id="alice")
+    index.add("bob.pdf", {"skills": ["Figma"]}, _unit(0, 1), candidate_id="bob")
+    index.add("carol.pdf", {"skills": ["Sql"]}, _unit(1, 1), candidate_id="carol")
+
+    top = index.search(_unit(1, 0.1), k=2)
+    assert [record["candidate_id"] for record, _ in top] == ["alice", "carol"]
+
+    reloaded = CandidateIndex(str(tmp_path))
+    reloaded.load()
+    assert [record["name"] for record in reloaded.records] == ["alice.pdf", "bob.pdf", "carol.pdf"]
+    assert np.allclose(reloaded.embeddings, index.embeddings)
+
+
+def test_margin_widens_results_and_remove(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    index.add("a", {}, _unit(1, 0), candidate_id="a")
+    index.add("b", {}, _unit(0.9, 0.1), candidate_id="b")
+    index.add("c", {}, _unit(0, 1), candidate_id="c")
+
+    assert len(index.search(_unit(1, 0), k=1)) == 1
+    assert [record["candidate_id"] for record, _ in index.search(_unit(1, 0), k=1, margin=0.25)] == ["a", "b"]
+
+    assert index.remove("a")
+    assert not index.remove("a")
+    assert [record["candidate_id"] for record, _ in index.search(_unit(1, 0), k=1)] == ["b"]
+
+
+def test_workers_sharing_a_directory_keep_each_others_changes(tmp_path):
+    # two indexes over one directory stand in for two uvicorn workers
+    first, second = CandidateIndex(str(tmp_path)), CandidateIndex(str(tmp_path))
+    first.load()
+    second.load()
+    first.add("a", {}, _unit(1, 0), candidate_id="a")
+    second.add("b", {}, _unit(0, 1), candidate_id="b")
+    first.add("c", {}, _unit(1, 1), candidate_id="c")
+
+    assert [record["candidate_id"] for record in first.records] == ["a", "b", "c"]
+    assert [record["candidate_id"] for record, _ in second.search(_unit(1, 0), k=3)] == ["a", "c", "b"]
+    assert second.remove("a")
+    assert [record["candidate_id"] for record, _ in first.search(_unit(1, 0), k=1)] == ["c"]
+
+
+def test_add_appends_and_drops_a_partial_line(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    index.add("a", {}, _unit(1, 0), candidate_id="a")
+    path = tmp_path / "candidates.jsonl"
+    # a worker that crashed mid-append
+    with open(path, "ab") as f:
+        f.write(b'{"candidate_id": "cut')
+    index.add("b", {}, _unit(0, 1), candidate_id="b")
+
+    lines = path.read_bytes().splitlines()
+    assert len(lines) == 2
+    reloaded = CandidateIndex(str(tmp_path))
+    reloaded.load()
+    assert [record["candidate_id"] for record in reloaded.records] == ["a", "b"]
+    assert np.allclose(reloaded.embeddings, index.embeddings)
@@ -0,0 +1,42 @@
+from app.dedup import NearDuplicateIndex, collapse_near_duplicates, simhash
+
+DESCRIPTION = (
+    "We are looking for a Senior Software Engineer to join our platform team. "
+    "You will design and build scalable backend services in Python, own our "
+    "CI/CD pipelines on AWS, mentor engineers and work closely with product."
+)
+
+
+def _job(job_id, source, description=DESCRIPTION, salary="Not specified"):
+    return {
+        "job_id": job_id,
+        "title": "Senior Software Engineer",
+        "company": "TechCorp",
+        "description": description,
+        "salary": salary,
+        "source": source,
+    }
+
+
+def test_simhash_is_stable_and_tolerates_small_edits():
+    assert simhash(DESCRIPTION) == simhash(DESCRIPTION)
+    edited = simhash(DESCRIPTION + " Apply now!")
+    assert bin(simhash(DESCRIPTION) ^ edited).count("1") <= 3
+    assert simhash("") is None
+
+
+def test_collapse_keeps_one_canonical_job_per_cluster():
+    jobs = [
+        _job("r1", "remoteok"),
+        _job("a1", "adzuna_us", DESCRIPTION + " Apply now!", salary="90000 - 140000"),
+        _job("a2", "adzuna_gb"),
+        _job("other", "adzuna_us", "Plan and run payroll for a retail chain with 40 stores across Texas."),
+    ]
+    collapsed = collapse_near_duplicates(jobs)
+    assert [job["job_id"] for job in collapsed] == ["a1", "other"]
+
+
+def test_incremental_index():
+    index = NearDuplicateIndex()
+    assert index.add_if_new(_job("r1", "remoteok"))
+    assert not index.add_if_new(_job("a2", "adzuna_gb"))
@@ -0,0 +1,76 @@
+import numpy as np
+
+from app.embedding import chunk_text, encode_documents, max_sim_scores, pool_chunks
+
+
+class FakeModel:
+    """Deterministic bag-of-letters encoder that records each encode call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 26), dtype="float32")
+        for row, text in enumerate(texts):
+            for ch in text.lower():
+                if "a" <= ch <= "z":
+                    vectors[row, ord(ch) - ord("a")] += 1
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def test_chunk_text_short_text_is_single_chunk():
+    assert chunk_text("python react aws") == ["python react aws"]
+
+
+def test_chunk_text_windows_overlap_and_cover_all_words():
+    words = [f"w{i}" for i in range(25)]
+    chunks = chunk_text(" ".join(words), window=10, overlap=3)
+    assert chunks[0].split() == words[:10]
+    assert chunks[1].split()[:3] == words[7:10]
+    assert chunks[-1].split()[-1] == "w24"
+
+
+def test_encode_documents_uses_one_batched_call():
+    model = FakeModel()
+    long_text = " ".join(["python"] * 50 + ["kubernetes"] * 50)
+    vectors, chunks, owners = encode_documents(
+        model, [long_text, "react"], keep_chunks=True, window=20, overlap=5
+    )
+    assert len(model.calls) == 1
+    assert vectors.shape == (2, 26)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert owners[-1] == 1 and (owners[:-1] == 0).all()
+    assert len(chunks) == len(owners)
+
+
+def test_pool_chunks_mean_and_max():
+    chunk_vectors = np.array([[1, 0], [0, 1], [1, 0]], dtype="float32")
+    owners = np.array([0, 0, 1])
+    mean = pool_chunks(chunk_vectors, owners, pooling="mean")
+    maxed = pool_chunks(chunk_vectors, owners, pooling="max")
+    assert np.allclose(mean[0], [2 ** -0.5, 2 ** -0.5])
+    assert np.allclose(maxed[0], [2 ** -0.5, 2 ** -0.5])
+    assert np.allclose(mean[1], [1, 0])
+
+
+def test_max_sim_scores_picks_best_chunk_per_document():
+    chunk_vectors = np.array([[1, 0], [0, 1], [0.6, 0.8]], dtype="float32")
+    owners = np.array([0, 0, 1])
+    query = np.array([[0, 1]], dtype="float32")
+    assert np.allclose(max_sim_scores(query, chunk_vectors, owners), [1.0, 0.8])
+
+
+def test_resume_vectors_use_the_configured_pooling(monkeypatch):
+    from app import matching
+
+    monkeypatch.setattr(matching, "EMBEDDING_POOLING", "max")
+    model = FakeModel()
+    resume = " ".join(["python"] * 200 + ["kubernetes"] * 200)
+    job_vectors, _, _ = encode_documents(model, ["python", "kubernetes"], pooling="max")
+    resume_vectors, _, _ = encode_documents(model, [resume], pooling="max")
+    np.testing.assert_allclose(
+        matching.calculate_semantic_scores(model, resume, job_vectors), job_vectors @ resume_vectors[0], rtol=1e-6
+    )
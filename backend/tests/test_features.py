@@ -0,0 +1,98 @@
+import numpy as np
+
+from app.features import compute_job_features, detect_seniority
+from app.matching import job_match_text, keyword_terms, normalize_job_data, prepare_keywords, text_terms
+from app.ranking import MATCH_THRESHOLD, SEMANTIC_THRESHOLD
+from app.scraping import JobScraper
+from app.store import JobStore
+
+
+def keyword_match_score(keyword_counts, job_text_lower):
+    """Reference for JobStore.keyword_scores: scan one lowercased job text."""
+    total = sum(keyword_counts.values())
+    if not total:
+        return 0.0
+    terms = text_terms(job_text_lower)
+    matched = sum(
+        count for keyword, count in keyword_counts.items()
+        if keyword_terms(keyword) and all(term in terms for term in keyword_terms(keyword))
+    )
+    return matched / total
+
+
+def score_jobs(store, semantic_scores, resume_keywords):
+    """Reference for rank_matches: score every job of the store one by one."""
+    keyword_counts = prepare_keywords(resume_keywords)
+    scored = []
+    for row, (job, semantic_score) in enumerate(zip(store, semantic_scores)):
+        semantic_score = float(semantic_score)
+        keyword_score = keyword_match_score(keyword_counts, job_match_text(job))
+        match_score = (semantic_score * 0.8) + (keyword_score * 0.2)
+        if semantic_score > SEMANTIC_THRESHOLD and match_score > MATCH_THRESHOLD:
+            scored.append((row, match_score, semantic_score, keyword_score))
+    return scored
+
+
+def test_compute_job_features():
+    job = normalize_job_data(JobScraper().get_sample_jobs(1)[0])
+    job["salary"] = "$80k - $120k"
+    features = compute_job_features(job)
+    assert features.search_text == features.search_text.lower()
+    assert "senior software engineer" in features.search_text
+    assert {"python", "react", "aws", "software engineer"} <= features.terms
+    assert "Python" in features.skills and "Docker" in features.skills
+    assert features.seniority == "senior"
+    assert (features.salary_min, features.salary_max) == (80000.0, 120000.0)
+
+
+def test_detect_seniority():
+    assert detect_seniority("Sr. Backend Developer") == "senior"
+    assert detect_seniority("Software Engineering Intern") == "intern"
+    assert detect_seniority("Staff Engineer, Platform") == "lead"
+    assert detect_seniority("Backend Developer") is None
+
+
+def test_store_keeps_features_as_columns():
+    jobs = [normalize_job_data(job) for job in JobScraper().get_sample_jobs(8)]
+    jobs[1]["salary"] = "90000 - 140000"
+    store = JobStore(jobs)
+    assert store.seniorities[0] == "senior"
+    np.testing.assert_array_equal(store.salary_ranges[1], [90000.0, 140000.0])
+    # "Not specified" parses to no range
+    assert np.isnan(store.salary_ranges[0]).all()
+
+    keyword_counts = prepare_keywords(["Python,", "machine", "learning", "kotlin", "Machine Learning", "ci/cd"])
+    rows = np.arange(len(store))
+    # the term index agrees with scanning each job's text
+    np.testing.assert_array_equal(
+        store.keyword_scores(keyword_counts, rows),
+        [keyword_match_score(keyword_counts, job_match_text(job)) for job in store],
+    )
+    assert store.keyword_scores(keyword_counts, rows).any()
+    np.testing.assert_array_equal(store.rows_with_term("python"), [
+        row for row, job in enumerate(store) if "python" in text_terms(job_match_text(job))
+    ])
+
+
+def test_keywords_match_whole_words_not_substrings():
+    # Matching moved from `keyword in job_text` to whole words and adjacent
+    # word pairs with the term index; these pin the differences
+    jobs = [
+        {"job_id": "1", "title": "JavaScript Developer", "description": "React and node.js", "tags": []},
+        {"job_id": "2", "title": "Backend", "description": "Python/Django and Java services", "tags": []},
+        {"job_id": "3", "title": "Backend", "description": "Django REST APIs, some Python", "tags": []},
+        {"job_id": "4", "title": "ML", "description": "Applied machine learning team", "tags": []},
+        {"job_id": "5", "title": "Tools", "description": "Learning about machine tools", "tags": []},
+    ]
+    store = JobStore(jobs)
+    rows = np.arange(len(store))
+
+    def matching_rows(keyword):
+        return np.flatnonzero(store.keyword_scores(prepare_keywords([keyword]), rows)).tolist()
+
+    assert matching_rows("Java") == [1]
+    assert matching_rows("javascript") == [0]
+    assert matching_rows("node.js") == [0]
+    assert matching_rows("python/django") == [1]
+    assert matching_rows("django") == [1, 2]
+    assert matching_rows("machine learning") == [3]
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from app import resilience
+from app.feed_cache import FeedCache
+from app.scraping import JobScraper
+from benchmarks.mock_sources import MockSourceConfig, create_app
+
+
+def test_unchanged_payloads_are_not_parsed_again(tmp_path):
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return json.loads(text)
+
+    cache = FeedCache(str(tmp_path))
+    key = cache.key("http://feed/jobs", {"page": 1})
+    assert cache.update(key, "http://feed/jobs", b'[{"id": 1}]', '"v1"', None, None, parse) == (True, [{"id": 1}])
+    assert cache.update(key, "http://feed/jobs", b'[{"id": 1}]', '"v1"', None, None, parse)[0] is False
+    assert len(calls) == 1
+    assert cache.conditional_headers(key) == {"If-None-Match": '"v1"'}
+
+    # Results are copies: mutating one doesn't touch the memoized parse
+    cache.update(key, "http://feed/jobs", b'[{"id": 1}]', '"v1"', None, None, parse)[1][0]["source"] = "x"
+    assert cache.parsed(key, parse) == [{"id": 1}]
+
+    # A payload the parser rejects is dropped and the last good one replayed
+    assert cache.update(key, "http://feed/jobs", b"<html>error</html>", None, None, None, parse) == (
+        False, [{"id": 1}]
+    )
+    with pytest.raises(ValueError):
+        FeedCache(None).update(key, "http://feed/jobs", b"<html>error</html>", None, None, None, parse)
+
+    reloaded = FeedCache(str(tmp_path))
+    assert reloaded.parsed(key, parse) == [{"id": 1}]
+    assert reloaded.conditional_headers(key) == {"If-None-Match": '"v1"'}
+
+
+def test_scraper_revalidates_and_replays_feeds(tmp_path):
+    resilience.reset_guards()
+
+    async def crawl():
+        runner = web.AppRunner(create_app(MockSourceConfig(jobs=60, page_size=20)))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{runner.addresses[0][1]}/rss?page=1"
+        scraper = JobScraper(feed_cache=FeedCache(str(tmp_path)))
+        try:
+            first = await scraper.fetch_jobs_from_rss(url)
+            second = await scraper.fetch_jobs_from_rss(url)
+            counts = (scraper.changed_feeds, scraper.unchanged_feeds)
+            await runner.cleanup()
+            replayed = await scraper.fetch_jobs_from_rss(url)
+            return first, second, replayed, counts
+        finally:
+            await scraper.close()
+
+    first, second, replayed, counts = asyncio.run(crawl())
+    resilience.reset_guards()
+    assert len(first) == 20
+    assert second == first and second is not first
+    assert counts == (1, 1)
+    assert replayed == first
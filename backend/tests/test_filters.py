@@ -0,0 +1,54 @@
+from datetime import date
+
+from app.filters import JobFilterIndex
+from app.models import JobFilters
+from app.store import JobStore
+
+
+def _job(job_id, source, location, salary, posted, tags=(), title="Engineer"):
+    return {
+        "job_id": job_id,
+        "title": title,
+        "company": "Acme",
+        "location": location,
+        "description": "",
+        "tags": list(tags),
+        "salary": salary,
+        "url": "",
+        "posted_date": posted,
+        "source": source,
+    }
+
+
+def _index():
+    return JobFilterIndex(JobStore([
+        _job("a", "remoteok", "Remote", "Not specified", "2024-01-15T10:00:00+00:00", ["python"]),
+        _job("b", "adzuna_us", "Austin, TX", "80000 - 120000", "2024-02-01T00:00:00Z", title="Senior Engineer"),
+        _job("c", "adzuna_gb", "London, UK", "50000.0 - 60000.0", "2023-12-01"),
+        _job("d", "adzuna_us", "Remote, US", "90000 - 150000", ""),
+    ]))
+
+
+def test_no_filters_selects_everything():
+    assert _index().select(JobFilters()) is None
+
+
+def test_categorical_filters():
+    index = _index()
+    assert index.select(JobFilters(source="adzuna")).tolist() == [1, 2, 3]
+    assert index.select(JobFilters(location="remote")).tolist() == [0, 3]
+    assert index.select(JobFilters(remote=False)).tolist() == [1, 2]
+    assert index.select(JobFilters(job_type="Python")).tolist() == [0]
+    assert index.select(JobFilters(seniority="Senior")).tolist() == [1]
+
+
+def test_unknown_job_type_selects_nothing():
+    # like seniority and source, so every shard can answer whatever its corpus
+    assert _index().select(JobFilters(job_type="Cobol")).tolist() == []
+
+
+def test_range_filters_intersect():
+    index = _index()
+    assert index.select(JobFilters(min_salary=100000)).tolist() == [1, 3]
+    assert index.select(JobFilters(posted_after=date(2024, 1, 1))).tolist() == [0, 1]
+    assert index.select(JobFilters(min_salary=100000, posted_after=date(2024, 1, 1), source="adzuna_us")).tolist() == [1]
@@ -0,0 +1,69 @@
+import json
+
+from starlette.requests import Request
+
+from app import state
+from app.http_cache import ResponseCache, cached_response, etag_matches, make_etag
+from app.matching import normalize_job_data
+from app.scraping import JobScraper
+from app.store import JobStore
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode("latin-1"))] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/jobs", "headers": headers})
+
+
+def test_response_cache_renders_once_per_version():
+    cache = ResponseCache(max_entries=2)
+    renders = []
+
+    def render():
+        renders.append(1)
+        return b"[]"
+
+    body, etag = cache.get(1, ("jobs", 20), render)
+    assert cache.get(1, ("jobs", 20), render) == (body, etag) and len(renders) == 1
+    assert etag == make_etag(b"[]")
+    # a new corpus version drops everything rendered for the old one
+    cache.get(2, ("jobs", 20), render)
+    assert len(renders) == 2 and len(cache) == 1
+
+    cache.get(2, ("job", "a"), render)
+    cache.get(2, ("job", "b"), render)
+    assert len(cache) == 2
+
+
+def test_conditional_requests():
+    etag = make_etag(b'[{"job_id":"1"}]')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+    entry = (b'[{"job_id":"1"}]', etag)
+    fresh = cached_response(_request(), entry)
+    assert fresh.status_code == 200 and fresh.body == entry[0]
+    assert fresh.headers["etag"] == etag and "max-age" in fresh.headers["cache-control"]
+    not_modified = cached_response(_request(etag), entry)
+    assert not_modified.status_code == 304 and not_modified.body == b""
+    assert not_modified.headers["etag"] == etag
+
+
+def test_jobs_pages_cache_only_common_limits(monkeypatch):
+    store = JobStore([normalize_job_data(job) for job in JobScraper().get_sample_jobs(8)])
+    monkeypatch.setattr(state, "response_cache", ResponseCache())
+    monkeypatch.setattr(state, "corpus_version", 1)
+    monkeypatch.setattr(state, "PRERENDERED_LIMITS", [5])
+
+    assert len(json.loads(state.jobs_page(store, 3)[0])) == 3
+    assert state.jobs_page(store, 6) and len(state.response_cache) == 0
+    state.jobs_page(store, 5)
+    assert len(state.response_cache) == 1
+
+    # on a corpus smaller than a pre-rendered limit, every larger limit is that page
+    monkeypatch.setattr(state, "PRERENDERED_LIMITS", [50])
+    assert state.jobs_page(store, 50) == state.jobs_page(store, 10**6)
+    assert len(json.loads(state.jobs_page(store, 50)[0])) == len(store)
+    assert len(state.response_cache) == 2
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.metrics import Counter, Histogram, MetricsMiddleware, MetricsRegistry, REQUEST_LATENCY, timed_fetch
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("t_seconds", "Test.", ["stage"], buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, stage="embedding")
+
+    text = registry.render()
+    assert '# TYPE t_seconds histogram' in text
+    assert 't_seconds_bucket{stage="embedding",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="embedding",le="1.0"} 3' in text
+    assert 't_seconds_bucket{stage="embedding",le="+Inf"} 4' in text
+    assert 't_seconds_count{stage="embedding"} 4' in text
+
+
+def test_metrics_reject_unknown_labels_and_duplicate_names():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("c_total", "Test.", ["cache"]))
+    with pytest.raises(ValueError):
+        counter.inc(source="remoteok")
+    with pytest.raises(ValueError):
+        registry.register(Counter("c_total", "Again."))
+
+
+def test_middleware_labels_requests_by_route_template():
+    class Route:
+        path = "/job/{job_id}"
+
+    async def app(scope, receive, send):
+        scope["route"] = Route()
+        await send({"type": "http.response.start", "status": 404, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    labels = {"method": "GET", "endpoint": "/job/{job_id}", "status": "404"}
+    before = REQUEST_LATENCY.count(**labels)
+    asyncio.run(MetricsMiddleware(app)({"type": "http", "method": "GET", "path": "/job/42"}, None, send))
+    assert REQUEST_LATENCY.count(**labels) == before + 1
+
+
+def test_timed_fetch_passes_results_through():
+    async def fetch():
+        return [{"id": 1}]
+
+    assert asyncio.run(timed_fetch("mock", fetch())) == [{"id": 1}]
@@ -0,0 +1,38 @@
+import asyncio
+
+from aiohttp import web
+
+from app.feed_cache import FeedCache
+from app.scraping import JobScraper
+from benchmarks.mock_sources import MockSourceConfig, create_app
+
+
+async def _scrape_mock():
+    runner = web.AppRunner(create_app(MockSourceConfig(jobs=120, page_size=20)))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    base_url = f"http://127.0.0.1:{port}"
+    scraper = JobScraper(
+        remoteok_base_url=base_url, adzuna_base_url=f"{base_url}/v1/api/jobs", feed_cache=FeedCache(None)
+    )
+    try:
+        return (
+            await scraper.fetch_remoteok_jobs(),
+            await scraper.fetch_adzuna_jobs(location="gb"),
+            await scraper.fetch_jobs_from_rss(f"{base_url}/rss?page=1"),
+            await scraper.scrape_jobs_from_html(f"{base_url}/html?page=2"),
+        )
+    finally:
+        await scraper.close()
+        await runner.cleanup()
+
+
+def test_scraper_parses_every_mock_source():
+    remoteok, adzuna, rss, html = asyncio.run(_scrape_mock())
+    # the legal notice is passed through like the real feed; normalization drops it
+    assert "legal" in remoteok[0] and all("position" in job for job in remoteok[1:])
+    assert adzuna and all("redirect_url" in job for job in adzuna)
+    assert len(rss) == 20 and rss[0]["title"]
+    assert len(html) == 20 and html[0]["title"]
@@ -0,0 +1,75 @@
+from datetime import date
+
+from app.analysis import analyze_resumes
+from app.nlp import EntityExtractor, years_from_dates
+
+
+class FakeEntity:
+    def __init__(self, text, label_):
+        self.text = text
+        self.label_ = label_
+
+
+class FakeDoc:
+    def __init__(self, ents):
+        self.ents = ents
+
+
+class FakePipeline:
+    """Tags a few known phrases and records every pipe call."""
+
+    PHRASES = {"Acme Corp": "ORG", "Bachelor of Science": "DEGREE", "2016 - Present": "DATE", "Berlin": "GPE"}
+
+    def __init__(self):
+        self.calls = []
+
+    def pipe(self, texts, batch_size):
+        texts = list(texts)
+        self.calls.append((texts, batch_size))
+        for text in texts:
+            yield FakeDoc([FakeEntity(phrase, label) for phrase, label in self.PHRASES.items() if phrase in text])
+
+
+def test_extract_batches_misses_and_memoizes():
+    nlp = FakePipeline()
+    extractor = EntityExtractor(nlp, workers=0, batch_size=8)
+
+    first = extractor.extract(["Engineer at Acme Corp", "Lives in Berlin", "Engineer at Acme Corp"])
+    assert len(nlp.calls) == 1
+    # the duplicate text is piped once
+    assert nlp.calls[0] == (["Engineer at Acme Corp", "Lives in Berlin"], 8)
+    assert first[0]["organizations"] == ["Acme Corp"]
+    assert first[1]["locations"] == ["Berlin"]
+    assert first[2] == first[0]
+
+    extractor.extract(["Lives in Berlin", "Engineer at Acme Corp"])
+    assert len(nlp.calls) == 1
+
+
+def test_extract_without_pipeline_returns_empty_entities():
+    extractor = EntityExtractor(None)
+    assert not extractor.available
+    assert extractor.extract(["Engineer at Acme Corp"])[0]["organizations"] == []
+
+
+def test_years_from_dates():
+    today = date(2024, 6, 1)
+    assert years_from_dates(["2016 - Present"], today) == 8
+    assert years_from_dates(["March 2015", "2019"], today) == 4
+    assert years_from_dates(["last summer"], today) is None
+
+
+def test_analyze_resumes_uses_entities(monkeypatch):
+    nlp = FakePipeline()
+    monkeypatch.setattr("app.analysis.get_extractor", lambda: EntityExtractor(nlp, workers=0))
+
+    resumes = [
+        "Jane Doe\nPython developer at Acme Corp, 2016 - Present\nBachelor of Science in Computer Science",
+        "John Doe\nJava developer in Berlin",
+    ]
+    first, second = analyze_resumes(resumes)
+    assert len(nlp.calls) == 1
+    assert first.organizations == ["Acme Corp"]
+    assert first.degrees == ["Bachelor of Science"]
+    assert first.experience_years is not None
+    assert second.organizations == []
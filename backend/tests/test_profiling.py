@@ -0,0 +1,54 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.profiling import ProfileStore, SamplingProfiler, _is_idle, collapsed_to_speedscope
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def test_profiler_samples_busy_executor_threads():
+    profiler = SamplingProfiler(threading.get_ident(), interval=0.001)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        profiler.start()
+        executor.submit(_busy, 0.1).result()
+        profiler.stop()
+
+    worker_stacks = [stack for stack in profiler.samples if stack.startswith("worker;")]
+    assert any("_busy (tests/test_profiling.py" in stack for stack in worker_stacks)
+
+
+def test_idle_threads_are_skipped():
+    idle_worker = [("threading.py", "_bootstrap", 1), ("concurrent/futures/thread.py", "_worker", 1)]
+    idle_loop = [("asyncio/base_events.py", "_run_once", 1), ("selectors.py", "select", 1)]
+    busy_worker = idle_worker + [("concurrent/futures/thread.py", "run", 1), ("app/batch.py", "match_resume_batch", 1)]
+    assert _is_idle(idle_worker) and _is_idle(idle_loop)
+    assert not _is_idle(busy_worker)
+
+
+def test_store_round_trips_collapsed_and_speedscope(tmp_path):
+    profiler = SamplingProfiler(threading.get_ident(), interval=0.01)
+    profiler.samples.update({"event-loop;main;score": 3, "event-loop;main;render": 1})
+    first, second = uuid.uuid4().hex, uuid.uuid4().hex
+    store = ProfileStore(str(tmp_path), limit=1)
+    store.save(first, profiler, "POST", "/match-jobs", 200)
+    store.save(second, profiler, "POST", "/match-jobs", 200)
+
+    # another worker sees the same profiles through the shared directory
+    other_worker = ProfileStore(str(tmp_path), limit=1)
+    assert [record["profile_id"] for record in other_worker.list()] == [second]
+    assert other_worker.load(first) is None
+    assert other_worker.load("../" + second) is None
+    body, _ = other_worker.load(second)
+    assert body.splitlines()[0] == "event-loop;main;score 3"
+
+    document = collapsed_to_speedscope(body, "POST /match-jobs", 0.01)
+    profile = document["profiles"][0]
+    assert [frame["name"] for frame in document["shared"]["frames"]] == ["event-loop", "main", "score", "render"]
+    assert profile["samples"] == [[0, 1, 2], [0, 1, 3]]
+    assert abs(profile["endValue"] - 0.04) < 1e-9
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.ranking import InvalidCursor, decode_cursor, encode_cursor, next_cursor, rank_matches, top_k_order
+from app.store import JobStore
+from tests.test_features import score_jobs
+
+WORDS = "python java sql react aws docker kubernetes figma".split()
+RESUME_KEYWORDS = "python sql docker senior".split()
+
+
+def _random_store(seed, n=300):
+    rng = np.random.default_rng(seed)
+    jobs = [
+        {
+            "job_id": f"job{i:04d}",
+            "title": "Engineer",
+            "company": "Acme",
+            "location": "Remote",
+            "description": " ".join(rng.choice(WORDS, 3)),
+            "tags": [],
+            "salary": None,
+            "url": "",
+            "posted_date": None,
+            "match_score": 0.0,
+            "semantic_score": 0.0,
+            "keyword_score": 0.0,
+        }
+        for i in rng.permutation(n)
+    ]
+    # two decimals, so plenty of ties in semantic and match scores
+    return JobStore(jobs), np.round(rng.random(n), 2)
+
+
+def _exhaustive(store, semantic_scores):
+    scored = score_jobs(store, semantic_scores, RESUME_KEYWORDS)
+    scored.sort(key=lambda x: (-x[1], store.job_ids[x[0]]))
+    return [row for row, *_ in scored]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cursor_pages_cover_the_exhaustive_ranking(seed):
+    store, semantic_scores = _random_store(seed)
+    pages, after = [], None
+    while True:
+        page = rank_matches(store, semantic_scores, RESUME_KEYWORDS, limit=7, after=after)
+        pages.extend(row for row, *_ in page)
+        cursor = next_cursor(page, store, 7)
+        if cursor is None:
+            break
+        after = decode_cursor(cursor)
+    assert pages == _exhaustive(store, semantic_scores)
+
+
+def test_offset_and_rows_subset():
+    store, semantic_scores = _random_store(7)
+    expected = _exhaustive(store, semantic_scores)
+    page = rank_matches(store, semantic_scores, RESUME_KEYWORDS, limit=5, offset=10)
+    assert [row for row, *_ in page] == expected[10:15]
+
+    rows = np.arange(0, len(store), 2)
+    page = rank_matches(store, semantic_scores[rows], RESUME_KEYWORDS, rows=rows, limit=5)
+    assert [row for row, *_ in page] == [row for row in expected if row % 2 == 0][:5]
+
+
+def test_top_k_order_and_cursor_encoding():
+    scores = np.array([0.2, 0.9, 0.5, 0.9, 0.1])
+    assert list(top_k_order(scores, 3)) == [1, 3, 2]
+    assert list(top_k_order(scores, 2, tiebreak=np.array(["e", "d", "c", "b", "a"]))) == [3, 1]
+    assert decode_cursor(encode_cursor(0.123456789, "a/b")) == (0.123456789, "a/b")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,101 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+from app import resilience
+from app.feed_cache import FeedCache
+from app.resilience import CircuitBreaker, SourceGuard, SourceUnavailable, UpstreamError
+from app.scraping import JobScraper
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "BACKOFF_BASE", 0.001)
+    resilience.reset_guards()
+    yield
+    resilience.reset_guards()
+
+
+def test_breaker_opens_then_half_opens_for_one_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    breaker.opened_at -= 31
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_guard_retries_only_retryable_errors():
+    guard = SourceGuard("test", rate=None, burst=1)
+    statuses = [503, 503]
+
+    async def flaky(timeout):
+        if statuses:
+            raise UpstreamError("test", statuses.pop())
+        return "ok"
+
+    assert asyncio.run(guard.call(flaky)) == "ok"
+
+    calls = []
+
+    async def missing(timeout):
+        calls.append(timeout)
+        raise UpstreamError("test", 404)
+
+    with pytest.raises(UpstreamError):
+        asyncio.run(guard.call(missing))
+    assert len(calls) == 1
+
+
+def test_dead_upstream_is_skipped_once_the_circuit_opens(tmp_path):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    async def refresh():
+        scraper = JobScraper(
+            adzuna_base_url=f"http://127.0.0.1:{port}/v1/api/jobs", feed_cache=FeedCache(str(tmp_path))
+        )
+        try:
+            return [await scraper.fetch_adzuna_jobs(location=country) for country in ("us", "gb", "au", "ca")]
+        finally:
+            await scraper.close()
+
+    start = time.perf_counter()
+    assert asyncio.run(refresh()) == [[], [], [], []]
+    assert time.perf_counter() - start < 2
+    with pytest.raises(SourceUnavailable):
+        asyncio.run(resilience.get_guard("adzuna").call(lambda timeout: asyncio.sleep(0)))
+
+
+def test_cancelled_probe_releases_the_half_open_breaker():
+    guard = SourceGuard("test", rate=None, burst=1)
+    guard.breaker.opened_at = time.monotonic() - guard.breaker.reset_timeout - 1
+
+    async def probe():
+        task = asyncio.ensure_future(guard.call(lambda timeout: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(probe())
+    assert guard.breaker.state == "half_open" and guard.breaker.allow()
+
+
+def test_non_retryable_errors_do_not_close_the_circuit():
+    guard = SourceGuard("test", rate=None, burst=1)
+    guard.breaker.opened_at = time.monotonic() - guard.breaker.reset_timeout - 1
+
+    async def missing(timeout):
+        raise UpstreamError("test", 404)
+
+    with pytest.raises(UpstreamError):
+        asyncio.run(guard.call(missing))
+    assert guard.breaker.state == "half_open" and guard.breaker.allow()
@@ -0,0 +1,32 @@
+import json
+
+from app.matching import normalize_job_data
+from app.models import JobMatch
+from app.scraping import JobScraper
+from app.serialization import render_match_list
+from app.store import JobStore
+
+
+def _sample_store():
+    jobs = [normalize_job_data(job) for job in JobScraper().get_sample_jobs(3)]
+    return jobs, JobStore(jobs)
+
+
+def test_rendered_match_equals_pydantic_output():
+    jobs, store = _sample_store()
+    body = render_match_list(store.fragment, [(1, 0.75, 0.7, 0.95)])
+
+    expected = dict(jobs[1], match_score=0.75, semantic_score=0.7, keyword_score=0.95)
+    assert json.loads(body) == [json.loads(JobMatch(**expected).json())]
+
+
+def _reject_constant(name):
+    raise ValueError(f"{name} is not valid JSON")
+
+
+def test_non_finite_scores_render_as_zero():
+    _, store = _sample_store()
+    body = render_match_list(store.fragment, [(0, float("nan"), float("inf"), float("-inf"))])
+    # the stdlib parser would otherwise accept NaN and Infinity
+    job = json.loads(body, parse_constant=_reject_constant)[0]
+    assert (job["match_score"], job["semantic_score"], job["keyword_score"]) == (0.0, 0.0, 0.0)
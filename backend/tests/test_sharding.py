@@ -0,0 +1,63 @@
+import asyncio
+
+from aiohttp import web
+
+from app.sharding import ShardClient, interleave, merge_top_k, partition_jobs, shard_of
+
+
+def _jobs(prefix, scores):
+    return [{"job_id": f"{prefix}{i}", "match_score": score} for i, score in enumerate(scores)]
+
+
+def test_partition_assigns_every_job_to_exactly_one_shard():
+    jobs = [{"job_id": str(i)} for i in range(1000)]
+    shards = [partition_jobs(jobs, shard, 4) for shard in range(4)]
+    assert sorted(job["job_id"] for shard in shards for job in shard) == sorted(job["job_id"] for job in jobs)
+    assert all(150 < len(shard) < 350 for shard in shards)
+    assert shard_of("abc", 4) == shard_of("abc", 4)
+
+
+def test_merge_top_k_and_interleave():
+    results = [_jobs("a", [0.9, 0.5, 0.4]), _jobs("b", [0.8, 0.7]), []]
+    assert [job["job_id"] for job in merge_top_k(results, 3)] == ["a0", "b0", "b1"]
+    assert [job["job_id"] for job in interleave(results, 4)] == ["a0", "b0", "a1", "b1"]
+
+
+def _shard_app(jobs, delay=0.0, status=200):
+    async def match(request):
+        await asyncio.sleep(delay)
+        return web.json_response(jobs, status=status)
+
+    app = web.Application()
+    app.router.add_post("/match-jobs", match)
+    return app
+
+
+async def _scatter_to_local_shards():
+    apps = [
+        _shard_app(_jobs("a", [0.9, 0.2])),
+        _shard_app(_jobs("b", [0.8]), delay=2.0),
+        _shard_app({"detail": "No job data available"}, status=500),
+        _shard_app(_jobs("d", [0.6])),
+    ]
+    runners, urls = [], []
+    for app in apps:
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        runners.append(runner)
+        urls.append(f"http://127.0.0.1:{runner.addresses[0][1]}")
+    client = ShardClient(urls, deadline=0.5)
+    try:
+        return await client.scatter("POST", "/match-jobs", json={"resume_text": "python"})
+    finally:
+        await client.close()
+        for runner in runners:
+            await runner.cleanup()
+
+
+def test_scatter_drops_slow_and_failing_shards():
+    results = asyncio.run(_scatter_to_local_shards())
+    assert results[1] is None and results[2] is None
+    merged = merge_top_k([jobs for jobs in results if jobs], 2)
+    assert [job["job_id"] for job in merged] == ["a0", "d0"]
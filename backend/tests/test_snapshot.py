@@ -0,0 +1,72 @@
+import asyncio
+import os
+
+import numpy as np
+
+from app import state
+from app.matching import build_vectorizer_and_index, normalize_job_data
+from app.scraping import JobScraper
+from app.snapshot import CorpusSnapshot, LeaderLock, current_version, read_snapshot, write_snapshot
+from app.store import JobStore
+
+
+def _sample_jobs():
+    return [normalize_job_data(job) for job in JobScraper().get_sample_jobs(5)]
+
+
+def test_snapshot_round_trip_is_memory_mapped(tmp_path):
+    jobs = _sample_jobs()
+    embeddings = np.random.default_rng(0).random((len(jobs), 8), dtype=np.float32)
+    vectorizer, index = build_vectorizer_and_index([job["description"] for job in jobs])
+    for version in range(1, 6):
+        write_snapshot(str(tmp_path), CorpusSnapshot(version, JobStore(jobs), embeddings, index=index, vectorizer=vectorizer))
+
+    assert current_version(str(tmp_path)) == 5
+    # only the newest SNAPSHOT_KEEP versions are kept
+    assert sorted(entry for entry in os.listdir(tmp_path) if entry.startswith("v")) == [
+        "v00000003", "v00000004", "v00000005"
+    ]
+    snapshot = read_snapshot(str(tmp_path), 5)
+    assert list(snapshot.store) == jobs
+    for name in ("term_hashes", "term_offsets", "term_rows"):
+        np.testing.assert_array_equal(getattr(snapshot.store, name), getattr(JobStore(jobs), name))
+    np.testing.assert_array_equal(snapshot.store.salary_ranges, JobStore(jobs).salary_ranges)
+    assert isinstance(snapshot.embeddings, np.memmap) and not snapshot.embeddings.flags.writeable
+    np.testing.assert_array_equal(snapshot.embeddings, embeddings)
+    assert snapshot.index.ntotal == len(jobs) and snapshot.chunk_embeddings is None
+    assert snapshot.vectorizer.transform(["python"]).shape[1] == index.d
+
+
+def test_leader_lock_is_exclusive(tmp_path):
+    leader, follower = LeaderLock(str(tmp_path)), LeaderLock(str(tmp_path))
+    assert leader.try_acquire()
+    assert not follower.try_acquire()
+    leader.release()
+    assert follower.try_acquire()
+    follower.release()
+
+
+def test_follower_attaches_what_the_leader_publishes(tmp_path, monkeypatch):
+    for name in ("jobs_data", "job_filter_index", "job_index", "job_vectorizer", "job_embeddings",
+                 "job_chunk_embeddings", "job_chunk_owners", "corpus_version", "worker_role"):
+        monkeypatch.setattr(state, name, getattr(state, name))
+    monkeypatch.setattr(state, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(state, "sentence_model", None)
+    jobs = _sample_jobs()
+
+    async def run():
+        state.worker_role = "leader"
+        await state._publish_jobs(jobs)
+        assert state.corpus_version == current_version(str(tmp_path)) == 1
+
+        # a fresh follower process starts with nothing and picks up version 1
+        state.worker_role, state.corpus_version, state.jobs_data = "follower", 0, JobStore()
+        assert await state.attach_latest_snapshot()
+        assert not await state.attach_latest_snapshot()
+        # refresh on a follower leaves a request for the leader instead of crawling
+        await state.refresh_jobs_data()
+        assert state.refresh_requested_at(str(tmp_path)) > 0
+
+    asyncio.run(run())
+    assert state.corpus_version == 1
+    assert list(state.jobs_data) == jobs
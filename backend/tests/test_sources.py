@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+from aiohttp import web
+
+from app import scraping
+from app.feed_cache import FeedCache
+from app.scraping import JobScraper, shutdown_parse_pool
+from app.sources import fetch_all_sources, load_sources
+from benchmarks.mock_sources import MockSourceConfig, create_app
+
+
+def test_load_sources_merges_file_over_builtins(tmp_path):
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps([
+        {"name": "remoteok", "kind": "remoteok", "enabled": False},
+        {"name": "board", "kind": "html", "url": "https://example.com/jobs?page={page}", "pages": 2},
+        {"name": "adzuna_board", "kind": "rss", "url": "https://example.com/feed"},
+        {"name": "no_url", "kind": "rss"},
+        {"name": "bad", "kind": "ftp", "url": "ftp://example.com"},
+        {"kind": "rss"},
+    ]))
+    names = [source.name for source in load_sources(str(path))]
+    assert names == ["adzuna_us", "adzuna_gb", "adzuna_au", "adzuna_ca", "board"]
+    assert [source.name for source in load_sources(str(tmp_path / "missing.json"))][0] == "remoteok"
+
+
+async def _fetch_mock_registry(tmp_path):
+    runner = web.AppRunner(create_app(MockSourceConfig(jobs=120, page_size=20)))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps([
+        {"name": "remoteok", "kind": "remoteok", "enabled": False},
+        {"name": "mock_rss", "kind": "rss", "url": f"{base_url}/rss?page={{page}}", "pages": 2},
+        {"name": "mock_html", "kind": "html", "url": f"{base_url}/html?page={{page}}", "pages": 3},
+    ]))
+    scraper = JobScraper(adzuna_base_url=f"{base_url}/v1/api/jobs", feed_cache=FeedCache(None))
+    try:
+        return await fetch_all_sources(scraper, load_sources(str(path)), concurrency=4)
+    finally:
+        await scraper.close()
+        await runner.cleanup()
+
+
+def test_fetch_all_sources_parses_pages_in_worker_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraping, "PARSE_WORKERS", 2)
+    try:
+        jobs = asyncio.run(_fetch_mock_registry(tmp_path))
+    finally:
+        shutdown_parse_pool()
+    by_source = {}
+    for job in jobs:
+        by_source.setdefault(job["source"], []).append(job)
+    assert len(by_source["mock_rss"]) == 40 and len(by_source["mock_html"]) == 60
+    # ids are stable across processes, so every page contributes distinct jobs
+    assert len({job["id"] for job in jobs}) == len(jobs)
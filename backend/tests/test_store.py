@@ -0,0 +1,63 @@
+import json
+
+from app.matching import normalize_job_data
+from app.scraping import JobScraper
+from app.serialization import render_job_list, validate_job
+from app.store import JobStore
+
+
+def _sample_jobs():
+    jobs = JobScraper().get_sample_jobs(8)
+    jobs[0]["description"] = "Café team — we ship résumé tooling."
+    return [normalize_job_data(job) for job in jobs]
+
+
+def test_records_round_trip():
+    jobs = _sample_jobs()
+    store = JobStore(jobs)
+    assert len(store) == len(jobs)
+    assert store[0] == jobs[0]
+    assert store[2:4] == jobs[2:4]
+    assert list(store) == jobs
+
+
+def test_lookup_by_id():
+    jobs = _sample_jobs()
+    store = JobStore(jobs)
+    assert store.get("3") == jobs[2]
+    assert store.get("missing") is None
+
+
+def test_repeated_strings_are_shared():
+    store = JobStore(_sample_jobs())
+    remote_rows = [row for row, location in enumerate(store.locations) if location == "Remote"]
+    assert len(remote_rows) > 1
+    assert all(store.locations[row] is store.locations[remote_rows[0]] for row in remote_rows)
+
+
+def test_fragments_render_like_the_records():
+    jobs = _sample_jobs()
+    store = JobStore(jobs)
+    rendered = json.loads(render_job_list(store.fragments(3)))
+    assert [job["description"] for job in rendered] == [job["description"] for job in jobs[:3]]
+    assert [{k: v for k, v in job.items() if not k.endswith("_score")} for job in rendered] == [
+        validate_job(job) for job in jobs[:3]
+    ]
+
+
+def test_rows_failing_validation_are_not_rendered():
+    jobs = _sample_jobs()
+    jobs[1]["url"] = None
+    store = JobStore(jobs)
+    assert store.fragment(1) is None
+    assert store.renderable([0, 1, 2]).tolist() == [True, False, True]
+    # the page is filled from the rows after the one skipped
+    assert [job["job_id"] for job in json.loads(render_job_list(store.fragments(2)))] == ["1", "3"]
+
+
+def test_fragments_render_the_validated_values():
+    jobs = _sample_jobs()
+    jobs[0]["salary"] = 120000
+    store = JobStore(jobs)
+    rendered = json.loads(render_job_list(store.fragments(1)))[0]
+    assert rendered["salary"] == "120000"
@@ -0,0 +1,36 @@
+import asyncio
+import json
+
+import pytest
+
+from app.streaming import encode_event, parse_fields, stream_job_batches
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_parse_fields_rejects_unknown_fields():
+    assert parse_fields(None) is None
+    assert parse_fields("job_id, title") == ["job_id", "title"]
+    with pytest.raises(ValueError):
+        parse_fields("job_id,nope")
+
+
+def test_encode_event_sse_framing():
+    assert encode_event({"a": 1}, "sse", event="done") == b'event: done\ndata: {"a":1}\n\n'
+
+
+def test_stream_job_batches_projects_and_limits():
+    jobs = [{"job_id": str(i), "description": "x" * 100} for i in range(5)]
+    chunks = asyncio.run(
+        _collect(stream_job_batches(_batches(jobs[:2], jobs[2:]), "ndjson", ["job_id"], limit=3))
+    )
+    lines = [json.loads(chunk) for chunk in chunks]
+    assert lines[:3] == [{"job_id": "0"}, {"job_id": "1"}, {"job_id": "2"}]
+    assert lines[-1] == {"event": "done", "count": 3}
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.tasks import DONE, FAILED, PRIORITIES, QueueFull, TaskQueue
+
+
+def test_round_robin_between_clients_within_priority():
+    async def run():
+        queue = TaskQueue(workers=0)
+        queue.start()
+        for i in range(3):
+            await queue.submit("burst", lambda: None)
+        await queue.submit("other", lambda: None)
+        await queue.submit("late", lambda: None, priority=PRIORITIES["high"])
+        order = []
+        while len(queue):
+            order.append(queue._next_task().client)
+        return order
+
+    assert asyncio.run(run()) == ["late", "burst", "other", "burst", "burst"]
+
+
+def test_limits_results_and_expiry():
+    def fail():
+        raise ValueError("unreadable resume")
+
+    async def run():
+        queue = TaskQueue(workers=1, max_queued=3, max_per_client=2, result_ttl=60)
+        queue.start()
+        ok = await queue.submit("a", lambda: {"skills": ["python"]})
+        failed = await queue.submit("a", fail)
+        with pytest.raises(QueueFull):
+            await queue.submit("a", lambda: None)
+        await asyncio.wait_for(failed.done.wait(), 5)
+        # finished tasks no longer count against the client
+        await queue.submit("a", lambda: None)
+
+        await queue.stop()
+
+        short_lived = TaskQueue(workers=1, result_ttl=0)
+        short_lived.start()
+        expiring = await short_lived.submit("b", lambda: None)
+        await asyncio.wait_for(expiring.done.wait(), 5)
+        await short_lived.stop()
+        return queue, short_lived, ok, failed, expiring
+
+    queue, short_lived, ok, failed, expiring = asyncio.run(run())
+    assert ok.status == DONE and ok.to_dict()["result"] == {"skills": ["python"]}
+    assert failed.status == FAILED and failed.error == "unreadable resume"
+    assert queue.get(ok.task_id) is ok
+    assert short_lived.get(expiring.task_id) is None
+
+
+def test_shared_directory_spans_workers(tmp_path):
+    async def run():
+        # two queues over one directory stand in for two uvicorn workers
+        first = TaskQueue(workers=1, max_per_client=2, directory=str(tmp_path))
+        second = TaskQueue(workers=1, max_per_client=2, directory=str(tmp_path))
+        first.start()
+        second.start()
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def blocked():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return {"skills": ["python"]}
+
+        task = await first.submit("a", blocked)
+        await second.submit("a", blocked)
+        # the client's pending tasks are counted across both workers
+        with pytest.raises(QueueFull):
+            await first.submit("a", lambda: None)
+
+        assert second.get(task.task_id) is None
+        assert second.status(task.task_id)["status"] in ("queued", "running")
+        waiting = asyncio.create_task(second.wait(task.task_id, timeout=5))
+        await asyncio.sleep(0.1)
+        release.set()
+        finished = await waiting
+        await first.stop()
+        await second.stop()
+        return task, finished, second.status("0" * 32)
+
+    task, finished, missing = asyncio.run(run())
+    assert finished["status"] == DONE and finished["result"] == {"skills": ["python"]}
+    assert finished["task_id"] == task.task_id
+    assert missing is None